@@ -1,14 +1,36 @@
 from fastapi import APIRouter, HTTPException, Depends, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 import os
+import math
+import asyncio
 import subprocess
 import uuid
 import shutil
+import threading
 import logging
 from pathlib import Path
-from typing import List, Optional
+import re
+from urllib.parse import quote, urlencode
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
 from pydantic import BaseModel
 from app.core.config import settings
+from app.services.sign_index import get_sign_index, SignClip, SUPPORTED_MODELS
+from app.services.ffmpeg_concat import concat_videos_with_ffmpeg
+from app.services.stitch_cache import get_stitch_cache, stitch_cache_key, link_or_copy
+from app.services.segment_cache import get_segment_cache, get_phrase_miner
+from app.services.clip_compat import get_clip_normalizer
+from app.services.mp4_stitcher import concat_videos_with_mp4, get_sample_table_cache, load_sample_tables
+from app.services.segmented_encoder import get_segmented_encoder, model_encode_target
+from app.services.rendition_ladder import RenditionNotReadyError, get_rendition_ladder, ladder_rungs, rung_width
+from app.utils.media_probe import probe_duration
+from app.utils.media_response import MediaFileResponse
+from app.utils.mp4 import (
+    Mp4Error, SampleTable, READ_CHUNK_SIZE, check_compatible, iter_fragmented_mp4,
+    build_clip_init_segment, iter_clip_fragment, clip_fragment_size, fragmented_layout
+)
+from app.services.temp_janitor import get_temp_janitor
+from app.services.generation_jobs import get_generation_queue, get_batch_executor, GenerationJob, QueueFullError, ProgressCallback, SignTiming
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,8 +49,12 @@ FINAL_VIDEOS_DIR = PROJECT_ROOT / "backend" / "uploads" / "isl-videos"
 TEMP_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 FINAL_VIDEOS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Supported models
-SUPPORTED_MODELS = ["male", "female"]
+# Clip URLs carry the clip version, so responses for the current version never change
+CLIPS_URL_PREFIX = "/api/v1/isl-video-generation/clips"
+
+# Stitched ladder rungs are content addressed: stitch key plus rung
+LADDER_SEGMENT_KEY = re.compile(r"^[0-9a-f]{64}-(native|\d+p)$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 class VideoGenerationRequest(BaseModel):
     text: str
@@ -42,8 +68,38 @@ class VideoGenerationResponse(BaseModel):
     video_duration: Optional[float] = None
     signs_used: List[str]
     signs_skipped: List[str]
+    sign_timings: List[SignTiming] = []  # Per-sign offsets for highlighting the current word
+    job_id: Optional[str] = None
+    status: str = "completed"  # queued | running | completed | failed
     error: Optional[str] = None
 
+class BatchGenerationItem(BaseModel):
+    text: str
+    model: str  # "male" or "female"
+
+class BatchGenerationRequest(BaseModel):
+    items: List[BatchGenerationItem]
+    user_id: int
+
+class BatchGenerationResponse(BaseModel):
+    success: bool
+    results: List[VideoGenerationResponse]  # One per item, in request order
+    unique_videos: int  # Distinct stitched outputs across the batch
+    stitched: int  # Outputs that had to be stitched (not in the stitch cache)
+
+class ManifestClip(BaseModel):
+    sign: str
+    url: str
+    duration: float
+    start: float
+
+class ClipManifestResponse(BaseModel):
+    success: bool
+    model: str
+    total_duration: float
+    clips: List[ManifestClip]
+    signs_skipped: List[str]
+
 class VideoSaveRequest(BaseModel):
     temp_video_id: str
     user_id: int
@@ -71,148 +127,261 @@ def parse_text_to_signs(text: str) -> List[str]:
     logger.info(f"Parsed text '{text}' into {len(words)} signs: {words}")
     return words
 
-def get_video_files_for_signs(signs: List[str], model: str) -> tuple[List[str], List[str]]:
-    """Get video file paths for signs, return (found_signs, missing_signs)"""
+def resolve_clips_for_signs(signs: List[str], model: str) -> tuple[List[SignClip], List[str]]:
+    """Resolve signs to indexed clips, return (found_clips, missing_signs)"""
     if model not in SUPPORTED_MODELS:
         raise ValueError(f"Unsupported model: {model}. Supported: {SUPPORTED_MODELS}")
     
-    model_dir = FRONTEND_VIDEOS_DIR / f"{model}-model"
-    if not model_dir.exists():
-        raise FileNotFoundError(f"Model directory not found: {model_dir}")
-    
-    found_videos = []
-    missing_signs = []
-    
-    for sign in signs:
-        # Try different possible file paths and formats
-        possible_files = [
-            # Direct file in model directory
-            model_dir / f"{sign}.mp4",
-            model_dir / f"{sign}.MP4",
-            model_dir / f"{sign}.avi",
-            model_dir / f"{sign}.mov",
-            # File in subdirectory (sign/sign.mp4)
-            model_dir / sign / f"{sign}.mp4",
-            model_dir / sign / f"{sign}.MP4",
-            model_dir / sign / f"{sign}.avi",
-            model_dir / sign / f"{sign}.mov"
-        ]
-        
-        video_found = False
-        for video_file in possible_files:
-            if video_file.exists():
-                found_videos.append(str(video_file))
-                video_found = True
-                logger.info(f"Found video for sign '{sign}': {video_file}")
-                break
-        
-        if not video_found:
-            missing_signs.append(sign)
-            logger.warning(f"No video found for sign: {sign}")
-    
-    logger.info(f"Found {len(found_videos)} videos, missing {len(missing_signs)} signs")
-    return found_videos, missing_signs
-
-def create_ffmpeg_concat_command(video_files: List[str], output_path: str) -> List[str]:
-    """Create FFmpeg command for concatenating videos"""
-    if not video_files:
-        raise ValueError("No video files provided for concatenation")
-    
-    # Create a temporary file list for FFmpeg
-    file_list_path = output_path.replace('.mp4', '_filelist.txt')
-    
-    with open(file_list_path, 'w') as f:
-        for video_file in video_files:
-            # Escape single quotes and write file path
-            escaped_path = video_file.replace("'", "'\"'\"'")
-            f.write(f"file '{escaped_path}'\n")
-    
-    # FFmpeg command for concatenation
-    cmd = [
-        'ffmpeg',
-        '-f', 'concat',
-        '-safe', '0',
-        '-i', file_list_path,
-        '-c', 'copy',  # Copy streams without re-encoding
-        '-y',  # Overwrite output file
-        output_path
-    ]
+    # Resolve against the in-memory sign index instead of probing the filesystem
+    clips, missing_signs = get_sign_index().resolve(signs, model)
     
-    logger.info(f"FFmpeg command: {' '.join(cmd)}")
-    return cmd, file_list_path
+    for sign in missing_signs:
+        logger.warning(f"No video found for sign: {sign}")
+    
+    logger.info(f"Found {len(clips)} videos, missing {len(missing_signs)} signs")
+    return clips, missing_signs
 
-def stitch_videos_with_ffmpeg(video_files: List[str], output_path: str) -> float:
-    """Stitch videos using FFmpeg and return duration"""
+def get_video_files_for_signs(signs: List[str], model: str) -> tuple[List[str], List[str]]:
+    """Get video file paths for signs, return (found_signs, missing_signs)"""
+    clips, missing_signs = resolve_clips_for_signs(signs, model)
+    return [clip.path for clip in clips], missing_signs
+
+def stitch_videos_with_ffmpeg(video_files: List[str], output_path: str, known_duration: Optional[float] = None,
+                              model: Optional[str] = None) -> float:
+    """Stitch videos using FFmpeg and return duration
+    
+    When known_duration is given (summed from clip metadata) the output is not probed.
+    A re-encode conforms to the model's canonical clip fingerprint.
+    """
     if not video_files:
         raise ValueError("No video files to stitch")
     
-    if len(video_files) == 1:
+    # Cover runs of clips with pre-stitched phrase segments to cut FFmpeg inputs
+    inputs = get_segment_cache().plan(video_files)
+    if len(inputs) < len(video_files):
+        logger.info(f"Phrase segments reduced {len(video_files)} clips to {len(inputs)} inputs")
+    
+    if len(inputs) == 1:
         # Single video, just copy it
-        shutil.copy2(video_files[0], output_path)
+        shutil.copy2(inputs[0], output_path)
         logger.info(f"Copied single video to: {output_path}")
         
+        if known_duration is not None:
+            return known_duration
+        
         # Get duration of single video
-        duration = get_video_duration(video_files[0])
+        duration = probe_duration(inputs[0])
         return duration
     
     # Multiple videos, use FFmpeg concatenation
-    cmd, file_list_path = create_ffmpeg_concat_command(video_files, output_path)
+    try:
+        concat_videos_with_ffmpeg(inputs, output_path)
+    except RuntimeError as e:
+        logger.warning(f"Stream copy concatenation failed, re-encoding in parallel segments: {e}")
+        return get_segmented_encoder().encode(inputs, output_path, target=model_encode_target(model))
+    
+    if known_duration is not None:
+        return known_duration
+    
+    # Get duration of final video
+    duration = probe_duration(output_path)
+    return duration
+
+def stitch_videos_with_mp4(video_files: List[str], output_path: str, known_duration: Optional[float] = None,
+                           model: Optional[str] = None) -> float:
+    """Stitch videos with the in-process fragmented MP4 muxer and return duration
+    
+    Clip sample tables are cached, so a stitch is header generation plus file copies.
+    Falls back to FFmpeg for clips the muxer cannot combine.
+    """
+    if not video_files:
+        raise ValueError("No video files to stitch")
+    
+    inputs = get_segment_cache().plan(video_files)
+    if len(inputs) < len(video_files):
+        logger.info(f"Phrase segments reduced {len(video_files)} clips to {len(inputs)} inputs")
     
     try:
-        logger.info("Starting FFmpeg video concatenation...")
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if result.returncode != 0:
-            logger.error(f"FFmpeg failed with return code {result.returncode}")
-            logger.error(f"FFmpeg stderr: {result.stderr}")
-            raise RuntimeError(f"FFmpeg concatenation failed: {result.stderr}")
-        
-        logger.info("FFmpeg concatenation completed successfully")
-        
-        # Clean up temporary file list
-        if os.path.exists(file_list_path):
-            os.remove(file_list_path)
-        
-        # Get duration of final video
-        duration = get_video_duration(output_path)
-        return duration
-        
-    except subprocess.TimeoutExpired:
-        logger.error("FFmpeg process timed out")
-        raise RuntimeError("Video processing timed out")
-    except Exception as e:
-        logger.error(f"FFmpeg error: {e}")
-        raise RuntimeError(f"Video processing failed: {str(e)}")
+        return concat_videos_with_mp4(inputs, output_path)
+    except Mp4Error as e:
+        logger.info(f"In-process muxer cannot stitch these clips, using FFmpeg: {e}")
+        return stitch_videos_with_ffmpeg(video_files, output_path, known_duration, model)
+
+def stitch_videos_with_segmented_encode(video_files: List[str], output_path: str, known_duration: Optional[float] = None,
+                                        model: Optional[str] = None) -> float:
+    """Re-encode the stitch as parallel segments of clips joined by stream copy, and return duration
+    
+    For outputs that must be re-encoded anyway; uses up to ISL_ENCODE_WORKERS FFmpeg processes.
+    """
+    if not video_files:
+        raise ValueError("No video files to stitch")
+    inputs = get_segment_cache().plan(video_files)
+    return get_segmented_encoder().encode(inputs, output_path, target=model_encode_target(model))
 
-def get_video_duration(video_path: str) -> float:
-    """Get video duration using FFprobe"""
+STITCH_BACKENDS = {
+    "ffmpeg": stitch_videos_with_ffmpeg,
+    "mp4": stitch_videos_with_mp4,
+    "segmented": stitch_videos_with_segmented_encode
+}
+
+def stitch_videos(video_files: List[str], output_path: str, known_duration: Optional[float] = None,
+                  model: Optional[str] = None) -> float:
+    """Stitch videos of a model with the backend selected by ISL_STITCH_BACKEND and return duration"""
+    backend = STITCH_BACKENDS.get(settings.ISL_STITCH_BACKEND, stitch_videos_with_ffmpeg)
+    return backend(video_files, output_path, known_duration, model)
+
+def materialize_cached_video(cache_key: str, output_path: str) -> Optional[float]:
+    """Place a cached stitched video at output_path, return its duration or None on a miss"""
+    stitch_cache = get_stitch_cache()
+    cached = stitch_cache.get(cache_key)
+    if not cached:
+        return None
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'quiet',
-            '-show_entries', 'format=duration',
-            '-of', 'csv=p=0',
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            duration = float(result.stdout.strip())
-            logger.info(f"Video duration: {duration:.2f} seconds")
-            return duration
-        else:
-            logger.warning(f"Could not get video duration: {result.stderr}")
-            return 0.0
-            
-    except Exception as e:
-        logger.warning(f"Error getting video duration: {e}")
-        return 0.0
+        stitch_cache.materialize(cached, output_path)
+    except OSError as e:
+        logger.warning(f"Cached video {cache_key[:12]} unavailable: {e}")
+        return None
+    logger.info(f"Stitch cache hit {cache_key[:12]}, skipping FFmpeg")
+    return cached.duration
+
+def stitch_and_cache(cache_key: str, video_files: List[str], output_path: str,
+                     report: Optional[ProgressCallback] = None, known_duration: Optional[float] = None,
+                     model: Optional[str] = None) -> float:
+    """Stitch videos into output_path and add the result to the stitch cache"""
+    if report:
+        report(0.2, f"Stitching {len(video_files)} videos")
+    logger.info(f"Stitching {len(video_files)} videos...")
+    duration = stitch_videos(video_files, output_path, known_duration, model)
+    
+    if report:
+        report(0.9, "Caching stitched video")
+    try:
+        get_stitch_cache().put(cache_key, output_path, duration)
+    except OSError as e:
+        logger.warning(f"Failed to cache stitched video {cache_key[:12]}: {e}")
+    return duration
+
+class StreamedStitch:
+    """
+    Writes a stitched fragmented MP4 to the preview location on its own thread, while
+    responses tail the partial file. The file, the stitch cache entry and the job's
+    outcome never depend on a client still reading.
+    """
+
+    def __init__(self, tables: List[SampleTable], job: GenerationJob, cache_key: str):
+        self.tables = tables
+        self.job = job
+        self.cache_key = cache_key
+        self.output_path = TEMP_VIDEOS_DIR / f"{job.temp_video_id}.mp4"
+        self.part_path = TEMP_VIDEOS_DIR / f"{job.temp_video_id}.mp4.part"
+        self._condition = threading.Condition()
+        self._written = 0
+        self._done = False
+        self._error: Optional[str] = None
+
+    def start(self):
+        # Created before any reader opens it
+        out = open(self.part_path, "wb")
+        threading.Thread(target=self._write, args=(out,), name=f"isl-stream-{self.job.job_id[:8]}",
+                         daemon=True).start()
+
+    def _write(self, out):
+        queue = get_generation_queue()
+        try:
+            with out:
+                for chunk in iter_fragmented_mp4(self.tables):
+                    out.write(chunk)
+                    out.flush()
+                    with self._condition:
+                        self._written += len(chunk)
+                        self._condition.notify_all()
+            os.replace(self.part_path, self.output_path)
+        except Exception as e:
+            logger.error(f"Streaming generation {self.job.job_id} failed: {e}")
+            try:
+                self.part_path.unlink()
+            except FileNotFoundError:
+                pass
+            queue.fail(self.job, str(e))
+            with self._condition:
+                self._error = str(e)
+                self._done = True
+                self._condition.notify_all()
+            return
+
+        try:
+            get_stitch_cache().put(self.cache_key, str(self.output_path), self.job.video_duration or 0.0)
+        except OSError as e:
+            logger.warning(f"Failed to cache stitched video {self.cache_key[:12]}: {e}")
+        queue.finish(self.job)
+        with self._condition:
+            self._done = True
+            self._condition.notify_all()
+        logger.info(f"ISL video streamed successfully: {self.job.temp_video_id}")
+
+    def tail(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the file as the writer produces it; stopping early only stops reading"""
+        with open(self.part_path, "rb") as f:
+            position = 0
+            while True:
+                with self._condition:
+                    while self._written == position and not self._done:
+                        self._condition.wait()
+                    written, done, error = self._written, self._done, self._error
+                if error:
+                    raise RuntimeError(f"Streaming generation failed: {error}")
+                while position < written:
+                    chunk = f.read(min(chunk_size, written - position))
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    yield chunk
+                if done:
+                    return
+
+async def wait_for_generation(temp_video_id: str):
+    """Wait for a queued generation of temp_video_id to finish, if there is one"""
+    queue = get_generation_queue()
+    job = queue.get_for_video(temp_video_id)
+    if job is None:
+        return
+    await queue.wait(job)
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=500,
+            detail=f"Video generation failed: {job.error}"
+        )
+
+def get_clip_duration(clip: SignClip) -> float:
+    """
+    Duration of an indexed clip. When ingest recorded none, it comes from the clip's
+    parsed sample table (the timeline stitching actually uses), then from ffprobe;
+    whatever resolves is kept on the clip, so neither runs again for it.
+    """
+    if clip.duration_seconds is None:
+        duration = 0.0
+        try:
+            duration = get_sample_table_cache().get(clip.path).duration_seconds
+        except (Mp4Error, OSError) as e:
+            logger.warning(f"No sample table duration for {clip.path}: {e}")
+        if duration <= 0:
+            duration = max(probe_duration(clip.path), 0.0)
+        clip.duration_seconds = duration
+    return clip.duration_seconds
+
+def compute_sign_timings(clips: List[SignClip]) -> tuple[float, List[SignTiming]]:
+    """Sum clip durations into the stitched duration and per-sign start/end offsets"""
+    timings = []
+    position = 0.0
+    for clip in clips:
+        end = position + get_clip_duration(clip)
+        timings.append(SignTiming(
+            sign=Path(clip.path).stem,
+            start=round(position, 3),
+            end=round(end, 3)
+        ))
+        position = end
+    return round(position, 3), timings
 
 def cleanup_temp_video(temp_video_id: str):
     """Clean up temporary video file"""
@@ -224,71 +393,127 @@ def cleanup_temp_video(temp_video_id: str):
         except Exception as e:
             logger.warning(f"Failed to cleanup temp video {temp_video_id}: {e}")
 
+def resolve_generation_request(text: str, model: str) -> tuple[List[SignClip], List[str]]:
+    """Validate a generation request and resolve its text to sign clips, raising HTTP 400 errors"""
+    # Validate model
+    if model not in SUPPORTED_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported model: {model}. Supported: {SUPPORTED_MODELS}"
+        )
+    
+    # Validate text
+    if not text or not text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Text cannot be empty"
+        )
+    
+    # Parse text into signs
+    signs = parse_text_to_signs(text)
+    if not signs:
+        raise HTTPException(
+            status_code=400,
+            detail="No valid signs found in text"
+        )
+    
+    # Get video files for signs
+    clips, missing_signs = resolve_clips_for_signs(signs, model)
+    if not clips:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No video files found for any signs. Missing: {missing_signs}"
+        )
+    return clips, missing_signs
+
 @router.post("/generate", response_model=VideoGenerationResponse)
 async def generate_isl_video(request: VideoGenerationRequest):
     """
     Generate ISL video by stitching individual sign videos
     
+    The stitch runs on the generation worker pool; the response carries a job ID
+    that can be polled at /jobs/{job_id}. The preview URL waits for the job.
+    
     Args:
         request: VideoGenerationRequest containing text, model, and user_id
     
     Returns:
-        VideoGenerationResponse with temp video ID and preview URL
+        VideoGenerationResponse with temp video ID, preview URL and job ID
     """
     try:
         logger.info(f"Generating ISL video for text: '{request.text}', model: {request.model}")
         
-        # Validate model
-        if request.model not in SUPPORTED_MODELS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported model: {request.model}. Supported: {SUPPORTED_MODELS}"
-            )
-        
-        # Validate text
-        if not request.text or not request.text.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="Text cannot be empty"
-            )
-        
-        # Parse text into signs
-        signs = parse_text_to_signs(request.text)
-        if not signs:
-            raise HTTPException(
-                status_code=400,
-                detail="No valid signs found in text"
-            )
-        
-        # Get video files for signs
-        video_files, missing_signs = get_video_files_for_signs(signs, request.model)
-        
-        if not video_files:
-            raise HTTPException(
-                status_code=400,
-                detail=f"No video files found for any signs. Missing: {missing_signs}"
-            )
+        clips, missing_signs = resolve_generation_request(request.text, request.model)
+        video_files = [clip.path for clip in clips]
         
         # Generate unique temporary video ID
         temp_video_id = str(uuid.uuid4())
-        temp_output_path = TEMP_VIDEOS_DIR / f"{temp_video_id}.mp4"
-        
-        # Stitch videos using FFmpeg
-        logger.info(f"Stitching {len(video_files)} videos...")
-        duration = stitch_videos_with_ffmpeg(video_files, str(temp_output_path))
+        temp_output_path = str(TEMP_VIDEOS_DIR / f"{temp_video_id}.mp4")
         
         # Create preview URL
         preview_url = f"/api/v1/isl-video-generation/preview/{temp_video_id}"
         
-        logger.info(f"ISL video generated successfully: {temp_video_id}")
+        # Durations come from the clip metadata index; clips without any are probed off the loop
+        if all(clip.duration_seconds is not None for clip in clips):
+            duration, sign_timings = compute_sign_timings(clips)
+        else:
+            duration, sign_timings = await asyncio.get_running_loop().run_in_executor(
+                None, compute_sign_timings, clips
+            )
+        
+        queue = get_generation_queue()
+        job = queue.create_job(temp_video_id, request.model)
+        job.preview_url = preview_url
+        job.video_duration = duration
+        job.signs_used = [Path(f).stem for f in video_files]
+        job.signs_skipped = missing_signs
+        job.sign_timings = sign_timings
+        
+        # Reuse an identical stitched output if one is cached, otherwise queue the stitch
+        cache_key = stitch_cache_key(request.model, clips)
+        if materialize_cached_video(cache_key, temp_output_path) is not None:
+            queue.finish(job)
+            logger.info(f"ISL video generated successfully: {temp_video_id}")
+        else:
+            def work(job: GenerationJob, report: ProgressCallback):
+                # Clips encoded differently from the model's reference are swapped for normalized copies
+                report(0.1, "Checking clip compatibility")
+                stitch_files = get_clip_normalizer().plan(request.model, clips)
+                # Feed the phrase miner so frequent sign sequences get pre-stitched
+                get_phrase_miner().record(stitch_files)
+                stitch_and_cache(cache_key, stitch_files, temp_output_path, report, known_duration=duration,
+                                 model=request.model)
+                logger.info(f"ISL video generated successfully: {temp_video_id}")
+            
+            def follow(leader: GenerationJob, follower: GenerationJob):
+                # Same clips as a stitch that was already running: reuse its output
+                if materialize_cached_video(cache_key, temp_output_path) is None:
+                    link_or_copy(str(TEMP_VIDEOS_DIR / f"{leader.temp_video_id}.mp4"), temp_output_path)
+            
+            try:
+                # Concurrent requests for the same clips attach to one running stitch
+                queue.submit(job, work, key=cache_key, follow=follow)
+            except QueueFullError as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e),
+                    headers={"Retry-After": "5"}
+                )
+            if job.coalesced_with:
+                logger.info(f"Attached ISL video generation job {job.job_id} to in-flight job {job.coalesced_with}")
+            else:
+                logger.info(f"Queued ISL video generation job {job.job_id}")
         
         return VideoGenerationResponse(
             success=True,
             temp_video_id=temp_video_id,
             preview_url=preview_url,
-            video_duration=duration,
-            signs_used=[Path(f).stem for f in video_files],
-            signs_skipped=missing_signs
+            video_duration=job.video_duration,
+            signs_used=job.signs_used,
+            signs_skipped=missing_signs,
+            sign_timings=sign_timings,
+            job_id=job.job_id,
+            status=job.status
         )
         
     except HTTPException:
@@ -346,10 +571,470 @@ async def generate_isl_video_form(
             detail=f"Video generation failed: {str(e)}"
         )
 
+def stitch_batch_group(model: str, clips: List[SignClip], cache_key: str,
+                       output_paths: List[str]) -> tuple[float, List[SignTiming], bool]:
+    """Produce one stitched video for every batch item sharing the same clip list"""
+    duration, sign_timings = compute_sign_timings(clips)
+    stitched = False
+    if materialize_cached_video(cache_key, output_paths[0]) is None:
+        stitch_files = get_clip_normalizer().plan(model, clips)
+        get_phrase_miner().record(stitch_files, weight=len(output_paths))
+        duration = stitch_and_cache(cache_key, stitch_files, output_paths[0], known_duration=duration, model=model)
+        stitched = True
+    for output_path in output_paths[1:]:
+        link_or_copy(output_paths[0], output_path)
+    return duration, sign_timings, stitched
+
+def failed_generation(error: str) -> VideoGenerationResponse:
+    return VideoGenerationResponse(
+        success=False,
+        temp_video_id="",
+        preview_url="",
+        signs_used=[],
+        signs_skipped=[],
+        status="failed",
+        error=error
+    )
+
+@router.post("/generate-batch", response_model=BatchGenerationResponse)
+async def generate_isl_video_batch(request: BatchGenerationRequest):
+    """
+    Generate ISL videos for many announcements in one request
+    
+    Signs are resolved once per distinct word and model, items resolving to the same
+    clips share one stitch, and distinct stitches run in parallel on the batch worker
+    pool. Invalid items fail individually; results follow the order of the items.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to generate")
+    if len(request.items) > settings.ISL_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items: {len(request.items)}. Maximum: {settings.ISL_BATCH_MAX_ITEMS}"
+        )
+    
+    try:
+        logger.info(f"Generating batch of {len(request.items)} ISL videos")
+        index = get_sign_index()
+        results: List[Optional[VideoGenerationResponse]] = [None] * len(request.items)
+        
+        # Parse every item, collecting the distinct words per model
+        item_signs: Dict[int, List[str]] = {}
+        vocabulary: Dict[str, set] = {}
+        for i, item in enumerate(request.items):
+            if item.model not in SUPPORTED_MODELS:
+                results[i] = failed_generation(f"Unsupported model: {item.model}. Supported: {SUPPORTED_MODELS}")
+                continue
+            signs = parse_text_to_signs(item.text) if item.text else []
+            if not signs:
+                results[i] = failed_generation("No valid signs found in text")
+                continue
+            item_signs[i] = signs
+            vocabulary.setdefault(item.model, set()).update(signs)
+        
+        # One index lookup per distinct word and model
+        resolved = {
+            model: {word: index.lookup(model, word) for word in words}
+            for model, words in vocabulary.items()
+        }
+        
+        # Group items by resolved clip list so identical videos are stitched once
+        groups: Dict[str, dict] = {}
+        queue = get_generation_queue()
+        jobs: Dict[int, GenerationJob] = {}
+        for i, signs in item_signs.items():
+            model = request.items[i].model
+            clips = [resolved[model][sign] for sign in signs if resolved[model][sign]]
+            missing_signs = [sign for sign in signs if not resolved[model][sign]]
+            if not clips:
+                results[i] = failed_generation(f"No video files found for any signs. Missing: {missing_signs}")
+                continue
+            
+            temp_video_id = str(uuid.uuid4())
+            job = queue.create_job(temp_video_id, model)
+            job.status = "running"
+            job.started_at = datetime.now()
+            job.preview_url = f"/api/v1/isl-video-generation/preview/{temp_video_id}"
+            job.signs_used = [Path(clip.path).stem for clip in clips]
+            job.signs_skipped = missing_signs
+            jobs[i] = job
+            
+            cache_key = stitch_cache_key(model, clips)
+            group = groups.setdefault(cache_key, {"model": model, "clips": clips, "items": []})
+            group["items"].append(i)
+        
+        loop = asyncio.get_running_loop()
+        executor = get_batch_executor()
+        keys = list(groups)
+        outcomes = await asyncio.gather(*[
+            loop.run_in_executor(
+                executor, stitch_batch_group,
+                groups[key]["model"], groups[key]["clips"], key,
+                [str(TEMP_VIDEOS_DIR / f"{jobs[i].temp_video_id}.mp4") for i in groups[key]["items"]]
+            )
+            for key in keys
+        ], return_exceptions=True)
+        
+        stitched = 0
+        for key, outcome in zip(keys, outcomes):
+            for i in groups[key]["items"]:
+                job = jobs[i]
+                if isinstance(outcome, BaseException):
+                    logger.error(f"Batch item {i} failed: {outcome}")
+                    queue.fail(job, str(outcome))
+                    results[i] = failed_generation(f"Video generation failed: {outcome}")
+                    continue
+                job.video_duration, job.sign_timings, _ = outcome
+                queue.finish(job)
+                results[i] = VideoGenerationResponse(
+                    success=True,
+                    temp_video_id=job.temp_video_id,
+                    preview_url=job.preview_url,
+                    video_duration=job.video_duration,
+                    signs_used=job.signs_used,
+                    signs_skipped=job.signs_skipped,
+                    sign_timings=job.sign_timings,
+                    job_id=job.job_id,
+                    status=job.status
+                )
+            if not isinstance(outcome, BaseException) and outcome[2]:
+                stitched += 1
+        
+        logger.info(f"Batch generated {len(request.items)} items from {len(keys)} distinct videos, {stitched} stitched")
+        return BatchGenerationResponse(
+            success=all(result.success for result in results),
+            results=results,
+            unique_videos=len(keys),
+            stitched=stitched
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch video generation error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch video generation failed: {str(e)}"
+        )
+
+@router.get("/generate-stream")
+async def generate_isl_video_stream(text: str, model: str, user_id: int):
+    """
+    Generate ISL video and stream it as fragmented MP4 while it is assembled
+    
+    Playback can start after the first clip is muxed. A GET endpoint so it can be used
+    directly as a video source. When the stream ends the video is available at the
+    preview URL (X-Preview-Url header) and can be saved like any generated video.
+    Clips the in-process muxer cannot combine are stitched with FFmpeg first.
+    """
+    try:
+        logger.info(f"Streaming ISL video for text: '{text}', model: {model}")
+        clips, missing_signs = resolve_generation_request(text, model)
+        
+        temp_video_id = str(uuid.uuid4())
+        temp_output_path = str(TEMP_VIDEOS_DIR / f"{temp_video_id}.mp4")
+        preview_url = f"/api/v1/isl-video-generation/preview/{temp_video_id}"
+        
+        queue = get_generation_queue()
+        job = queue.create_job(temp_video_id, model)
+        job.status = "running"
+        job.started_at = datetime.now()
+        job.preview_url = preview_url
+        job.signs_used = [Path(clip.path).stem for clip in clips]
+        job.signs_skipped = missing_signs
+        
+        headers = {
+            "X-Temp-Video-Id": temp_video_id,
+            "X-Job-Id": job.job_id,
+            "X-Preview-Url": preview_url,
+            "X-Signs-Skipped": ",".join(missing_signs),
+            "Cache-Control": "no-store"
+        }
+        
+        cache_key = stitch_cache_key(model, clips)
+        cached_duration = materialize_cached_video(cache_key, temp_output_path)
+        if cached_duration is not None:
+            job.video_duration = cached_duration
+            queue.finish(job)
+            return MediaFileResponse(path=temp_output_path, headers=headers)
+        
+        def prepare():
+            job.video_duration, job.sign_timings = compute_sign_timings(clips)
+            stitch_files = get_clip_normalizer().plan(model, clips)
+            get_phrase_miner().record(stitch_files)
+            try:
+                tables = load_sample_tables(get_segment_cache().plan(stitch_files))
+                check_compatible(tables)
+                return tables
+            except Mp4Error as e:
+                logger.info(f"In-process muxer cannot stream these clips, stitching with FFmpeg: {e}")
+                stitch_and_cache(cache_key, stitch_files, temp_output_path, known_duration=job.video_duration,
+                                 model=model)
+                return None
+        
+        try:
+            tables = await asyncio.get_running_loop().run_in_executor(None, prepare)
+        except Exception as e:
+            queue.fail(job, str(e))
+            raise
+        
+        if tables is None:
+            queue.finish(job)
+            return MediaFileResponse(path=temp_output_path, headers=headers)
+        
+        job.video_duration = sum(table.duration for table in tables) / tables[0].timescale
+        headers["X-Video-Duration"] = f"{job.video_duration:.3f}"
+        stitch = StreamedStitch(tables, job, cache_key)
+        stitch.start()
+        return StreamingResponse(
+            stitch.tail(),
+            media_type="video/mp4",
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Streaming video generation error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Video generation failed: {str(e)}"
+        )
+
+def clip_url(model: str, clip: SignClip, part: str = "") -> str:
+    """Versioned URL of an indexed clip, or of its fMP4 init/fragment part for HLS"""
+    sign = quote(clip.sign, safe="")
+    path = f"{CLIPS_URL_PREFIX}/{model}/{sign}/{part}" if part else f"{CLIPS_URL_PREFIX}/{model}/{sign}.mp4"
+    return f"{path}?v={clip.version}"
+
+def build_hls_playlist(model: str, clips: List[SignClip], tables: List[SampleTable]) -> str:
+    """HLS media playlist playing each clip as its own fMP4 segment"""
+    durations = [table.duration_seconds for table in tables]
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:7",
+        f"#EXT-X-TARGETDURATION:{max(1, math.ceil(max(durations)))}",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS"
+    ]
+    for i, (clip, duration) in enumerate(zip(clips, durations)):
+        # Every clip has its own decoder config and timeline
+        if i > 0:
+            lines.append("#EXT-X-DISCONTINUITY")
+        lines.append(f'#EXT-X-MAP:URI="{clip_url(model, clip, "init.mp4")}"')
+        lines.append(f"#EXTINF:{duration:.3f},{clip.sign}")
+        lines.append(clip_url(model, clip, "fragment.m4s"))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+@router.get("/manifest")
+async def get_clip_manifest(text: str, model: str, format: str = "json"):
+    """
+    Ordered clip manifest for players that sequence sign clips themselves
+    
+    Built from the sign index alone: nothing is encoded or written. format=json returns
+    clip URLs with durations, format=hls an HLS media playlist. Clip URLs are versioned
+    and served with immutable caching, so they are reused across announcements.
+    """
+    if format not in ("json", "hls"):
+        raise HTTPException(status_code=400, detail="format must be json or hls")
+    
+    clips, missing_signs = resolve_generation_request(text, model)
+    
+    if format == "hls":
+        try:
+            tables = await asyncio.get_running_loop().run_in_executor(
+                None, load_sample_tables, [clip.path for clip in clips]
+            )
+        except Mp4Error as e:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Clips cannot be served as HLS segments, use format=json: {e}"
+            )
+        return Response(
+            content=build_hls_playlist(model, clips, tables),
+            media_type="application/vnd.apple.mpegurl",
+            headers={"Cache-Control": "no-cache"}
+        )
+    
+    # Clips without an ingest-recorded duration take it from their sample table, like HLS
+    durations = await asyncio.get_running_loop().run_in_executor(
+        None, lambda: [get_clip_duration(clip) for clip in clips]
+    )
+    manifest_clips = []
+    offset = 0.0
+    for clip, duration in zip(clips, durations):
+        manifest_clips.append(ManifestClip(
+            sign=clip.sign,
+            url=clip_url(model, clip),
+            duration=round(duration, 3),
+            start=round(offset, 3)
+        ))
+        offset += duration
+    
+    return ClipManifestResponse(
+        success=True,
+        model=model,
+        total_duration=round(offset, 3),
+        clips=manifest_clips,
+        signs_skipped=missing_signs
+    )
+
+def build_master_playlist(variants: List[tuple[str, int, int, int]]) -> str:
+    """HLS master playlist from (uri, bandwidth, width, height) variants"""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:7", "#EXT-X-INDEPENDENT-SEGMENTS"]
+    for uri, bandwidth, width, height in variants:
+        lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height}")
+        lines.append(uri)
+    return "\n".join(lines) + "\n"
+
+def build_rung_playlist(segment_uri: str, tables: List[SampleTable]) -> str:
+    """HLS media playlist addressing each clip's fragment of one stitched file by byte range"""
+    layout = fragmented_layout(tables)
+    init_offset, init_length = layout[0]
+    durations = [table.duration_seconds for table in tables]
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:7",
+        f"#EXT-X-TARGETDURATION:{max(1, math.ceil(max(durations)))}",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS",
+        f'#EXT-X-MAP:URI="{segment_uri}",BYTERANGE="{init_length}@{init_offset}"'
+    ]
+    for (offset, length), duration in zip(layout[1:], durations):
+        lines.append(f"#EXTINF:{duration:.3f},")
+        lines.append(f"#EXT-X-BYTERANGE:{length}@{offset}")
+        lines.append(segment_uri)
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+def parse_rung(rung: str) -> Optional[int]:
+    """Rung path component: native, or a configured height such as 480p"""
+    if rung == "native":
+        return None
+    if rung.endswith("p") and rung[:-1].isdigit() and get_rendition_ladder().rung(int(rung[:-1])):
+        return int(rung[:-1])
+    raise HTTPException(status_code=404, detail=f"Unknown rung: {rung}")
+
+@router.get("/ladder/master.m3u8")
+async def get_ladder_master_playlist(text: str, model: str):
+    """
+    HLS master playlist offering the announcement at the native resolution and at
+    every ISL_RENDITION_LADDER rung, so players pick what their link sustains
+    
+    Nothing is stitched until a player requests a rung's media playlist. A rung is
+    offered once ingest or library sync has encoded it for every clip.
+    """
+    clips, _ = resolve_generation_request(text, model)
+    ladder = get_rendition_ladder()
+    
+    def load():
+        ready = {rung.height for rung in ladder_rungs() if ladder.rung_ready(clips, rung.height)}
+        return load_sample_tables([clip.path for clip in clips]), ready
+    
+    try:
+        tables, ready_heights = await asyncio.get_running_loop().run_in_executor(None, load)
+    except Mp4Error as e:
+        raise HTTPException(status_code=422, detail=f"Clips cannot be served as HLS: {e}")
+    
+    duration = sum(table.duration_seconds for table in tables) or 1.0
+    native = tables[0]
+    query = urlencode({"text": text, "model": model})
+    native_bandwidth = int(sum(table.data_size for table in tables) * 8 / duration)
+    variants = [(f"native.m3u8?{query}", native_bandwidth, native.width, native.height)]
+    for rung in ladder_rungs():
+        # A rung only helps when it is smaller than the clips themselves
+        if rung.height in ready_heights and rung.height < native.height and rung.kbps * 1000 < native_bandwidth:
+            variants.append((f"{rung.height}p.m3u8?{query}", rung.kbps * 1000,
+                             rung_width(native, rung.height), rung.height))
+    
+    return Response(
+        content=build_master_playlist(variants),
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/ladder/{rung}.m3u8")
+async def get_ladder_rung_playlist(rung: str, text: str, model: str):
+    """Media playlist of one rung, stitching its prepared clip renditions (by stream copy) on first request"""
+    height = parse_rung(rung)
+    clips, _ = resolve_generation_request(text, model)
+    try:
+        output, tables = await asyncio.get_running_loop().run_in_executor(
+            None, get_rendition_ladder().stitch, model, clips, height
+        )
+    except RenditionNotReadyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Mp4Error as e:
+        raise HTTPException(status_code=422, detail=f"Clips cannot be served as HLS: {e}")
+    except RuntimeError as e:
+        logger.error(f"Ladder rung {rung} failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to prepare {rung} rendition")
+    
+    return Response(
+        content=build_rung_playlist(f"segments/{output.cache_key}.mp4", tables),
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/ladder/segments/{cache_key}.mp4")
+async def get_ladder_segment_file(cache_key: str):
+    """Stitched rung file; rung playlists address its fragments by byte range"""
+    if not LADDER_SEGMENT_KEY.match(cache_key):
+        raise HTTPException(status_code=404, detail="Rendition not found")
+    entry = get_stitch_cache().get(cache_key)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Rendition expired, reload the playlist")
+    return MediaFileResponse(path=entry.path, headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
+
+def get_indexed_clip(model: str, sign: str) -> SignClip:
+    if model not in SUPPORTED_MODELS:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model}")
+    clip = get_sign_index().lookup(model, sign)
+    if clip is None:
+        raise HTTPException(status_code=404, detail=f"No clip for sign: {sign}")
+    return clip
+
+def clip_cache_headers(clip: SignClip, version: Optional[str]) -> dict:
+    """Immutable caching when the URL names the current clip version, revalidation otherwise"""
+    cache_control = IMMUTABLE_CACHE_CONTROL if version == clip.version else "no-cache"
+    return {"Cache-Control": cache_control, "ETag": f'"{clip.version}"'}
+
+@router.get("/clips/{model}/{sign}.mp4")
+async def get_clip(model: str, sign: str, v: Optional[str] = None):
+    """Serve an indexed sign clip"""
+    clip = get_indexed_clip(model, sign)
+    return MediaFileResponse(path=clip.path, headers=clip_cache_headers(clip, v))
+
+@router.get("/clips/{model}/{sign}/init.mp4")
+async def get_clip_init_segment(model: str, sign: str, v: Optional[str] = None):
+    """fMP4 init segment of an indexed sign clip, for HLS manifests"""
+    clip = get_indexed_clip(model, sign)
+    try:
+        table = get_sample_table_cache().get(clip.path)
+    except Mp4Error as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=build_clip_init_segment(table), media_type="video/mp4",
+                    headers=clip_cache_headers(clip, v))
+
+@router.get("/clips/{model}/{sign}/fragment.m4s")
+async def get_clip_fragment(model: str, sign: str, v: Optional[str] = None):
+    """fMP4 media segment of an indexed sign clip, for HLS manifests"""
+    clip = get_indexed_clip(model, sign)
+    try:
+        table = get_sample_table_cache().get(clip.path)
+    except Mp4Error as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    headers = clip_cache_headers(clip, v)
+    headers["Content-Length"] = str(clip_fragment_size(table))
+    return StreamingResponse(iter_clip_fragment(table), media_type="video/iso.segment", headers=headers)
+
 @router.get("/preview/{video_id}")
 async def get_preview_video(video_id: str):
     """Serve temporary video file for preview"""
     try:
+        await wait_for_generation(video_id)
+        
         temp_file = TEMP_VIDEOS_DIR / f"{video_id}.mp4"
         
         if not temp_file.exists():
@@ -358,9 +1043,11 @@ async def get_preview_video(video_id: str):
                 detail="Preview video not found or expired"
             )
         
-        return FileResponse(
+        # Keep previews that are still being watched out of the janitor's reach
+        get_temp_janitor().touch(temp_file)
+        
+        return MediaFileResponse(
             path=str(temp_file),
-            media_type="video/mp4",
             filename=f"isl_preview_{video_id}.mp4"
         )
         
@@ -387,6 +1074,8 @@ async def save_isl_video(request: VideoSaveRequest):
     try:
         logger.info(f"Saving ISL video: {request.temp_video_id} for user: {request.user_id}")
         
+        await wait_for_generation(request.temp_video_id)
+        
         # Check if temporary video exists
         temp_file = TEMP_VIDEOS_DIR / f"{request.temp_video_id}.mp4"
         if not temp_file.exists():
@@ -462,8 +1151,36 @@ async def cleanup_temp_video_endpoint(temp_video_id: str):
             detail=f"Failed to cleanup temporary video: {str(e)}"
         )
 
+@router.get("/jobs")
+async def get_generation_queue_stats():
+    """Get depth and concurrency of the ISL generation job queue"""
+    return get_generation_queue().stats()
+
+@router.get("/jobs/{job_id}", response_model=GenerationJob)
+async def get_generation_job(job_id: str):
+    """Get status, progress and result URL of an ISL generation job"""
+    job = get_generation_queue().get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail="Generation job not found or expired"
+        )
+    return job
+
+@router.get("/cache/stats")
+async def get_stitch_cache_stats():
+    """Get hit/miss counters and size of the stitching caches"""
+    return {
+        "stitch_cache": get_stitch_cache().stats(),
+        "segment_cache": get_segment_cache().stats(),
+        "normalized_clips": get_clip_normalizer().stats(),
+        "sample_tables": get_sample_table_cache().stats(),
+        "rendition_ladder": get_rendition_ladder().stats(),
+        "segmented_encoder": get_segmented_encoder().stats()
+    }
+
 @router.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint for ISL video generation service"""
     try:
         # Check if FFmpeg is available
@@ -483,6 +1200,8 @@ async def health_check():
             "ffmpeg_available": ffmpeg_available,
             "directories_ok": directories_ok,
             "supported_models": len(SUPPORTED_MODELS),
+            "indexed_signs": get_sign_index().stats(),
+            "generation_queue": get_generation_queue().stats(),
             "frontend_videos_dir": str(FRONTEND_VIDEOS_DIR),
             "temp_videos_dir": str(TEMP_VIDEOS_DIR),
             "final_videos_dir": str(FINAL_VIDEOS_DIR)
@@ -1,20 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
-from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import os
-import subprocess
+import re
+import shutil
 import asyncio
 from pathlib import Path
 
+from app.core.config import settings
 from app.db.deps import get_db
 from app.schemas.isl_video import ISLVideo, ISLVideoCreate, ISLVideoUpdate, ISLVideoSearch
+from app.schemas.isl_ingest_job import ISLIngestJob
 from app.models.isl_video import ISLVideo as ISLVideoModel
-from app.services.isl_video import get_isl_video_service, ISLVideoService
+from app.models.isl_ingest_job import ISLIngestJob as ISLIngestJobModel
+from app.services.isl_video import get_isl_video_service, ISLVideoService, decode_cursor
+from app.services.sign_index import get_sign_index
+from app.services.clip_renditions import poster_media_type
+from app.services.ingest_jobs import get_ingest_worker
+from app.services.library_sync import SyncJob, get_library_syncer
+from app.utils.media_response import MediaFileResponse
+from app.utils.uploads import UploadTooLargeError, stage_upload
+from app.api.v1.endpoints.isl_video_generation import FINAL_VIDEOS_DIR
 
 router = APIRouter()
 
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
 def get_project_root():
     """Get the project root directory dynamically"""
     current_file = Path(__file__)
@@ -39,84 +51,35 @@ def test_endpoint():
     return {"message": "ISL videos endpoint is working"}
 
 
-def get_video_duration(video_path: str) -> float:
-    """Get video duration using ffprobe"""
-    try:
-        cmd = [
-            "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-            "-of", "csv=p=0", video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-    except Exception:
-        pass
-    return 0.0
-
-
-async def process_video_async(video_id: int, input_path: str, output_folder: str, db: Session):
-    """Background video processing with FFmpeg"""
-    try:
-        # Generate output filename
-        filename = os.path.basename(input_path)
-        name_without_ext = os.path.splitext(filename)[0]
-        output_filename = f"{name_without_ext}_processed.mp4"
-        output_path = f"{output_folder}/{output_filename}"
-
-        # FFmpeg command
-        cmd = [
-            "ffmpeg", "-i", input_path,
-            "-vf", "fps=30:round=up,scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2",
-            "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-            "-an", "-movflags", "+faststart", "-pix_fmt", "yuv420p",
-            output_path, "-y"
-        ]
-
-        # Execute FFmpeg
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode == 0:
-            # Get video metadata
-            duration = get_video_duration(output_path)
-            file_size = os.path.getsize(output_path)
-
-            # Remove original file
-            if os.path.exists(input_path):
-                os.remove(input_path)
-
-            # Rename processed file to original filename
-            original_filename = os.path.basename(input_path)
-            final_path = f"{output_folder}/{original_filename}"
-            os.rename(output_path, final_path)
-
-            # Update database with processed video info
-            video_service = get_isl_video_service(db)
-            update_data = ISLVideoUpdate(
-                video_path=final_path,
-                file_size=file_size,
-                duration_seconds=duration
-            )
-            video_service.update_isl_video(video_id, update_data)
-
-            print(f"✅ Video {video_id} processed successfully")
+def clip_folder_file(path: Optional[str], model_type: str) -> Optional[str]:
+    """A path recorded on a video row, if it is an existing file inside the model's clip folder"""
+    if not path or not os.path.isfile(path):
+        return None
+    model_path = (get_public_videos_path() / f"{model_type}-model").resolve()
+    if not Path(path).resolve().is_relative_to(model_path):
+        return None
+    return path
 
-        else:
-            # Handle processing error
-            video_service = get_isl_video_service(db)
-            update_data = ISLVideoUpdate(is_active=False)
-            video_service.update_isl_video(video_id, update_data)
-            print(
-                f"❌ FFmpeg processing failed for video {video_id}: {result.stderr}")
 
-    except Exception as e:
-        print(f"❌ Error processing video {video_id}: {e}")
-        # Mark as failed in database
-        try:
-            video_service = get_isl_video_service(db)
-            update_data = ISLVideoUpdate(is_active=False)
-            video_service.update_isl_video(video_id, update_data)
-        except:
-            pass
+def duplicate_info(video: ISLVideoModel) -> dict:
+    """Summary of an existing video for duplicate responses"""
+    return {
+        "id": video.id,
+        "filename": video.filename,
+        "display_name": video.display_name,
+        "file_size": video.file_size,
+        "created_at": video.created_at.isoformat() if video.created_at else None
+    }
+
+
+def content_digest_form(content_sha256: Optional[str]) -> Optional[str]:
+    """Normalise a client-supplied SHA-256 hex digest, rejecting anything else"""
+    if not content_sha256:
+        return None
+    digest = content_sha256.strip().lower()
+    if not SHA256_HEX.match(digest):
+        raise HTTPException(status_code=400, detail="content_sha256 must be a hex SHA-256 digest")
+    return digest
 
 
 @router.post("/check-duplicate", response_model=dict)
@@ -125,9 +88,10 @@ def check_duplicate_video(
     model_type: str = Form(...),
     file_size: int = Form(None),
     display_name: str = Form(None),
+    content_sha256: str = Form(None),
     db: Session = Depends(get_db)
 ):
-    """Check if a video with the same filename/display_name already exists"""
+    """Check if a video with the same content, filename or display_name already exists"""
     
     # Validate model type
     if model_type not in ['male', 'female']:
@@ -136,19 +100,24 @@ def check_duplicate_video(
     
     video_service = get_isl_video_service(db)
     
+    # Same bytes under any name: one lookup on the content digest index
+    content_sha256 = content_digest_form(content_sha256)
+    if content_sha256:
+        content_duplicate = video_service.find_by_content_digest(content_sha256, model_type)
+        if content_duplicate:
+            return {
+                "is_duplicate": True,
+                "duplicate_type": "content_match",
+                "duplicate_video": duplicate_info(content_duplicate)
+            }
+    
     # Check for exact duplicates
     duplicate_video = video_service.check_duplicate_video(filename, model_type, file_size)
     if duplicate_video:
         return {
             "is_duplicate": True,
             "duplicate_type": "exact_match",
-            "duplicate_video": {
-                "id": duplicate_video.id,
-                "filename": duplicate_video.filename,
-                "display_name": duplicate_video.display_name,
-                "file_size": duplicate_video.file_size,
-                "created_at": duplicate_video.created_at.isoformat() if duplicate_video.created_at else None
-            }
+            "duplicate_video": duplicate_info(duplicate_video)
         }
     
     # Check for display name duplicates
@@ -158,13 +127,7 @@ def check_duplicate_video(
         return {
             "is_duplicate": True,
             "duplicate_type": "display_name_match",
-            "duplicate_video": {
-                "id": display_name_duplicate.id,
-                "filename": display_name_duplicate.filename,
-                "display_name": display_name_duplicate.display_name,
-                "file_size": display_name_duplicate.file_size,
-                "created_at": display_name_duplicate.created_at.isoformat() if display_name_duplicate.created_at else None
-            }
+            "duplicate_video": duplicate_info(display_name_duplicate)
         }
     
     return {
@@ -181,9 +144,14 @@ async def upload_isl_video(
     display_name: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),
+    content_sha256: Optional[str] = Form(None),
     db: Session = Depends(get_db)
 ):
-    """Upload ISL video with automatic folder creation and processing"""
+    """
+    Upload ISL video with automatic folder creation and processing.
+    Clients that send the file's SHA-256 as content_sha256 get a 409 for a duplicate
+    before anything is written to the library.
+    """
 
     # Validate file type
     if not file.filename or not file.filename.lower().endswith('.mp4'):
@@ -199,29 +167,72 @@ async def upload_isl_video(
     filename = file.filename
     folder_name = os.path.splitext(filename)[0]  # Remove .mp4 extension
 
-    # Check for duplicates before processing
+    # Create directory structure in public folder
+    base_path = get_public_videos_path()
+    model_path = base_path / f"{model_type}-model"
+    video_folder = model_path / folder_name
+    original_path = video_folder / filename
+    path_str = str(original_path)
+    folder_existed = video_folder.exists()
     video_service = get_isl_video_service(db)
+
+    # The same content already stored under another name in this model is rejected;
+    # re-uploading identical bytes to the same path is a plain replace
+    content_sha256 = content_digest_form(content_sha256)
+    if content_sha256:
+        content_duplicate = video_service.find_by_content_digest(content_sha256, model_type)
+        if content_duplicate and content_duplicate.video_path != path_str:
+            raise HTTPException(status_code=409, detail={
+                "message": f"Identical video already exists as '{content_duplicate.filename}'",
+                "duplicate_video": duplicate_info(content_duplicate)
+            })
+    
+    # Create folder
+    os.makedirs(str(video_folder), exist_ok=True)
     
-    # Read file content to get file size
-    content = await file.read()
-    file_size = len(content)
+    # Stream the upload to disk in fixed-size chunks, sizing and hashing it on the way
+    try:
+        staged = await stage_upload(file, video_folder, settings.ISL_UPLOAD_MAX_BYTES)
+    except UploadTooLargeError as e:
+        if not folder_existed:
+            shutil.rmtree(video_folder, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to save file: {str(e)}")
     
-    # Check for duplicates but allow upload to continue
+    if staged.size == 0:
+        staged.discard()
+        if not folder_existed:
+            shutil.rmtree(video_folder, ignore_errors=True)
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    file_size = staged.size
+
+    def reject_staged(status_code: int, detail):
+        staged.discard()
+        if not folder_existed:
+            shutil.rmtree(video_folder, ignore_errors=True)
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    if content_sha256 and content_sha256 != staged.sha256:
+        reject_staged(400, "content_sha256 does not match the uploaded file")
+
+    # Exact duplicates by content, whatever the filename
+    duplicate_video = video_service.find_by_content_digest(staged.sha256, model_type)
+    if duplicate_video and duplicate_video.video_path != path_str:
+        reject_staged(409, {
+            "message": f"Identical video already exists as '{duplicate_video.filename}'",
+            "duplicate_video": duplicate_info(duplicate_video)
+        })
+
+    # Other potential duplicates are reported but allow upload to continue
     duplicate_warnings = []
     
-    # Check for exact duplicates
-    duplicate_video = video_service.check_duplicate_video(filename, model_type, file_size)
     if duplicate_video:
         duplicate_warnings.append({
             "type": "exact_match",
-            "message": f"Exact duplicate found: '{filename}' with same file size",
-            "duplicate_video": {
-                "id": duplicate_video.id,
-                "filename": duplicate_video.filename,
-                "display_name": duplicate_video.display_name,
-                "file_size": duplicate_video.file_size,
-                "created_at": duplicate_video.created_at.isoformat() if duplicate_video.created_at else None
-            }
+            "message": f"Exact duplicate found: '{filename}' has the same content",
+            "duplicate_video": duplicate_info(duplicate_video)
         })
     
     # Check for potential duplicates (same display name)
@@ -231,89 +242,79 @@ async def upload_isl_video(
         duplicate_warnings.append({
             "type": "display_name_match",
             "message": f"Display name duplicate found: '{final_display_name}'",
-            "duplicate_video": {
-                "id": display_name_duplicate.id,
-                "filename": display_name_duplicate.filename,
-                "display_name": display_name_duplicate.display_name,
-                "file_size": display_name_duplicate.file_size,
-                "created_at": display_name_duplicate.created_at.isoformat() if display_name_duplicate.created_at else None
-            }
+            "duplicate_video": duplicate_info(display_name_duplicate)
         })
 
-    # Create directory structure in public folder
-    base_path = get_public_videos_path()
-    model_path = base_path / f"{model_type}-model"
-    video_folder = model_path / folder_name
-    
-    # Create folder
-    os.makedirs(str(video_folder), exist_ok=True)
-    
     # Check if file already exists and get existing video record
-    original_path = video_folder / filename
-    path_str = str(original_path)
     existing_video = db.query(ISLVideoModel).filter(ISLVideoModel.video_path == path_str).first()
+    record_fields = {
+        "filename": filename,
+        "display_name": display_name or folder_name,
+        "file_size": file_size,
+        "content_sha256": staged.sha256,
+        "model_type": model_type,
+        "mime_type": "video/mp4",
+        "file_extension": "mp4",
+        "description": description,
+        "tags": tags,
+        "is_active": True
+    }
+    previous_fields = (
+        {field: getattr(existing_video, field) for field in record_fields} if existing_video else None
+    )
+
+    # Record the upload before it replaces anything on disk, so a digest conflict
+    # leaves the library's current file untouched
     try:
-        with open(str(original_path), "wb") as buffer:
-            buffer.write(content)
+        if existing_video:
+            db_video = video_service.record_ingest_metadata(existing_video.id, **record_fields)
+        else:
+            db_video = video_service.create_isl_video(ISLVideoCreate(video_path=path_str, **record_fields))
+    except IntegrityError:
+        db.rollback()
+        conflicting = video_service.find_by_content_digest(staged.sha256, model_type)
+        if conflicting:
+            reject_staged(409, {
+                "message": f"Identical video already exists as '{conflicting.filename}'",
+                "duplicate_video": duplicate_info(conflicting)
+            })
+        reject_staged(409, "Identical video was uploaded concurrently")
+
+    try:
+        # Atomic: readers see the old clip or the new one, never a partial file
+        staged.commit(original_path)
     except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Failed to save file: {str(e)}")
+        # Put the record back the way it was
+        if existing_video:
+            video_service.record_ingest_metadata(existing_video.id, **previous_fields)
+        else:
+            db.delete(db_video)
+            db.commit()
+        reject_staged(500, f"Failed to save file: {str(e)}")
+
+    # Make the new clip visible to ISL video generation
+    get_sign_index().refresh_sign(model_type, folder_name)
 
-    # Create or update database record
-    video_service = get_isl_video_service(db)
-    
     if existing_video:
-        # Update existing record
-        update_data = ISLVideoUpdate(
-            filename=filename,
-            display_name=display_name or folder_name,
-            file_size=len(content),
-            model_type=model_type,
-            mime_type="video/mp4",
-            file_extension="mp4",
-            description=description,
-            tags=tags,
-            is_active=True
-        )
-        db_video = video_service.update_isl_video(existing_video.id, update_data)
         
         # Add replacement info to duplicate warnings
         if duplicate_warnings:
             duplicate_warnings.append({
                 "type": "file_replaced",
                 "message": f"Existing file '{filename}' was replaced with new version",
-                "replaced_video": {
-                    "id": existing_video.id,
-                    "filename": existing_video.filename,
-                    "display_name": existing_video.display_name,
-                    "file_size": existing_video.file_size,
-                    "created_at": existing_video.created_at.isoformat() if existing_video.created_at else None
-                }
+                "replaced_video": duplicate_info(existing_video)
             })
-    else:
-        # Create new record
-        video_data = ISLVideoCreate(
-            filename=filename,
-            display_name=display_name or folder_name,
-            video_path=str(original_path),
-            file_size=len(content),
-            model_type=model_type,
-            mime_type="video/mp4",
-            file_extension="mp4",
-            description=description,
-            tags=tags,
-            is_active=True
-        )
-        db_video = video_service.create_isl_video(video_data)
 
-    # Start background processing
-    asyncio.create_task(process_video_async(
-        db_video.id, original_path, video_folder, db))
+    # Transcode on the ingest workers; the job survives restarts and is retried on failure
+    ingest_job = get_ingest_worker().enqueue(db, db_video.id, original_path, video_folder)
 
     return {
         "message": "Video uploaded successfully",
         "video_id": db_video.id,
-        "processing_status": "processing",
+        "processing_status": ingest_job.status,
+        "ingest_job_id": ingest_job.id,
+        "file_size": file_size,
+        "sha256": staged.sha256,
         "duplicate_warnings": duplicate_warnings if duplicate_warnings else None,
         "file_replaced": existing_video is not None
     }
@@ -326,13 +327,21 @@ def get_isl_videos(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(12, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search term"),
+    cursor: Optional[str] = Query(
+        None, description="Continue after this cursor (next_cursor of the previous page) instead of by page"),
     db: Session = Depends(get_db)
 ):
     """Get ISL videos with pagination and filtering"""
 
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
         print(
-            f"Getting videos with model_type={model_type}, page={page}, limit={limit}, search={search}")
+            f"Getting videos with model_type={model_type}, page={page}, limit={limit}, search={search}, cursor={cursor}")
         video_service = get_isl_video_service(db)
         print("Video service created successfully")
 
@@ -342,24 +351,21 @@ def get_isl_videos(
             search_text=search,
             is_active=True,
             limit=limit,
-            offset=(page - 1) * limit
+            offset=(page - 1) * limit,
+            cursor=cursor
         )
 
         # Get videos
         print("Search parameters created successfully")
-        videos = video_service.search_isl_videos(search_params)
+        try:
+            videos, next_cursor = video_service.search_isl_videos_page(search_params)
+        except ValueError as e:
+            # A cursor from a full-text search used for a listing, or the other way round
+            raise HTTPException(status_code=400, detail=str(e))
         print(f"Found {len(videos)} videos")
 
-        # Get total count for pagination
-        total_search_params = ISLVideoSearch(
-            model_type=model_type,
-            search_text=search,
-            is_active=True,
-            limit=1000,  # Large limit to get total count
-            offset=0
-        )
-        total_videos = len(
-            video_service.search_isl_videos(total_search_params))
+        # Get total count for pagination, with the same filters
+        total_videos = video_service.count_isl_videos(search_params)
         print(f"Total videos: {total_videos}")
 
         # Convert SQLAlchemy models to dictionaries for serialization
@@ -374,6 +380,8 @@ def get_isl_videos(
                 "duration_seconds": float(video.duration_seconds) if video.duration_seconds else None,
                 "width": video.width,
                 "height": video.height,
+                "fps": float(video.fps) if video.fps else None,
+                "codec_string": video.codec_string,
                 "model_type": video.model_type,
                 "mime_type": video.mime_type,
                 "file_extension": video.file_extension,
@@ -381,6 +389,9 @@ def get_isl_videos(
                 "tags": video.tags,
                 "content_type": video.content_type,
                 "is_active": video.is_active,
+                "poster_url": f"/api/v1/isl-videos/{video.id}/poster" if video.poster_path else None,
+                "proxy_url": f"/api/v1/isl-videos/{video.id}/proxy" if video.proxy_path else None,
+                "proxy_file_size": video.proxy_file_size,
                 "created_at": video.created_at.isoformat() if video.created_at else None,
                 "updated_at": video.updated_at.isoformat() if video.updated_at else None
             }
@@ -391,16 +402,72 @@ def get_isl_videos(
             "total": total_videos,
             "page": page,
             "limit": limit,
-            "total_pages": (total_videos + limit - 1) // limit
+            "total_pages": (total_videos + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
         print("Returning result successfully")
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_isl_videos: {e}")
         raise HTTPException(
             status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.get("/ingest-jobs", response_model=dict)
+def get_ingest_jobs(
+    status: Optional[str] = Query(None, description="queued, running, completed or failed"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get ingest worker stats and the most recent ingest jobs"""
+    query = db.query(ISLIngestJobModel)
+    if status:
+        query = query.filter(ISLIngestJobModel.status == status)
+    jobs = query.order_by(ISLIngestJobModel.id.desc()).limit(limit).all()
+    return {
+        "stats": get_ingest_worker().stats(db),
+        "jobs": [ISLIngestJob.from_orm(job) for job in jobs]
+    }
+
+
+@router.get("/ingest-jobs/{job_id}", response_model=ISLIngestJob)
+def get_ingest_job(job_id: int, db: Session = Depends(get_db)):
+    """Get status and progress of an ingest job"""
+    job = db.query(ISLIngestJobModel).filter(ISLIngestJobModel.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingest job not found")
+    return job
+
+
+@router.post("/metadata/backfill", response_model=dict)
+async def backfill_video_metadata(db: Session = Depends(get_db)):
+    """Probe width, height, frame rate, codec and the rest for videos that have none recorded"""
+    video_service = get_isl_video_service(db)
+
+    def backfill() -> dict:
+        result = video_service.backfill_clip_metadata()
+        if result["probed"]:
+            # Stitching reads durations and fingerprints from the index
+            get_sign_index().build()
+        return result
+
+    result = await asyncio.get_running_loop().run_in_executor(None, backfill)
+    return {"success": True, **result}
+
+
+@router.get("/{video_id}/ingest", response_model=ISLIngestJob)
+def get_video_ingest_job(video_id: int, db: Session = Depends(get_db)):
+    """Get the latest ingest job of a video"""
+    job = db.query(ISLIngestJobModel).filter(
+        ISLIngestJobModel.video_id == video_id
+    ).order_by(ISLIngestJobModel.id.desc()).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="No ingest job for this video")
+    return job
+
+
 @router.get("/{video_id}", response_model=ISLVideo)
 def get_isl_video(
     video_id: int,
@@ -442,11 +509,14 @@ def delete_isl_video(
     """Delete ISL video (soft delete and remove file)"""
 
     video_service = get_isl_video_service(db)
+    video = video_service.get_isl_video(video_id)
     success = video_service.delete_isl_video(video_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Video not found")
 
+    get_sign_index().refresh_sign(video.model_type, Path(video.video_path).stem)
+
     return {"message": "Video deleted successfully"}
 
 @router.delete("/{video_id}/permanent")
@@ -457,11 +527,14 @@ def permanently_delete_isl_video(
     """Permanently delete ISL video (hard delete)"""
 
     video_service = get_isl_video_service(db)
+    video = video_service.get_isl_video(video_id)
     success = video_service.hard_delete_isl_video(video_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Video not found")
 
+    get_sign_index().refresh_sign(video.model_type, Path(video.video_path).stem)
+
     return {"message": "Video permanently deleted"}
 
 
@@ -482,178 +555,113 @@ def stream_video_options(video_id: int):
 
 @router.get("/{video_id}/stream")
 def stream_video(video_id: int, db: Session = Depends(get_db)):
-    """Stream video file"""
-    try:
-        video_service = get_isl_video_service(db)
-        video = video_service.get_isl_video(video_id)
-        
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
-        
-        # Check if the video file exists
-        if not os.path.exists(video.video_path):
-            raise HTTPException(status_code=404, detail=f"Video file not found at: {video.video_path}")
-        
-        def iterfile():
-            try:
-                with open(video.video_path, mode="rb") as file_like:
-                    yield from file_like
-            except Exception as e:
-                print(f"Error reading file: {e}")
-                raise
-        
-        return StreamingResponse(
-            iterfile(), 
-            media_type="video/mp4",
-            headers={
-                "Accept-Ranges": "bytes",
-                "Content-Disposition": f"inline; filename={video.filename}",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "*",
-                "Access-Control-Expose-Headers": "Content-Length, Content-Range, Accept-Ranges"
-            }
-        )
-    except Exception as e:
-        print(f"Error in stream_video: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    """Stream video file (byte ranges, conditional GET)"""
+    video_service = get_isl_video_service(db)
+    video = video_service.get_isl_video(video_id)
+    
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    # Check if the video file exists
+    if not os.path.isfile(video.video_path):
+        raise HTTPException(status_code=404, detail=f"Video file not found at: {video.video_path}")
+    
+    return MediaFileResponse(
+        path=video.video_path,
+        filename=video.filename,
+        headers={
+            "Access-Control-Allow-Origin": "*",
+            "Access-Control-Allow-Methods": "GET, OPTIONS",
+            "Access-Control-Allow-Headers": "*",
+            "Access-Control-Expose-Headers": "Content-Length, Content-Range, Accept-Ranges, ETag"
+        }
+    )
+
+
+@router.get("/{video_id}/poster")
+def get_video_poster(video_id: int, db: Session = Depends(get_db)):
+    """Poster frame of a clip, for listing tiles"""
+    video = get_isl_video_service(db).get_isl_video(video_id)
+    poster_path = clip_folder_file(video.poster_path, video.model_type) if video else None
+    if not poster_path:
+        raise HTTPException(status_code=404, detail="Poster not found")
+    
+    return MediaFileResponse(
+        path=poster_path,
+        media_type=poster_media_type(poster_path),
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+@router.get("/{video_id}/proxy")
+def get_video_proxy(video_id: int, db: Session = Depends(get_db)):
+    """Low-bitrate proxy of a clip, for hover previews in listings"""
+    video = get_isl_video_service(db).get_isl_video(video_id)
+    proxy_path = clip_folder_file(video.proxy_path, video.model_type) if video else None
+    if not proxy_path:
+        raise HTTPException(status_code=404, detail="Proxy not found")
+    
+    return MediaFileResponse(
+        path=proxy_path,
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+@router.get("/serve/{user_id}/{filename}")
+def serve_saved_video(user_id: int, filename: str):
+    """Serve a video saved from the generator (the final_video_url of /isl-video-generation/save)"""
+    user_dir = FINAL_VIDEOS_DIR / f"user_{user_id}"
+    video_path = user_dir / filename
+    
+    # Only plain file names inside the user's directory
+    if Path(filename).name != filename or video_path.resolve().parent != user_dir.resolve():
+        raise HTTPException(status_code=404, detail="Video not found")
+    if not video_path.is_file():
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    return MediaFileResponse(path=str(video_path), filename=filename)
 
 
 @router.post("/sync", response_model=dict)
-async def sync_isl_videos(
+def sync_isl_videos(
     model_type: str = Form(...),
-    force_reprocess: bool = Form(False),
-    db: Session = Depends(get_db)
+    force_reprocess: bool = Form(False)
 ):
     """
     Sync ISL videos from file system with database
     Scans the public/videos/isl-videos/{model_type}-model folders
-    and processes any new or updated videos
+    and processes any new or updated videos.
+    The sync runs in the background; poll /sync/{sync_job_id} for its progress.
     """
-    try:
-        # Validate model type
-        if model_type not in ['male', 'female']:
-            raise HTTPException(status_code=400, detail="model_type must be 'male' or 'female'")
-        
-        # Get the public videos path
-        base_path = get_public_videos_path()
-        model_path = base_path / f"{model_type}-model"
-        
-        print(f"🔍 Sync Debug - Base path: {base_path}")
-        print(f"🔍 Sync Debug - Model path: {model_path}")
-        print(f"🔍 Sync Debug - Model path exists: {model_path.exists()}")
-        
-        if not model_path.exists():
-            return {
-                "success": False,
-                "message": f"Model path does not exist: {model_path}",
-                "processed": 0,
-                "errors": []
-            }
-        
-        # Scan folders
-        folders_to_process = []
-        all_folders = list(model_path.iterdir())
-        print(f"🔍 Sync Debug - Found {len(all_folders)} items in model path")
-        
-        for folder in all_folders:
-            print(f"🔍 Sync Debug - Checking item: {folder.name} (is_dir: {folder.is_dir()})")
-            if folder.is_dir():
-                # Check if folder name matches expected pattern
-                expected_video_file = folder / f"{folder.name}.mp4"
-                print(f"🔍 Sync Debug - Expected video file: {expected_video_file} (exists: {expected_video_file.exists()})")
-                if expected_video_file.exists():
-                    folders_to_process.append({
-                        "folder_name": folder.name,
-                        "folder_path": str(folder),
-                        "video_path": str(expected_video_file)
-                    })
-                    print(f"✅ Sync Debug - Added folder to process: {folder.name}")
-        
-        print(f"🔍 Sync Debug - Total folders to process: {len(folders_to_process)}")
-        
-        if not folders_to_process:
-            return {
-                "success": True,
-                "message": f"No valid video folders found in {model_path}",
-                "processed": 0,
-                "errors": []
-            }
-        
-        # Process each folder
-        processed_count = 0
-        errors = []
-        video_service = get_isl_video_service(db)
-        
-        for folder_info in folders_to_process:
-            try:
-                folder_name = folder_info["folder_name"]
-                video_path = folder_info["video_path"]
-                
-                print(f"🔍 Sync Debug - Processing folder: {folder_name}")
-                print(f"🔍 Sync Debug - Video path: {video_path}")
-                
-                # Check if video already exists in database
-                existing_video = db.query(ISLVideoModel).filter(
-                    and_(
-                        ISLVideoModel.video_path == video_path,
-                        ISLVideoModel.model_type == model_type
-                    )
-                ).first()
-                
-                print(f"🔍 Sync Debug - Existing video found: {existing_video is not None}")
-                print(f"🔍 Sync Debug - Force reprocess: {force_reprocess}")
-                
-                # Skip if exists and not forcing reprocess
-                if existing_video and not force_reprocess:
-                    print(f"⏭️ Sync Debug - Skipping {folder_name} (already exists)")
-                    continue
-                
-                # Get file info
-                file_size = os.path.getsize(video_path)
-                filename = f"{folder_name}.mp4"
-                
-                # Create or update video record
-                if existing_video:
-                    # Update existing record
-                    update_data = ISLVideoUpdate(
-                        file_size=file_size,
-                        is_active=True
-                    )
-                    video_service.update_isl_video(existing_video.id, update_data)
-                    video_id = existing_video.id
-                else:
-                    # Create new record
-                    video_data = ISLVideoCreate(
-                        filename=filename,
-                        display_name=folder_name,
-                        video_path=video_path,
-                        file_size=file_size,
-                        model_type=model_type,
-                        mime_type="video/mp4",
-                        file_extension="mp4",
-                        is_active=True
-                    )
-                    new_video = video_service.create_isl_video(video_data)
-                    video_id = new_video.id
-                
-                # Process video with ffmpeg (async)
-                await process_video_async(video_id, video_path, folder_info["folder_path"], db)
-                processed_count += 1
-                
-            except Exception as e:
-                error_msg = f"Error processing {folder_info['folder_name']}: {str(e)}"
-                errors.append(error_msg)
-                print(f"❌ {error_msg}")
-        
+    # Validate model type
+    if model_type not in ['male', 'female']:
+        raise HTTPException(status_code=400, detail="model_type must be 'male' or 'female'")
+    
+    # Get the public videos path
+    model_path = get_public_videos_path() / f"{model_type}-model"
+    if not model_path.exists():
         return {
-            "success": True,
-            "message": f"Sync completed. Processed {processed_count} videos.",
-            "processed": processed_count,
-            "errors": errors,
-            "total_folders": len(folders_to_process)
+            "success": False,
+            "message": f"Model path does not exist: {model_path}",
+            "processed": 0,
+            "errors": []
         }
-        
-    except Exception as e:
-        print(f"❌ Sync error: {e}")
-        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+    
+    job = get_library_syncer().start(model_type, model_path, force_reprocess)
+    return {
+        "success": True,
+        "message": f"Sync of the {model_type} model started",
+        "sync_job_id": job.job_id,
+        "status": job.status,
+        "processed": job.queued,
+        "errors": job.errors
+    }
+
+
+@router.get("/sync/{job_id}", response_model=SyncJob)
+def get_sync_job(job_id: str):
+    """Get status, progress and counters of a library sync"""
+    job = get_library_syncer().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found or expired")
+    return job
@@ -0,0 +1,26 @@
+import asyncio
+from fastapi import APIRouter
+
+from app.services.temp_janitor import get_temp_janitor
+
+router = APIRouter()
+
+
+@router.get("/temp/stats")
+async def get_temp_stats():
+    """
+    Get temp artifact usage per directory and janitor counters.
+    Directory figures are from the most recent sweep.
+    """
+    return get_temp_janitor().stats()
+
+
+@router.post("/temp/sweep")
+async def sweep_temp_artifacts():
+    """
+    Run a janitor sweep now: remove expired temp artifacts, then evict
+    least recently used ones until the byte quota is met.
+    """
+    janitor = get_temp_janitor()
+    result = await asyncio.get_running_loop().run_in_executor(None, janitor.sweep)
+    return {"success": True, **result, "stats": janitor.stats()}
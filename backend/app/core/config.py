@@ -46,6 +46,46 @@ class Settings(BaseSettings):
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", None)
     GCP_PROJECT_ID: Optional[str] = os.getenv("GCP_PROJECT_ID", None)
 
+    # ISL video generation
+    ISL_STITCH_CACHE_MAX_BYTES: int = int(os.getenv("ISL_STITCH_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+    ISL_NORMALIZED_CACHE_MAX_BYTES: int = int(os.getenv("ISL_NORMALIZED_CACHE_MAX_BYTES", str(1024 ** 3)))
+    ISL_SEGMENT_CACHE_MAX_SEGMENTS: int = int(os.getenv("ISL_SEGMENT_CACHE_MAX_SEGMENTS", "500"))
+    ISL_SEGMENT_MIN_COUNT: int = int(os.getenv("ISL_SEGMENT_MIN_COUNT", "3"))
+    ISL_SEGMENT_MINER_INTERVAL_SECONDS: int = int(os.getenv("ISL_SEGMENT_MINER_INTERVAL_SECONDS", "300"))
+    ISL_GENERATION_WORKERS: int = int(os.getenv("ISL_GENERATION_WORKERS", str(min(4, os.cpu_count() or 1))))
+    ISL_GENERATION_MAX_QUEUED: int = int(os.getenv("ISL_GENERATION_MAX_QUEUED", "32"))
+    ISL_BATCH_WORKERS: int = int(os.getenv("ISL_BATCH_WORKERS", str(os.cpu_count() or 1)))
+    ISL_BATCH_MAX_ITEMS: int = int(os.getenv("ISL_BATCH_MAX_ITEMS", "200"))
+    ISL_STITCH_BACKEND: str = os.getenv("ISL_STITCH_BACKEND", "ffmpeg")  # ffmpeg | mp4 | segmented
+    ISL_SAMPLE_TABLE_CACHE_SIZE: int = int(os.getenv("ISL_SAMPLE_TABLE_CACHE_SIZE", "4096"))
+    ISL_ENCODE_WORKERS: int = int(os.getenv("ISL_ENCODE_WORKERS", str(os.cpu_count() or 1)))
+
+    # ISL clip uploads
+    ISL_UPLOAD_MAX_BYTES: int = int(os.getenv("ISL_UPLOAD_MAX_BYTES", str(512 * 1024 ** 2)))
+
+    # ISL clip ingest jobs
+    ISL_INGEST_WORKERS: int = int(os.getenv("ISL_INGEST_WORKERS", str(os.cpu_count() or 1)))
+    ISL_INGEST_MAX_ATTEMPTS: int = int(os.getenv("ISL_INGEST_MAX_ATTEMPTS", "3"))
+    ISL_INGEST_RETRY_BACKOFF_SECONDS: int = int(os.getenv("ISL_INGEST_RETRY_BACKOFF_SECONDS", "30"))
+    ISL_INGEST_POLL_SECONDS: int = int(os.getenv("ISL_INGEST_POLL_SECONDS", "10"))
+
+    # Statistics summary cache where the totals are not trigger-maintained (non-SQLite)
+    ISL_STATS_CACHE_SECONDS: int = int(os.getenv("ISL_STATS_CACHE_SECONDS", "30"))
+
+    # Ingest renditions for dataset listings
+    ISL_POSTER_FORMAT: str = os.getenv("ISL_POSTER_FORMAT", "webp")  # webp | jpg
+    ISL_POSTER_HEIGHT: int = int(os.getenv("ISL_POSTER_HEIGHT", "240"))
+    ISL_PROXY_HEIGHT: int = int(os.getenv("ISL_PROXY_HEIGHT", "240"))
+    ISL_PROXY_MAX_KBPS: int = int(os.getenv("ISL_PROXY_MAX_KBPS", "200"))
+    ISL_RENDITION_LADDER: str = os.getenv("ISL_RENDITION_LADDER", "480:450,240:200")  # height:kbps, empty to disable
+
+    # Temp artifact janitor
+    TEMP_VIDEO_TTL_SECONDS: int = int(os.getenv("TEMP_VIDEO_TTL_SECONDS", "21600"))
+    TEMP_AUDIO_TTL_SECONDS: int = int(os.getenv("TEMP_AUDIO_TTL_SECONDS", "3600"))
+    TEMP_MAX_BYTES: int = int(os.getenv("TEMP_MAX_BYTES", str(5 * 1024 ** 3)))
+    TEMP_JANITOR_INTERVAL_SECONDS: int = int(os.getenv("TEMP_JANITOR_INTERVAL_SECONDS", "300"))
+    TEMP_JANITOR_MIN_AGE_SECONDS: int = int(os.getenv("TEMP_JANITOR_MIN_AGE_SECONDS", "60"))
+
     class Config:
         case_sensitive = True
         env_file = ".env"
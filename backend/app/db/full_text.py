@@ -0,0 +1,116 @@
+"""
+SQLite FTS5 full-text indexes for the searchable tables.
+
+Each index is an external-content FTS5 table over its source table, kept in sync by
+triggers, so search is a ranked MATCH instead of a LIKE scan of every row. Other
+databases, or SQLite builds without FTS5, keep the LIKE search.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+
+class FullTextIndex(BaseModel):
+    """An FTS5 table over some text columns of a source table"""
+    name: str
+    table: str
+    columns: List[str]
+    # bm25 weight per column; a match in a higher-weighted column ranks first
+    weights: List[float]
+
+
+ISL_VIDEOS_FTS = FullTextIndex(
+    name="isl_videos_fts",
+    table="isl_videos",
+    columns=["filename", "display_name", "description", "tags"],
+    weights=[10.0, 10.0, 1.0, 5.0]
+)
+
+GENERAL_ANNOUNCEMENTS_FTS = FullTextIndex(
+    name="general_announcements_fts",
+    table="general_announcements",
+    columns=["title", "category", "english_content", "hindi_content", "marathi_content", "gujarati_content"],
+    weights=[10.0, 5.0, 1.0, 1.0, 1.0, 1.0]
+)
+
+FULL_TEXT_INDEXES = [ISL_VIDEOS_FTS, GENERAL_ANNOUNCEMENTS_FTS]
+
+# Combining marks are word characters, so Devanagari and Gujarati vowel signs do not
+# split words; Latin accents are folded, so "cafe" matches "café". Prefix indexes serve
+# the two- and three-character prefixes typed into search boxes.
+FTS_OPTIONS = "prefix='2 3', tokenize=\"unicode61 remove_diacritics 2 categories 'L* N* Co M*'\""
+
+_available: Dict[Tuple[str, str], bool] = {}
+
+
+def create_full_text_indexes(conn: Connection) -> None:
+    """Create missing FTS5 tables and their sync triggers, populating new tables"""
+    for index in FULL_TEXT_INDEXES:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": index.name}
+        ).first()
+        if not exists:
+            try:
+                conn.execute(text(
+                    f"CREATE VIRTUAL TABLE {index.name} USING fts5({', '.join(index.columns)}, "
+                    f"content='{index.table}', content_rowid='id', {FTS_OPTIONS})"
+                ))
+            except Exception as e:
+                print(f"⚠️ Full-text index {index.name} not created, search falls back to LIKE: {e}")
+                continue
+            conn.execute(text(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')"))
+            print(f"✅ Created full-text index {index.name}")
+
+        columns = ", ".join(index.columns)
+        new_values = ", ".join(f"new.{column}" for column in index.columns)
+        old_values = ", ".join(f"old.{column}" for column in index.columns)
+        insert = f"INSERT INTO {index.name}(rowid, {columns}) VALUES (new.id, {new_values});"
+        delete = (f"INSERT INTO {index.name}({index.name}, rowid, {columns}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {index.name}_ai AFTER INSERT ON {index.table} BEGIN {insert} END"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {index.name}_ad AFTER DELETE ON {index.table} BEGIN {delete} END"))
+        # Only updates touching indexed columns rewrite the index entry
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {index.name}_au AFTER UPDATE OF {columns} ON {index.table} "
+            f"BEGIN {delete} {insert} END"))
+
+
+def full_text_available(db: Session, index: FullTextIndex) -> bool:
+    """Whether the database behind a session has the given FTS5 index"""
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    key = (str(bind.url), index.name)
+    if key not in _available:
+        _available[key] = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": index.name}
+        ).first() is not None
+    return _available[key]
+
+
+def match_expression(search_text: str) -> Optional[str]:
+    """
+    FTS5 query for free text typed by a user: every word must match, the last as a
+    prefix so results follow the search box as it is typed. Words are quoted, so
+    FTS5 operators and punctuation in the input are plain text.
+    """
+    words = [word for word in search_text.split() if any(ch.isalnum() for ch in word)]
+    if not words:
+        return None
+    quoted = ['"' + word.replace('"', '""') + '"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def ranked_matches(index: FullTextIndex, match: str):
+    """Subquery of (id, rank) for rows matching an FTS5 query; lower rank is a better match"""
+    weights = ", ".join(str(weight) for weight in index.weights)
+    return text(
+        f"SELECT rowid AS id, bm25({index.name}, {weights}) AS rank "
+        f"FROM {index.name} WHERE {index.name} MATCH :match"
+    ).bindparams(match=match).columns(id=Integer, rank=Float).subquery()
@@ -10,14 +10,15 @@ from app.models.isl_video import ISLVideo
 from app.models.general_announcement import GeneralAnnouncement  # Import to ensure table creation
 from app.db.base_class import Base
 from app.db.session import engine
+from app.db.migrations import upgrade_schema
 
 
 def init_db(db: Session) -> None:
     """
     Initialize the database with default data.
     """
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Create tables and add columns missing from older databases
+    upgrade_schema(engine)
 
     # Check if admin user already exists
     admin_user = db.query(User).filter(User.username == "admin").first()
@@ -0,0 +1,97 @@
+"""
+SQLite triggers keeping isl_video_stats current.
+
+Every insert, delete and relevant update of isl_videos applies its delta to the
+per-model row, whether it comes from the ORM or a bulk UPDATE, so reading the
+statistics never aggregates the video table. Other databases use the grouped
+query with a short cache instead (ISLVideoService.get_video_statistics).
+"""
+from typing import Dict
+
+from sqlalchemy import case, delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.isl_video import ISLVideo
+from app.models.isl_video_stats import ISLVideoStats
+
+TRIGGERS = ["isl_video_stats_ai", "isl_video_stats_ad", "isl_video_stats_au"]
+# Columns whose change moves a video between totals
+TRACKED_COLUMNS = "model_type, is_active, file_size, duration_seconds"
+
+_available: Dict[str, bool] = {}
+
+
+def grouped_statistics():
+    """One grouped query over isl_videos producing an isl_video_stats row per model"""
+    active = ISLVideo.is_active == True
+    return select(
+        ISLVideo.model_type,
+        func.count(ISLVideo.id),
+        func.coalesce(func.sum(ISLVideo.file_size), 0),
+        func.coalesce(func.sum(ISLVideo.duration_seconds), 0),
+        func.coalesce(func.sum(case((active, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((active, ISLVideo.file_size), else_=0)), 0),
+        func.coalesce(func.sum(case((active, ISLVideo.duration_seconds), else_=0)), 0)
+    ).group_by(ISLVideo.model_type)
+
+
+def _apply(row: str, sign: str) -> str:
+    """Trigger statements adding (sign '+') or removing (sign '-') one video row"""
+    active = f"CASE WHEN {row}.is_active THEN 1 ELSE 0 END"
+    statements = (
+        f"INSERT OR IGNORE INTO isl_video_stats (model_type, total_videos, total_size_bytes, "
+        f"total_duration_seconds, active_videos, active_size_bytes, active_duration_seconds) "
+        f"VALUES ({row}.model_type, 0, 0, 0, 0, 0, 0);"
+    ) if sign == "+" else ""
+    return statements + (
+        f"UPDATE isl_video_stats SET "
+        f"total_videos = total_videos {sign} 1, "
+        f"total_size_bytes = total_size_bytes {sign} COALESCE({row}.file_size, 0), "
+        f"total_duration_seconds = total_duration_seconds {sign} COALESCE({row}.duration_seconds, 0), "
+        f"active_videos = active_videos {sign} {active}, "
+        f"active_size_bytes = active_size_bytes {sign} {active} * COALESCE({row}.file_size, 0), "
+        f"active_duration_seconds = active_duration_seconds {sign} {active} * COALESCE({row}.duration_seconds, 0) "
+        f"WHERE model_type = {row}.model_type;"
+    )
+
+
+def rebuild_isl_video_stats(conn: Connection) -> None:
+    """Recompute every isl_video_stats row from isl_videos"""
+    conn.execute(delete(ISLVideoStats))
+    conn.execute(insert(ISLVideoStats).from_select([
+        "model_type", "total_videos", "total_size_bytes", "total_duration_seconds",
+        "active_videos", "active_size_bytes", "active_duration_seconds"
+    ], grouped_statistics()))
+
+
+def create_isl_video_stats_triggers(conn: Connection) -> None:
+    """Create the statistics triggers if any is missing, recomputing the totals they start from"""
+    existing = {name for (name,) in conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'isl_video_stats_%'"))}
+    if existing.issuperset(TRIGGERS):
+        return
+
+    for name in TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text(f"CREATE TRIGGER isl_video_stats_ai AFTER INSERT ON isl_videos BEGIN {_apply('new', '+')} END"))
+    conn.execute(text(f"CREATE TRIGGER isl_video_stats_ad AFTER DELETE ON isl_videos BEGIN {_apply('old', '-')} END"))
+    conn.execute(text(
+        f"CREATE TRIGGER isl_video_stats_au AFTER UPDATE OF {TRACKED_COLUMNS} ON isl_videos "
+        f"BEGIN {_apply('old', '-')} {_apply('new', '+')} END"))
+    # Same transaction as the triggers, so no change lands between the recompute and them
+    rebuild_isl_video_stats(conn)
+    print("✅ Created isl_video_stats triggers")
+
+
+def stats_triggers_available(db: Session) -> bool:
+    """Whether the database behind a session maintains isl_video_stats by trigger"""
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    key = str(bind.url)
+    if key not in _available:
+        _available[key] = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'isl_video_stats_au'")
+        ).first() is not None
+    return _available[key]
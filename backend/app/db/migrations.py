@@ -0,0 +1,40 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+import app.models  # noqa: F401  Register every model on Base.metadata
+from app.db.base_class import Base
+from app.db.full_text import create_full_text_indexes
+from app.db.isl_video_stats import create_isl_video_stats_triggers
+from app.db.session import engine as default_engine
+
+
+def upgrade_schema(engine: Engine = default_engine) -> None:
+    """
+    Bring an existing database up to the current models.
+    Creates missing tables, adds columns introduced after the table was
+    created and creates missing indexes, including the SQLite full-text
+    indexes and statistics triggers. Safe to run on every startup.
+    """
+    Base.metadata.create_all(bind=engine)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"✅ Added column {table.name}.{column.name}")
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        if engine.dialect.name == "sqlite":
+            create_full_text_indexes(conn)
+            create_isl_video_stats_triggers(conn)
+
+
+if __name__ == "__main__":
+    upgrade_schema()
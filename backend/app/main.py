@@ -1,13 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.db.migrations import upgrade_schema
+from app.services.ingest_jobs import run_ingest_worker
+from app.services.ffmpeg_concat import concat_videos_with_ffmpeg
+from app.services.isl_video import backfill_clip_metadata, backfill_content_digests
+from app.services.sign_index import SUPPORTED_MODELS, get_sign_index
+from app.services.segment_cache import run_segment_miner
+from app.services.temp_janitor import run_temp_janitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Add columns introduced since the database was created
+    upgrade_schema()
+    # Build the sign clip index once so generation never probes the filesystem
+    get_sign_index().build()
+    # Hash clips ingested before content digests were recorded, off the event loop
+    content_backfill = asyncio.get_running_loop().run_in_executor(None, backfill_content_digests)
+    # Probe stream metadata of clips ingested before it was recorded
+    metadata_backfill = asyncio.get_running_loop().run_in_executor(None, backfill_clip_metadata)
+    # Pre-stitch frequent sign phrases in the background
+    segment_miner = asyncio.create_task(run_segment_miner(concat_videos_with_ffmpeg, SUPPORTED_MODELS))
+    # Expire abandoned previews and recordings in backend/temp
+    temp_janitor = asyncio.create_task(run_temp_janitor())
+    # Resume ingest jobs a restart interrupted and run queued transcodes and retries
+    ingest_worker = asyncio.create_task(run_ingest_worker())
+    yield
+    segment_miner.cancel()
+    temp_janitor.cancel()
+    ingest_worker.cancel()
+    content_backfill.cancel()
+    metadata_backfill.cancel()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="SignSphere API",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set up CORS
@@ -17,6 +52,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read the IDs of streamed ISL videos
+    expose_headers=["X-Temp-Video-Id", "X-Job-Id", "X-Preview-Url", "X-Video-Duration", "X-Signs-Skipped"],
 )
 
 # Include API router
@@ -2,6 +2,8 @@
 from .user import User
 from .announcement_template import AnnouncementTemplate
 from .isl_video import ISLVideo
+from .isl_ingest_job import ISLIngestJob
+from .isl_video_stats import ISLVideoStats
 from .train_route import TrainRoute
 from .train_route_translation import TrainRouteTranslation
 from .general_announcement import GeneralAnnouncement
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, CheckConstraint, Index
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class ISLIngestJob(Base):
+    __tablename__ = "isl_ingest_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    video_id = Column(Integer, ForeignKey("isl_videos.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Work to do
+    input_path = Column(String(500), nullable=False)
+    output_folder = Column(String(500), nullable=False)
+
+    # Progress
+    status = Column(String(20), nullable=False, default="queued")  # queued | running | completed | failed
+    progress = Column(Float, nullable=False, default=0.0)
+    step = Column(String(255), nullable=True)
+    error = Column(Text, nullable=True)
+
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'completed', 'failed')", name='check_ingest_status'),
+        # The worker polls for due queued jobs
+        Index('idx_isl_ingest_jobs_due', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<ISLIngestJob(id={self.id}, video_id={self.video_id}, status='{self.status}')>"
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Numeric, CheckConstraint, Index
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.db.base_class import Base
 
 
@@ -19,6 +19,23 @@ class ISLVideo(Base):
     duration_seconds = Column(Numeric(8, 2), nullable=True)  # Video duration
     width = Column(Integer, nullable=True)  # Video width in pixels
     height = Column(Integer, nullable=True)  # Video height in pixels
+    codec_fingerprint = Column(String(255), nullable=True, index=True)  # Stream params for stream-copy concat
+    fps = Column(Numeric(6, 3), nullable=True)  # Average frame rate
+    video_codec = Column(String(20), nullable=True)  # ffprobe codec name, e.g. h264
+    codec_profile = Column(String(40), nullable=True)
+    codec_level = Column(Integer, nullable=True)
+    codec_string = Column(String(50), nullable=True)  # RFC 6381 codecs parameter, e.g. avc1.64001f
+    pix_fmt = Column(String(20), nullable=True)
+    bit_rate = Column(Integer, nullable=True)  # Video bit rate in bits per second
+    frame_count = Column(Integer, nullable=True)
+    has_audio = Column(Boolean, nullable=True)
+    content_sha256 = Column(String(64), nullable=True)  # SHA-256 of the clip as ingested
+    file_sha256 = Column(String(64), nullable=True)  # SHA-256 of the file ingest transcoding left on disk
+    
+    # Renditions for listings
+    poster_path = Column(String(500), nullable=True)  # Poster frame image
+    proxy_path = Column(String(500), nullable=True)  # Low-bitrate proxy MP4
+    proxy_file_size = Column(Integer, nullable=True)
     
     # Model Information
     model_type = Column(String(10), nullable=False, index=True)
@@ -45,6 +62,11 @@ class ISLVideo(Base):
         CheckConstraint("file_size > 0", name='check_file_size'),
         CheckConstraint("duration_seconds > 0", name='check_duration'),
         Index('idx_isl_videos_search', 'description', 'tags', postgresql_using='gin'),
+        # Listing order and keyset pagination cursor
+        Index('idx_isl_videos_created_at_id', 'created_at', 'id'),
+        # One active clip per content digest and model; duplicate checks are a lookup on this index
+        Index('uq_isl_videos_model_content_sha256', 'model_type', 'content_sha256', unique=True,
+              sqlite_where=text('is_active = 1'), postgresql_where=text('is_active')),
     )
 
     def __repr__(self):
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, BigInteger, Float
+from app.db.base_class import Base
+
+
+class ISLVideoStats(Base):
+    """
+    Running ISL video totals per model, kept current by triggers on isl_videos
+    (see app.db.isl_video_stats), so the statistics summary is a primary-key read.
+    """
+    __tablename__ = "isl_video_stats"
+
+    model_type = Column(String(10), primary_key=True)
+
+    # Every row, active or not
+    total_videos = Column(Integer, nullable=False, default=0)
+    total_size_bytes = Column(BigInteger, nullable=False, default=0)
+    total_duration_seconds = Column(Float, nullable=False, default=0.0)
+
+    # Active rows only
+    active_videos = Column(Integer, nullable=False, default=0)
+    active_size_bytes = Column(BigInteger, nullable=False, default=0)
+    active_duration_seconds = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<ISLVideoStats(model_type='{self.model_type}', active_videos={self.active_videos})>"
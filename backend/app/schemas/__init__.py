@@ -3,6 +3,7 @@ from .user import User, UserCreate, UserUpdate, UserInDB
 from .token import Token, TokenPayload
 from .announcement_template import AnnouncementTemplate, AnnouncementTemplateCreate, AnnouncementTemplateUpdate
 from .isl_video import ISLVideo, ISLVideoCreate, ISLVideoUpdate
+from .isl_ingest_job import ISLIngestJob
 from .train_route import TrainRoute, TrainRouteCreate, TrainRouteUpdate
 from .train_route_translation import TrainRouteTranslation, TrainRouteTranslationCreate, TrainRouteTranslationUpdate
 from .general_announcement import GeneralAnnouncement, GeneralAnnouncementCreate, GeneralAnnouncementUpdate, GeneralAnnouncementWithCreator
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ISLIngestJob(BaseModel):
+    id: int
+    video_id: int
+    status: str
+    progress: float
+    step: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    next_attempt_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -12,6 +12,21 @@ class ISLVideoBase(BaseModel):
     duration_seconds: Optional[Decimal] = None
     width: Optional[int] = None
     height: Optional[int] = None
+    codec_fingerprint: Optional[str] = None
+    fps: Optional[Decimal] = None
+    video_codec: Optional[str] = None
+    codec_profile: Optional[str] = None
+    codec_level: Optional[int] = None
+    codec_string: Optional[str] = None
+    pix_fmt: Optional[str] = None
+    bit_rate: Optional[int] = None
+    frame_count: Optional[int] = None
+    has_audio: Optional[bool] = None
+    content_sha256: Optional[str] = None
+    file_sha256: Optional[str] = None
+    poster_path: Optional[str] = None
+    proxy_path: Optional[str] = None
+    proxy_file_size: Optional[int] = None
     model_type: str
     mime_type: str
     file_extension: str
@@ -71,3 +86,5 @@ class ISLVideoSearch(BaseModel):
     is_active: Optional[bool] = True
     limit: int = 50
     offset: int = 0
+    # Keyset pagination: continue after this cursor instead of skipping offset rows
+    cursor: Optional[str] = None
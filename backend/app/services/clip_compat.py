@@ -0,0 +1,243 @@
+import os
+import hashlib
+import subprocess
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.services.sign_index import SignClip, get_sign_index
+from app.utils.media_probe import StreamFingerprint, probe_stream_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+NORMALIZED_CLIPS_DIR = PROJECT_ROOT / "backend" / "temp" / "isl-normalized"
+
+# ffmpeg encoders able to reproduce a fingerprint's codec
+ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+
+# ffprobe profile names -> encoder -profile:v values; profiles without one are left to the encoder
+ENCODER_PROFILES = {
+    "h264": {
+        # x264's baseline is constrained baseline
+        "Baseline": "baseline",
+        "Constrained Baseline": "baseline",
+        "Main": "main",
+        "High": "high",
+        "High 10": "high10",
+        "High 4:2:2": "high422",
+        "High 4:4:4 Predictive": "high444",
+    },
+    "hevc": {
+        "Main": "main",
+        "Main 10": "main10",
+        "Main Still Picture": "mainstillpicture",
+    },
+}
+
+
+def get_clip_fingerprint(clip: SignClip) -> Optional[str]:
+    """Fingerprint of an indexed clip, probing (once) only when ingest recorded none"""
+    if clip.fingerprint is None:
+        fingerprint = probe_stream_fingerprint(clip.path)
+        if fingerprint:
+            clip.fingerprint = fingerprint.key
+    return clip.fingerprint
+
+
+def target_video_filter(target: StreamFingerprint) -> str:
+    """Filter chain conforming any input's frame rate, size and aspect ratio to target"""
+    sar = target.sample_aspect_ratio.replace(":", "/")
+    return (
+        f"fps={target.r_frame_rate}:round=up,"
+        f"scale={target.width}:{target.height}:force_original_aspect_ratio=decrease,"
+        f"pad={target.width}:{target.height}:(ow-iw)/2:(oh-ih)/2,setsar={sar}"
+    )
+
+
+def target_encoder_args(target: StreamFingerprint) -> List[str]:
+    """Encoder options reproducing target's codec, pixel format, profile and timescale"""
+    encoder = ENCODERS.get(target.codec_name)
+    if not encoder:
+        raise ValueError(f"Cannot normalize clips to codec {target.codec_name}")
+
+    args = [
+        "-c:v", encoder, "-preset", "fast", "-crf", "23",
+        "-pix_fmt", target.pix_fmt,
+        "-an", "-movflags", "+faststart",
+        "-video_track_timescale", target.time_base.split("/")[-1]
+    ]
+    profile = ENCODER_PROFILES.get(target.codec_name, {}).get(target.profile)
+    if profile:
+        args += ["-profile:v", profile]
+    return args
+
+
+def create_normalize_command(input_path: str, output_path: str, target: StreamFingerprint) -> List[str]:
+    """FFmpeg command re-encoding a clip to the stream parameters of target"""
+    encoder_args = target_encoder_args(target)
+    return ["ffmpeg", "-i", input_path, "-vf", target_video_filter(target)] + encoder_args + [output_path, "-y"]
+
+
+class ClipNormalizer:
+    """
+    Re-encodes only the clips whose fingerprint differs from the stitching target.
+    Copies are cached on disk in a size-bounded LRU, and dropped when their source clip
+    changes or disappears.
+    """
+
+    def __init__(self, normalized_dir: Path = NORMALIZED_CLIPS_DIR,
+                 max_bytes: int = settings.ISL_NORMALIZED_CACHE_MAX_BYTES):
+        self.normalized_dir = Path(normalized_dir)
+        self.normalized_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._lock = threading.Lock()
+        # Copy file name -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.normalized = 0
+        self.reused = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        """Rebuild the LRU order from the copies left by a previous run"""
+        copies = []
+        for entry in os.scandir(self.normalized_dir):
+            if entry.name.endswith(".tmp.mp4"):
+                # Interrupted encode
+                os.remove(entry.path)
+            elif entry.name.endswith(".mp4"):
+                stat = entry.stat()
+                copies.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(copies):
+            self._entries[name] = size
+            self.total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def _source_prefix(source_path: str) -> str:
+        return hashlib.sha256(source_path.encode()).hexdigest()[:16]
+
+    def _normalized_path(self, clip: SignClip, target: str) -> Path:
+        # Prefixed by the source path, so every copy of a clip can be found when it changes
+        key = hashlib.sha256(
+            f"{clip.path}\0{clip.file_size}\0{clip.mtime_ns}\0{target}".encode()
+        ).hexdigest()
+        return self.normalized_dir / f"{self._source_prefix(clip.path)}-{key}.mp4"
+
+    def _lock_for(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(str(path), threading.Lock())
+
+    def normalize(self, clip: SignClip, target: str) -> str:
+        """Path of the clip re-encoded to target, transcoding it on first use"""
+        output_path = self._normalized_path(clip, target)
+        with self._lock_for(output_path):
+            if output_path.exists():
+                self.reused += 1
+                self._touch(output_path)
+                return str(output_path)
+
+            tmp_path = output_path.with_suffix(".tmp.mp4")
+            cmd = create_normalize_command(clip.path, str(tmp_path), StreamFingerprint.from_key(target))
+            logger.info(f"Normalizing clip {clip.path} to {target}")
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            if result.returncode != 0:
+                raise RuntimeError(f"Clip normalization failed for {clip.path}: {result.stderr}")
+            os.replace(tmp_path, output_path)
+            self.normalized += 1
+            self._touch(output_path)
+            return str(output_path)
+
+    def _touch(self, path: Path):
+        """Record a copy as most recently used and evict over the quota, never the copy itself"""
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            self.total_bytes += size - self._entries.get(path.name, 0)
+            self._entries[path.name] = size
+            self._entries.move_to_end(path.name)
+            self._evict(keep=path.name)
+
+    def _evict(self, keep: Optional[str] = None):
+        while self.total_bytes > self.max_bytes and self._entries:
+            name = next(iter(self._entries))
+            if name == keep:
+                break
+            self._drop(name)
+            self.evictions += 1
+
+    def _drop(self, name: str):
+        self.total_bytes -= self._entries.pop(name)
+        try:
+            (self.normalized_dir / name).unlink()
+        except FileNotFoundError:
+            pass
+
+    def invalidate_path(self, source_path: str):
+        """Drop every normalized copy of a clip that changed or disappeared"""
+        prefix = f"{self._source_prefix(source_path)}-"
+        with self._lock:
+            for name in [name for name in self._entries if name.startswith(prefix)]:
+                self._drop(name)
+
+    def plan(self, model: str, clips: List[SignClip]) -> List[str]:
+        """Input files for a stream-copy stitch, with incompatible clips swapped for normalized copies"""
+        target = get_sign_index().canonical_fingerprint(model)
+        if target is None:
+            # No ingest metadata yet: use the majority fingerprint of this request
+            counts: Dict[str, int] = {}
+            for clip in clips:
+                fingerprint = get_clip_fingerprint(clip)
+                if fingerprint:
+                    counts[fingerprint] = counts.get(fingerprint, 0) + 1
+            target = max(counts, key=counts.get) if counts else None
+
+        if target is None:
+            return [clip.path for clip in clips]
+
+        files = []
+        for clip in clips:
+            fingerprint = get_clip_fingerprint(clip)
+            if fingerprint is None or fingerprint == target:
+                files.append(clip.path)
+                continue
+            try:
+                files.append(self.normalize(clip, target))
+            except Exception as e:
+                logger.warning(f"Using unnormalized clip {clip.path}: {e}")
+                files.append(clip.path)
+        return files
+
+    def stats(self) -> dict:
+        return {
+            "normalized": self.normalized,
+            "reused": self.reused,
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "normalized_dir": str(self.normalized_dir)
+        }
+
+
+_clip_normalizer: Optional[ClipNormalizer] = None
+
+
+def get_clip_normalizer() -> ClipNormalizer:
+    """Get the process-wide clip normalizer"""
+    global _clip_normalizer
+    if _clip_normalizer is None:
+        _clip_normalizer = ClipNormalizer()
+        get_sign_index().add_listener(_clip_normalizer.invalidate_path)
+    return _clip_normalizer
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+POSTER_MEDIA_TYPES = {"webp": "image/webp", "jpg": "image/jpeg"}
+
+
+def rendition_paths(video_path: str) -> Tuple[str, str]:
+    """Poster and proxy paths stored next to a clip ({sign}_poster.webp, {sign}_proxy.mp4)"""
+    video = Path(video_path)
+    poster_format = settings.ISL_POSTER_FORMAT
+    return (
+        str(video.with_name(f"{video.stem}_poster.{poster_format}")),
+        str(video.with_name(f"{video.stem}_proxy.mp4"))
+    )
+
+
+def poster_media_type(poster_path: str) -> str:
+    return POSTER_MEDIA_TYPES.get(Path(poster_path).suffix.lstrip("."), "application/octet-stream")
+
+
+def create_poster_command(input_path: str, output_path: str, offset_seconds: float = 0.0) -> List[str]:
+    """FFmpeg command grabbing a single downscaled frame as the clip's poster"""
+    cmd = [
+        "ffmpeg", "-ss", f"{offset_seconds:.3f}", "-i", input_path,
+        "-frames:v", "1",
+        "-vf", f"scale=-2:{settings.ISL_POSTER_HEIGHT}"
+    ]
+    if output_path.endswith(".webp"):
+        cmd += ["-c:v", "libwebp", "-quality", "75"]
+    else:
+        cmd += ["-q:v", "4"]
+    cmd += [output_path, "-y"]
+    return cmd
+
+
+def create_proxy_command(input_path: str, output_path: str) -> List[str]:
+    """FFmpeg command encoding a small low-bitrate proxy for listing tiles"""
+    bitrate = settings.ISL_PROXY_MAX_KBPS
+    return [
+        "ffmpeg", "-i", input_path,
+        "-vf", f"scale=-2:{settings.ISL_PROXY_HEIGHT}",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "30",
+        "-maxrate", f"{bitrate}k", "-bufsize", f"{bitrate * 2}k",
+        "-pix_fmt", "yuv420p", "-an", "-movflags", "+faststart",
+        output_path, "-y"
+    ]
+
+
+def _run(cmd: List[str], output_path: str) -> Optional[str]:
+    # Encode to a temp name so a failed run never leaves a truncated rendition behind
+    root, ext = os.path.splitext(output_path)
+    tmp_path = f"{root}.tmp{ext}"
+    cmd = cmd[:-2] + [tmp_path, "-y"]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    if result.returncode != 0 or not os.path.exists(tmp_path):
+        logger.warning(f"Rendition {output_path} failed: {result.stderr[-500:]}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def generate_renditions(video_path: str, duration: Optional[float] = None,
+                        source_path: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Create the poster frame and proxy rendition of an ingested clip, from source_path
+    when its encode is not yet swapped in at video_path.
+    Returns their paths, None for any that could not be produced.
+    """
+    poster_path, proxy_path = rendition_paths(video_path)
+    source_path = source_path or video_path
+    # Signs start from a neutral pose; a frame a little into the clip shows the handshape
+    offset = duration * 0.4 if duration else 0.0
+    poster = _run(create_poster_command(source_path, poster_path, offset), poster_path)
+    proxy = _run(create_proxy_command(source_path, proxy_path), proxy_path)
+    return poster, proxy
+
+
+def remove_renditions(*paths: Optional[str]) -> None:
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove rendition {path}: {e}")
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+def create_ffmpeg_concat_command(video_files: List[str], output_path: str) -> List[str]:
+    """Create FFmpeg command for concatenating videos"""
+    if not video_files:
+        raise ValueError("No video files provided for concatenation")
+    
+    # Create a temporary file list for FFmpeg
+    file_list_path = output_path.replace('.mp4', '_filelist.txt')
+    
+    with open(file_list_path, 'w') as f:
+        for video_file in video_files:
+            # Escape single quotes and write file path
+            escaped_path = video_file.replace("'", "'\"'\"'")
+            f.write(f"file '{escaped_path}'\n")
+    
+    # FFmpeg command for concatenation
+    cmd = [
+        'ffmpeg',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', file_list_path,
+        '-c', 'copy',  # Copy streams without re-encoding
+        '-y',  # Overwrite output file
+        output_path
+    ]
+    
+    logger.info(f"FFmpeg command: {' '.join(cmd)}")
+    return cmd, file_list_path
+
+def concat_videos_with_ffmpeg(video_files: List[str], output_path: str):
+    """Concatenate videos with FFmpeg stream copy"""
+    cmd, file_list_path = create_ffmpeg_concat_command(video_files, output_path)
+    
+    try:
+        logger.info("Starting FFmpeg video concatenation...")
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=300  # 5 minute timeout
+        )
+        
+        if result.returncode != 0:
+            logger.error(f"FFmpeg failed with return code {result.returncode}")
+            logger.error(f"FFmpeg stderr: {result.stderr}")
+            raise RuntimeError(f"FFmpeg concatenation failed: {result.stderr}")
+        
+        logger.info("FFmpeg concatenation completed successfully")
+        
+    except subprocess.TimeoutExpired:
+        logger.error("FFmpeg process timed out")
+        raise RuntimeError("Video processing timed out")
+    except Exception as e:
+        logger.error(f"FFmpeg error: {e}")
+        raise RuntimeError(f"Video processing failed: {str(e)}")
+    finally:
+        # Clean up temporary file list
+        if os.path.exists(file_list_path):
+            os.remove(file_list_path)
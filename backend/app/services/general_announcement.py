@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 from google.cloud import translate_v3
+from app.db.full_text import GENERAL_ANNOUNCEMENTS_FTS, full_text_available, match_expression, ranked_matches
 from app.models.general_announcement import GeneralAnnouncement
 from app.schemas.general_announcement import GeneralAnnouncementCreate, GeneralAnnouncementUpdate
 
@@ -311,14 +312,25 @@ class GeneralAnnouncementService:
         return True
 
     def search_general_announcements(self, search_query: str, skip: int = 0, limit: int = 100) -> list[GeneralAnnouncement]:
-        """Search general announcements by title or content"""
+        """Search general announcements by title, category or content in any language, best match first"""
         query = self.db.query(GeneralAnnouncement).filter(
             GeneralAnnouncement.is_active == True
-        ).filter(
-            (GeneralAnnouncement.title.ilike(f"%{search_query}%")) |
-            (GeneralAnnouncement.english_content.ilike(f"%{search_query}%")) |
-            (GeneralAnnouncement.category.ilike(f"%{search_query}%"))
         )
+
+        match = match_expression(search_query)
+        if match and full_text_available(self.db, GENERAL_ANNOUNCEMENTS_FTS):
+            matches = ranked_matches(GENERAL_ANNOUNCEMENTS_FTS, match)
+            query = query.join(matches, matches.c.id == GeneralAnnouncement.id).order_by(
+                matches.c.rank, GeneralAnnouncement.id)
+        else:
+            query = query.filter(
+                (GeneralAnnouncement.title.ilike(f"%{search_query}%")) |
+                (GeneralAnnouncement.english_content.ilike(f"%{search_query}%")) |
+                (GeneralAnnouncement.hindi_content.ilike(f"%{search_query}%")) |
+                (GeneralAnnouncement.marathi_content.ilike(f"%{search_query}%")) |
+                (GeneralAnnouncement.gujarati_content.ilike(f"%{search_query}%")) |
+                (GeneralAnnouncement.category.ilike(f"%{search_query}%"))
+            )
         
         return query.offset(skip).limit(limit).all()
 
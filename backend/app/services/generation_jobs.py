@@ -0,0 +1,253 @@
+import os
+import time
+import uuid
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs are kept this long so clients can still poll their status
+JOB_RETENTION_SECONDS = 3600
+
+
+class QueueFullError(Exception):
+    """Raised when the generation queue is at its configured depth"""
+    pass
+
+
+class SignTiming(BaseModel):
+    sign: str
+    start: float
+    end: float
+
+
+class GenerationJob(BaseModel):
+    job_id: str
+    temp_video_id: str
+    model: str
+    status: str = "queued"  # queued | running | completed | failed
+    progress: float = 0.0
+    step: Optional[str] = None
+    preview_url: Optional[str] = None
+    video_duration: Optional[float] = None
+    signs_used: List[str] = []
+    signs_skipped: List[str] = []
+    sign_timings: List[SignTiming] = []
+    error: Optional[str] = None
+    coalesced_with: Optional[str] = None  # Job ID of the identical in-flight job this one attached to
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+
+ProgressCallback = Callable[[float, str], None]
+# Produces a follower's output from its finished leader: follow(leader, follower)
+FollowCallback = Callable[[GenerationJob, GenerationJob], None]
+
+
+class GenerationJobQueue:
+    """Bounded worker pool running ISL video stitches off the event loop"""
+
+    def __init__(self, max_workers: int = settings.ISL_GENERATION_WORKERS, max_queued: int = settings.ISL_GENERATION_MAX_QUEUED):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="isl-generation")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._jobs_by_video: Dict[str, str] = {}
+        # Resolved by finish/fail, whoever runs the job: queue worker, stream or batch
+        self._done: Dict[str, Future] = {}
+        # Single-flight: coalesce key -> leader job ID, leader job ID -> attached followers
+        self._inflight: Dict[str, str] = {}
+        self._inflight_keys: Dict[str, str] = {}
+        self._followers: Dict[str, List[Tuple[GenerationJob, Optional[FollowCallback]]]] = {}
+        self._active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    def create_job(self, temp_video_id: str, model: str) -> GenerationJob:
+        job = GenerationJob(
+            job_id=str(uuid.uuid4()),
+            temp_video_id=temp_video_id,
+            model=model,
+            created_at=datetime.now()
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+            self._jobs_by_video[temp_video_id] = job.job_id
+            self._done[job.job_id] = Future()
+        return job
+
+    def submit(self, job: GenerationJob, work: Callable[[GenerationJob, ProgressCallback], None],
+               key: Optional[str] = None, follow: Optional[FollowCallback] = None) -> GenerationJob:
+        """Queue work for a job, raising QueueFullError when the queue is saturated
+
+        Jobs submitted with the key of a job still in flight do not run their work: they
+        attach to that job and, once it completes, follow(leader, follower) produces their
+        output. Attached jobs do not count against the queue depth.
+        """
+        with self._lock:
+            leader_id = self._inflight.get(key) if key is not None else None
+            if leader_id is not None:
+                leader = self._jobs.get(leader_id)
+                job.coalesced_with = leader_id
+                job.status = leader.status if leader else "queued"
+                job.progress = leader.progress if leader else 0.0
+                job.step = f"Waiting for identical job {leader_id}"
+                self._followers[leader_id].append((job, follow))
+                self.coalesced += 1
+                return job
+
+            if self._active >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                self._jobs.pop(job.job_id, None)
+                self._jobs_by_video.pop(job.temp_video_id, None)
+                self._done.pop(job.job_id, None)
+                raise QueueFullError(
+                    f"Generation queue is full ({self._active} jobs in flight)")
+            self._active += 1
+            if key is not None:
+                self._inflight[key] = job.job_id
+                self._inflight_keys[job.job_id] = key
+                self._followers[job.job_id] = []
+            self._executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job: GenerationJob, work: Callable[[GenerationJob, ProgressCallback], None]):
+        def report(progress: float, step: str):
+            job.progress = progress
+            job.step = step
+            for follower, _ in self._followers.get(job.job_id, []):
+                follower.status = job.status
+                follower.progress = progress
+
+        job.status = "running"
+        job.started_at = datetime.now()
+        report(0.05, "Started")
+        try:
+            work(job, report)
+            self.finish(job)
+        except Exception as e:
+            logger.error(f"Generation job {job.job_id} failed: {e}")
+            self.fail(job, str(e))
+        finally:
+            with self._lock:
+                self._active -= 1
+                key = self._inflight_keys.pop(job.job_id, None)
+                if key is not None and self._inflight.get(key) == job.job_id:
+                    del self._inflight[key]
+                followers = self._followers.pop(job.job_id, [])
+            self._settle_followers(job, followers)
+
+    def _settle_followers(self, leader: GenerationJob,
+                          followers: List[Tuple[GenerationJob, Optional[FollowCallback]]]):
+        for follower, follow in followers:
+            follower.started_at = follower.started_at or leader.started_at
+            try:
+                if leader.status != "completed":
+                    raise RuntimeError(leader.error or "Identical generation failed")
+                if follow:
+                    follow(leader, follower)
+                self.finish(follower)
+            except Exception as e:
+                logger.error(f"Generation job {follower.job_id} failed: {e}")
+                self.fail(follower, str(e))
+
+    def finish(self, job: GenerationJob):
+        job.status = "completed"
+        job.progress = 1.0
+        job.step = "Completed"
+        job.finished_at = datetime.now()
+        self.completed += 1
+        self._resolve(job)
+
+    def fail(self, job: GenerationJob, error: str):
+        job.status = "failed"
+        job.error = error
+        job.step = "Failed"
+        job.finished_at = datetime.now()
+        self.failed += 1
+        self._resolve(job)
+
+    def _resolve(self, job: GenerationJob):
+        with self._lock:
+            future = self._done.get(job.job_id)
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        return self._jobs.get(job_id)
+
+    def get_for_video(self, temp_video_id: str) -> Optional[GenerationJob]:
+        job_id = self._jobs_by_video.get(temp_video_id)
+        return self._jobs.get(job_id) if job_id else None
+
+    async def wait(self, job: GenerationJob) -> GenerationJob:
+        """Wait for a job to finish or fail without blocking the event loop"""
+        future = self._done.get(job.job_id)
+        if future is not None and not job.is_finished:
+            await asyncio.wrap_future(future)
+        return job
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            self._done.pop(job_id, None)
+            if self._jobs_by_video.get(job.temp_video_id) == job_id:
+                del self._jobs_by_video[job.temp_video_id]
+
+    def stats(self) -> dict:
+        statuses: Dict[str, int] = {}
+        for job in list(self._jobs.values()):
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "in_flight": self._active,
+            "queued": statuses.get("queued", 0),
+            "running": statuses.get("running", 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+            "cpu_count": os.cpu_count()
+        }
+
+
+_generation_queue: Optional[GenerationJobQueue] = None
+_batch_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_generation_queue() -> GenerationJobQueue:
+    """Get the process-wide ISL generation job queue"""
+    global _generation_queue
+    if _generation_queue is None:
+        _generation_queue = GenerationJobQueue()
+    return _generation_queue
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """Get the worker pool that runs the stitches of batch generation requests"""
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ThreadPoolExecutor(max_workers=settings.ISL_BATCH_WORKERS, thread_name_prefix="isl-batch")
+    return _batch_executor
@@ -0,0 +1,346 @@
+import os
+import asyncio
+import threading
+import subprocess
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.isl_ingest_job import ISLIngestJob
+from app.schemas.isl_video import ISLVideoUpdate
+from app.services.clip_renditions import generate_renditions
+from app.services.isl_video import get_isl_video_service, metadata_fields
+from app.services.rendition_ladder import get_rendition_ladder
+from app.services.sign_index import get_sign_index
+from app.utils.media_probe import probe_clip_metadata
+from app.utils.uploads import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# A transcode that takes longer than this is treated as hung and retried
+TRANSCODE_TIMEOUT_SECONDS = 1800
+
+
+def create_transcode_command(input_path: str, output_path: str) -> List[str]:
+    """Ingest encode: every library clip is 30 fps 1280x720 H.264, so stitching can stream-copy"""
+    return [
+        "ffmpeg", "-i", input_path,
+        "-vf", "fps=30:round=up,scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2",
+        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
+        "-an", "-movflags", "+faststart", "-pix_fmt", "yuv420p",
+        output_path, "-y"
+    ]
+
+
+def processed_clip_path(input_path: str, output_folder: str) -> str:
+    """Where a clip's ingest encode is written, next to the original until it is swapped in"""
+    return os.path.join(output_folder, f"{os.path.splitext(os.path.basename(input_path))[0]}_processed.mp4")
+
+
+def describe_clip(path: str, video_path: str) -> dict:
+    """
+    ISL video fields for the encode at path, recorded for the clip at video_path.
+    Every stream property is stored, so stitching, proxies and compatibility checks
+    can plan from the database without probing.
+    """
+    metadata = probe_clip_metadata(path)
+    return {
+        "video_path": video_path,
+        "file_size": os.path.getsize(path),
+        # Lets library sync tell this encode from a clip replaced outside the app
+        "file_sha256": file_sha256(path),
+        **(metadata_fields(metadata) if metadata else {})
+    }
+
+
+def transcode_clip(input_path: str, output_folder: str) -> dict:
+    """
+    Re-encode an ingested clip to processed_clip_path, leaving the original in place
+    until the job swaps the encode in as its last step.
+    Runs in a worker process; returns the ISL video fields describing the new encode.
+    """
+    output_path = processed_clip_path(input_path, output_folder)
+    result = subprocess.run(
+        create_transcode_command(input_path, output_path),
+        capture_output=True, text=True, timeout=TRANSCODE_TIMEOUT_SECONDS
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg transcode failed: {result.stderr[-500:]}")
+    return describe_clip(output_path, os.path.join(output_folder, os.path.basename(input_path)))
+
+
+def render_clip(video_path: str, duration: Optional[float], source_path: Optional[str] = None) -> dict:
+    """
+    Poster frame, proxy and ladder rungs of a transcoded clip, rendered from source_path
+    when the encode is not yet at video_path.
+    Runs in a worker process; returns the ISL video fields recording the renditions.
+    """
+    poster_path, proxy_path = generate_renditions(video_path, duration, source_path)
+    # Lower rungs of the stitched-video ladder, so every rung is a stream-copy concat
+    get_rendition_ladder().prepare(video_path, source_path)
+    return {
+        "poster_path": poster_path,
+        "proxy_path": proxy_path,
+        "proxy_file_size": os.path.getsize(proxy_path) if proxy_path else None
+    }
+
+
+class IngestWorker:
+    """
+    Runs ISL clip ingest from the persistent isl_ingest_jobs table.
+
+    FFmpeg work runs in a process pool sized to the cores; each running job is driven by a
+    thread that records its progress, so the event loop never waits on a transcode. Failed
+    attempts are requeued with exponential backoff, and jobs a restart interrupted are
+    picked up again by resume().
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 max_workers: int = settings.ISL_INGEST_WORKERS,
+                 max_attempts: int = settings.ISL_INGEST_MAX_ATTEMPTS,
+                 retry_backoff_seconds: int = settings.ISL_INGEST_RETRY_BACKOFF_SECONDS):
+        self._session_factory = session_factory
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="isl-ingest")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+        self._running: Set[int] = set()
+        self.retried = 0
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                # Spawned, not forked: the server process has threads and open database handles
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+
+    def _in_process(self, fn, *args):
+        pool = self._process_pool()
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory); start a fresh pool for the next attempt
+            with self._lock:
+                if self._processes is pool:
+                    self._processes = None
+            pool.shutdown(wait=False)
+            raise
+
+    def enqueue(self, db: Session, video_id: int, input_path, output_folder) -> ISLIngestJob:
+        """Record an ingest job for a clip already on disk and start it if a worker is free"""
+        job = ISLIngestJob(
+            video_id=video_id,
+            input_path=str(input_path),
+            output_folder=str(output_folder),
+            status="queued",
+            progress=0.0,
+            step="Queued",
+            attempts=0,
+            max_attempts=self.max_attempts
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self.dispatch()
+        return job
+
+    def dispatch(self) -> int:
+        """Start due queued jobs while workers are free, return how many were started"""
+        with self._dispatch_lock:
+            with self._lock:
+                free = self.max_workers - len(self._running)
+            if free <= 0:
+                return 0
+
+            db = self._session()
+            try:
+                now = datetime.now()
+                due = db.query(ISLIngestJob.id).filter(
+                    ISLIngestJob.status == "queued",
+                    or_(ISLIngestJob.next_attempt_at == None, ISLIngestJob.next_attempt_at <= now)
+                ).order_by(ISLIngestJob.id).limit(free).all()
+
+                started = 0
+                for (job_id,) in due:
+                    # Claim with a conditional update, so another server process cannot start it too
+                    claimed = db.query(ISLIngestJob).filter(
+                        ISLIngestJob.id == job_id, ISLIngestJob.status == "queued"
+                    ).update({
+                        "status": "running",
+                        "step": "Starting",
+                        "started_at": now,
+                        "attempts": ISLIngestJob.attempts + 1
+                    }, synchronize_session=False)
+                    db.commit()
+                    if not claimed:
+                        continue
+                    with self._lock:
+                        self._running.add(job_id)
+                    self._threads.submit(self._execute, job_id)
+                    started += 1
+                return started
+            finally:
+                db.close()
+
+    def _progress(self, db: Session, job: ISLIngestJob, progress: float, step: str):
+        job.progress = progress
+        job.step = step
+        db.commit()
+
+    def _execute(self, job_id: int):
+        db = self._session()
+        try:
+            job = db.query(ISLIngestJob).filter(ISLIngestJob.id == job_id).first()
+            try:
+                video_service = get_isl_video_service(db)
+                video = video_service.get_isl_video(job.video_id)
+                if video and video.file_sha256 and file_sha256(job.input_path) == video.file_sha256:
+                    # An earlier attempt swapped its encode in but was not recorded as complete;
+                    # encoding the encode again would only add another lossy generation
+                    self._progress(db, job, 0.1, "Already transcoded")
+                    encoded_path = job.input_path
+                    transcoded = self._in_process(describe_clip, encoded_path, encoded_path)
+                else:
+                    self._progress(db, job, 0.1, "Transcoding")
+                    encoded_path = processed_clip_path(job.input_path, job.output_folder)
+                    transcoded = self._in_process(transcode_clip, job.input_path, job.output_folder)
+
+                self._progress(db, job, 0.6, "Generating renditions")
+                renditions = self._in_process(
+                    render_clip, transcoded["video_path"], transcoded.get("duration_seconds"), encoded_path)
+
+                self._progress(db, job, 0.9, "Updating library")
+                video = video_service.record_ingest_metadata(job.video_id, **transcoded, **renditions)
+                # Last step: the original stays in place until the encode is recorded
+                if encoded_path != transcoded["video_path"]:
+                    os.replace(encoded_path, transcoded["video_path"])
+
+                # The transcode rewrote the clip; refresh its index entry, duration and fingerprint
+                if video:
+                    get_sign_index().refresh_sign(
+                        video.model_type, os.path.splitext(os.path.basename(job.input_path))[0],
+                        transcoded.get("duration_seconds"), transcoded.get("codec_fingerprint"))
+
+                job.status = "completed"
+                job.progress = 1.0
+                job.step = "Completed"
+                job.error = None
+                job.finished_at = datetime.now()
+                db.commit()
+                logger.info(f"Ingest job {job_id} for video {job.video_id} completed")
+            except Exception as e:
+                db.rollback()
+                self._retry_or_fail(db, job, e)
+        except Exception as e:
+            logger.error(f"Ingest job {job_id} could not be recorded: {e}")
+        finally:
+            db.close()
+            with self._lock:
+                self._running.discard(job_id)
+            self.dispatch()
+
+    def _retry_or_fail(self, db: Session, job: ISLIngestJob, error: Exception):
+        job.error = str(error)[-1000:] or type(error).__name__
+        if job.attempts < job.max_attempts:
+            delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+            job.status = "queued"
+            job.step = f"Retrying in {delay}s"
+            job.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+            db.commit()
+            self.retried += 1
+            logger.warning(f"Ingest job {job.id} attempt {job.attempts} failed, retrying in {delay}s: {error}")
+            return
+
+        job.status = "failed"
+        job.step = "Failed"
+        job.finished_at = datetime.now()
+        db.commit()
+        # The clip never became usable; keep it out of listings and generation
+        get_isl_video_service(db).update_isl_video(job.video_id, ISLVideoUpdate(is_active=False))
+        logger.error(f"Ingest job {job.id} failed after {job.attempts} attempts: {error}")
+
+    def resume(self) -> int:
+        """Requeue jobs a previous server process left running, return how many"""
+        with self._lock:
+            running = set(self._running)
+        db = self._session()
+        try:
+            interrupted = db.query(ISLIngestJob).filter(ISLIngestJob.status == "running")
+            if running:
+                interrupted = interrupted.filter(~ISLIngestJob.id.in_(running))
+            exhausted = interrupted.filter(ISLIngestJob.attempts >= ISLIngestJob.max_attempts).update({
+                "status": "failed",
+                "step": "Failed",
+                "error": "Interrupted by a restart on its last attempt",
+                "finished_at": datetime.now()
+            }, synchronize_session=False)
+            requeued = interrupted.filter(ISLIngestJob.attempts < ISLIngestJob.max_attempts).update({
+                "status": "queued",
+                "step": "Resumed after restart",
+                "next_attempt_at": None
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        if requeued or exhausted:
+            logger.info(f"Resumed {requeued} interrupted ingest jobs, {exhausted} out of attempts")
+        return requeued
+
+    def stats(self, db: Session) -> dict:
+        statuses = dict(db.query(ISLIngestJob.status, func.count(ISLIngestJob.id)).group_by(ISLIngestJob.status).all())
+        with self._lock:
+            running_here = len(self._running)
+        return {
+            "max_workers": self.max_workers,
+            "max_attempts": self.max_attempts,
+            "running_here": running_here,
+            "queued": statuses.get("queued", 0),
+            "running": statuses.get("running", 0),
+            "completed": statuses.get("completed", 0),
+            "failed": statuses.get("failed", 0),
+            "retried": self.retried
+        }
+
+
+_ingest_worker: Optional[IngestWorker] = None
+
+
+def get_ingest_worker() -> IngestWorker:
+    """Get the process-wide ISL ingest worker"""
+    global _ingest_worker
+    if _ingest_worker is None:
+        _ingest_worker = IngestWorker()
+    return _ingest_worker
+
+
+async def run_ingest_worker():
+    """Resume interrupted ingest jobs, then periodically start due ones, including retries"""
+    worker = get_ingest_worker()
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, worker.resume)
+    except Exception as e:
+        logger.warning(f"Resuming ingest jobs failed: {e}")
+    while True:
+        try:
+            await loop.run_in_executor(None, worker.dispatch)
+        except Exception as e:
+            logger.warning(f"Ingest job dispatch failed: {e}")
+        await asyncio.sleep(settings.ISL_INGEST_POLL_SECONDS)
@@ -1,9 +1,74 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional
+from sqlalchemy import String, and_, or_, func, literal
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
 import os
+import base64
+import time
+from datetime import datetime
 from app.models.isl_video import ISLVideo
+from app.models.isl_video_stats import ISLVideoStats
 from app.schemas.isl_video import ISLVideoCreate, ISLVideoUpdate, ISLVideoSearch
+from app.services.clip_renditions import remove_renditions
+from app.services.rendition_ladder import rung_clip_paths
+from app.core.config import settings
+from app.db.isl_video_stats import grouped_statistics, stats_triggers_available
+from app.db.full_text import ISL_VIDEOS_FTS, full_text_available, match_expression, ranked_matches
+from app.utils.media_probe import ClipMetadata, probe_clip_metadata
+from app.utils.uploads import file_sha256
+
+
+def metadata_fields(metadata: ClipMetadata) -> dict:
+    """ISL video columns recording a clip's probed metadata"""
+    fingerprint = metadata.fingerprint
+    return {
+        "width": fingerprint.width or None,
+        "height": fingerprint.height or None,
+        "duration_seconds": metadata.duration_seconds,
+        "fps": round(metadata.fps, 3) if metadata.fps else None,
+        "video_codec": fingerprint.codec_name,
+        "codec_profile": fingerprint.profile,
+        "codec_level": metadata.codec_level,
+        "codec_string": metadata.codec_string,
+        "pix_fmt": fingerprint.pix_fmt,
+        "bit_rate": metadata.bit_rate,
+        "frame_count": metadata.frame_count,
+        "has_audio": metadata.has_audio,
+        "content_type": metadata.content_type,
+        "codec_fingerprint": fingerprint.key
+    }
+
+
+# Statistics summaries computed by query, per database URL: (computed at, stats)
+_statistics_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+class PageCursor(BaseModel):
+    """Position after a video: its (created_at, id) in a listing, (rank, id) in a full-text search"""
+    id: int
+    created_at: Optional[datetime] = None
+    rank: Optional[float] = None
+
+
+def encode_cursor(video: ISLVideo, rank: Optional[float] = None) -> str:
+    """Opaque pagination cursor positioned after a video, and after its rank in a full-text search"""
+    position = f"r1|{rank!r}" if rank is not None else f"v2|{video.created_at.isoformat()}"
+    return base64.urlsafe_b64encode(f"{position}|{video.id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageCursor:
+    """Position a pagination cursor is after; ValueError if it is not a cursor"""
+    try:
+        version, position, video_id = base64.urlsafe_b64decode(
+            cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        if version == "v2":
+            return PageCursor(id=int(video_id), created_at=datetime.fromisoformat(position))
+        if version == "r1":
+            return PageCursor(id=int(video_id), rank=float(position))
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise ValueError(f"Invalid pagination cursor: {cursor!r}")
 
 
 class ISLVideoService:
@@ -35,9 +100,13 @@ class ISLVideoService:
             )
         ).all()
 
-    def search_isl_videos(self, search_params: ISLVideoSearch) -> List[ISLVideo]:
-        """Search ISL videos with various filters"""
+    def _filtered_query(self, search_params: ISLVideoSearch):
+        """
+        ISL videos matching the search filters, shared by the page and count queries.
+        Returns the query and, when the text search is a full-text match, its ranked matches.
+        """
         query = self.db.query(ISLVideo)
+        matches = None
         
         # Apply filters
         if search_params.model_type:
@@ -61,22 +130,85 @@ class ISLVideoService:
         if search_params.max_file_size:
             query = query.filter(ISLVideo.file_size <= search_params.max_file_size)
         
-        # Text search in description and tags
+        # Text search in filename, display name, description and tags
         if search_params.search_text:
-            search_term = f"%{search_params.search_text}%"
-            query = query.filter(
-                or_(
-                    ISLVideo.description.ilike(search_term),
-                    ISLVideo.tags.ilike(search_term),
-                    ISLVideo.filename.ilike(search_term),
-                    ISLVideo.display_name.ilike(search_term)
+            match = match_expression(search_params.search_text)
+            if match and full_text_available(self.db, ISL_VIDEOS_FTS):
+                matches = ranked_matches(ISL_VIDEOS_FTS, match)
+                query = query.join(matches, matches.c.id == ISLVideo.id)
+            else:
+                search_term = f"%{search_params.search_text}%"
+                query = query.filter(
+                    or_(
+                        ISLVideo.description.ilike(search_term),
+                        ISLVideo.tags.ilike(search_term),
+                        ISLVideo.filename.ilike(search_term),
+                        ISLVideo.display_name.ilike(search_term)
+                    )
                 )
-            )
         
-        # Apply pagination
-        query = query.offset(search_params.offset).limit(search_params.limit)
-        
-        return query.all()
+        return query, matches
+
+    def search_isl_videos(self, search_params: ISLVideoSearch) -> List[ISLVideo]:
+        """
+        Search ISL videos with various filters. Full-text searches are ordered best match
+        first, by (rank, id); everything else is in (created_at, id) order.
+        """
+        videos, _ = self.search_isl_videos_page(search_params)
+        return videos
+
+    def search_isl_videos_page(self, search_params: ISLVideoSearch) -> Tuple[List[ISLVideo], Optional[str]]:
+        """
+        One page of search_isl_videos and the cursor continuing it in the same order,
+        None on the last page. ValueError for a cursor taken from a different kind of search.
+        """
+        query, matches = self._filtered_query(search_params)
+        cursor = decode_cursor(search_params.cursor) if search_params.cursor else None
+        if cursor and (cursor.rank is None) != (matches is None):
+            raise ValueError("Pagination cursor belongs to a different search")
+
+        if matches is not None:
+            query = query.add_columns(matches.c.rank).order_by(matches.c.rank, ISLVideo.id)
+            if cursor:
+                query = query.filter(or_(
+                    matches.c.rank > cursor.rank,
+                    and_(matches.c.rank == cursor.rank, ISLVideo.id > cursor.id)
+                ))
+        else:
+            query = query.order_by(ISLVideo.created_at, ISLVideo.id)
+            if cursor:
+                # Keyset pagination on the values the cursor carries, so it keeps working when
+                # the row it was taken from is deleted
+                anchor_created_at = self._created_at_param(cursor.created_at)
+                query = query.filter(or_(
+                    ISLVideo.created_at > anchor_created_at,
+                    and_(ISLVideo.created_at == anchor_created_at, ISLVideo.id > cursor.id)
+                ))
+        if not cursor:
+            query = query.offset(search_params.offset)
+
+        rows = query.limit(search_params.limit).all()
+        if matches is not None:
+            videos = [video for video, _ in rows]
+            next_cursor = encode_cursor(*rows[-1]) if len(rows) == search_params.limit else None
+        else:
+            videos = rows
+            next_cursor = encode_cursor(rows[-1]) if len(rows) == search_params.limit else None
+        return videos, next_cursor
+
+    def _created_at_param(self, created_at: datetime):
+        """
+        A timestamp to compare with created_at. SQLite keeps the server default's
+        CURRENT_TIMESTAMP text, so the value is bound in that format, not SQLAlchemy's.
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            return literal(created_at.strftime("%Y-%m-%d %H:%M:%S"), String)
+        return created_at
+
+    def count_isl_videos(self, search_params: ISLVideoSearch) -> int:
+        """Number of ISL videos matching the search filters, ignoring pagination"""
+        query, _ = self._filtered_query(search_params)
+        return query.with_entities(func.count(ISLVideo.id)).scalar()
 
     def update_isl_video(self, video_id: int, video_update: ISLVideoUpdate) -> Optional[ISLVideo]:
         """Update an ISL video"""
@@ -89,6 +221,23 @@ class ISLVideoService:
             self.db.refresh(db_video)
         return db_video
 
+    def record_ingest_metadata(self, video_id: int, **fields) -> Optional[ISLVideo]:
+        """
+        Record the fields upload, ingest and library sync own (file path and size, probed
+        metadata, digests, renditions). No route exposes this; clients edit through
+        update_isl_video, whose schema only carries user-editable fields.
+        """
+        unknown = set(fields) - set(ISLVideo.__table__.columns.keys())
+        if unknown:
+            raise ValueError(f"Not ISL video columns: {', '.join(sorted(unknown))}")
+        db_video = self.get_isl_video(video_id)
+        if db_video:
+            for field, value in fields.items():
+                setattr(db_video, field, value)
+            self.db.commit()
+            self.db.refresh(db_video)
+        return db_video
+
     def delete_isl_video(self, video_id: int) -> bool:
         """Delete an ISL video (soft delete and remove file and folder)"""
         import os
@@ -96,6 +245,7 @@ class ISLVideoService:
         if db_video:
             # Try to delete the video file from filesystem
             try:
+                remove_renditions(db_video.poster_path, db_video.proxy_path, *rung_clip_paths(db_video.video_path))
                 if os.path.exists(db_video.video_path):
                     os.remove(db_video.video_path)
                     print(f"Deleted video file: {db_video.video_path}")
@@ -127,6 +277,7 @@ class ISLVideoService:
         if db_video:
             # Try to delete the video file from filesystem
             try:
+                remove_renditions(db_video.poster_path, db_video.proxy_path, *rung_clip_paths(db_video.video_path))
                 if os.path.exists(db_video.video_path):
                     os.remove(db_video.video_path)
                     print(f"Deleted video file: {db_video.video_path}")
@@ -152,30 +303,69 @@ class ISLVideoService:
         return False
 
     def get_video_statistics(self) -> dict:
-        """Get statistics about ISL videos"""
-        total_videos = self.db.query(ISLVideo).count()
-        active_videos = self.db.query(ISLVideo).filter(ISLVideo.is_active == True).count()
-        male_videos = self.db.query(ISLVideo).filter(
-            and_(ISLVideo.model_type == 'male', ISLVideo.is_active == True)
-        ).count()
-        female_videos = self.db.query(ISLVideo).filter(
-            and_(ISLVideo.model_type == 'female', ISLVideo.is_active == True)
-        ).count()
-        
-        total_size = self.db.query(func.sum(ISLVideo.file_size)).scalar() or 0
-        total_duration = self.db.query(func.sum(ISLVideo.duration_seconds)).scalar() or 0
-        
-        return {
-            "total_videos": total_videos,
-            "active_videos": active_videos,
-            "male_videos": male_videos,
-            "female_videos": female_videos,
-            "total_size_bytes": total_size,
-            "total_duration_seconds": float(total_duration) if total_duration else 0
+        """
+        Get statistics about ISL videos, overall and per model.
+        On SQLite the per-model totals are trigger-maintained rows; elsewhere they come
+        from one grouped query, cached for ISL_STATS_CACHE_SECONDS.
+        """
+        maintained = stats_triggers_available(self.db)
+        cache_key = str(self.db.get_bind().url)
+        if maintained:
+            rows = [
+                (row.model_type, row.total_videos, row.total_size_bytes, row.total_duration_seconds,
+                 row.active_videos, row.active_size_bytes, row.active_duration_seconds)
+                for row in self.db.query(ISLVideoStats).all()
+            ]
+        else:
+            cached = _statistics_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < settings.ISL_STATS_CACHE_SECONDS:
+                return cached[1]
+            rows = self.db.execute(grouped_statistics()).all()
+
+        by_model = {
+            model_type: {
+                "total_videos": total_videos,
+                "active_videos": active_videos,
+                "total_size_bytes": total_size,
+                "active_size_bytes": active_size,
+                "total_duration_seconds": round(float(total_duration), 2),
+                "active_duration_seconds": round(float(active_duration), 2)
+            }
+            for model_type, total_videos, total_size, total_duration, active_videos, active_size, active_duration in rows
+        }
+        stats = {
+            "total_videos": sum(model["total_videos"] for model in by_model.values()),
+            "active_videos": sum(model["active_videos"] for model in by_model.values()),
+            "male_videos": by_model.get("male", {}).get("active_videos", 0),
+            "female_videos": by_model.get("female", {}).get("active_videos", 0),
+            "total_size_bytes": sum(model["total_size_bytes"] for model in by_model.values()),
+            "total_duration_seconds": round(sum(model["total_duration_seconds"] for model in by_model.values()), 2),
+            "by_model": by_model
         }
+        if not maintained:
+            _statistics_cache[cache_key] = (time.monotonic(), stats)
+        return stats
+
+    def find_by_content_digest(self, content_sha256: str, model_type: str) -> Optional[ISLVideo]:
+        """Get the active video of a model with this content digest (unique index lookup)"""
+        return self.db.query(ISLVideo).filter(
+            and_(
+                ISLVideo.model_type == model_type,
+                ISLVideo.content_sha256 == content_sha256,
+                ISLVideo.is_active == True
+            )
+        ).first()
+
+    def check_duplicate_video(self, filename: str, model_type: str, file_size: int = None,
+                              content_sha256: str = None) -> Optional[ISLVideo]:
+        """
+        Check if the same video already exists for the model type.
+        With a content digest this is a single indexed lookup that also catches renamed copies;
+        without one it falls back to matching the filename (and file size, if given).
+        """
+        if content_sha256:
+            return self.find_by_content_digest(content_sha256, model_type)
 
-    def check_duplicate_video(self, filename: str, model_type: str, file_size: int = None) -> Optional[ISLVideo]:
-        """Check if a video with the same filename and model type already exists"""
         query = self.db.query(ISLVideo).filter(
             and_(
                 ISLVideo.filename == filename,
@@ -200,14 +390,15 @@ class ISLVideoService:
             )
         ).first()
 
-    def get_duplicate_videos(self, filename: str, model_type: str, file_size: int = None) -> List[ISLVideo]:
-        """Get all potential duplicate videos (by filename, display_name, or file_size)"""
+    def get_duplicate_videos(self, filename: str, model_type: str, file_size: int = None,
+                             content_sha256: str = None) -> List[ISLVideo]:
+        """Get all potential duplicate videos (by content digest or filename, and display_name)"""
         duplicates = []
         
-        # Check by filename
-        filename_duplicate = self.check_duplicate_video(filename, model_type, file_size)
-        if filename_duplicate:
-            duplicates.append(filename_duplicate)
+        # Same content, or same filename when no digest is known
+        exact_duplicate = self.check_duplicate_video(filename, model_type, file_size, content_sha256)
+        if exact_duplicate:
+            duplicates.append(exact_duplicate)
         
         # Check by display name (if different from filename)
         display_name = os.path.splitext(filename)[0]  # Remove extension
@@ -215,23 +406,113 @@ class ISLVideoService:
         if display_name_duplicate and display_name_duplicate not in duplicates:
             duplicates.append(display_name_duplicate)
         
-        # If file_size provided, check for videos with same size (potential duplicates)
-        if file_size is not None:
-            size_duplicates = self.db.query(ISLVideo).filter(
+        return duplicates
+
+    def backfill_content_digests(self, batch_size: int = 100) -> dict:
+        """
+        Hash active videos that have no content digest yet. A clip whose digest another active
+        video of the same model already holds is a duplicate; it is reported and left unhashed.
+        """
+        hashed = 0
+        duplicates = []
+        missing = 0
+        last_id = 0
+        while True:
+            batch = self.db.query(ISLVideo).filter(
                 and_(
-                    ISLVideo.model_type == model_type,
-                    ISLVideo.file_size == file_size,
+                    ISLVideo.id > last_id,
+                    ISLVideo.content_sha256 == None,
                     ISLVideo.is_active == True
                 )
-            ).all()
-            
-            for duplicate in size_duplicates:
-                if duplicate not in duplicates:
-                    duplicates.append(duplicate)
-        
-        return duplicates
+            ).order_by(ISLVideo.id).limit(batch_size).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for video in batch:
+                if not os.path.exists(video.video_path):
+                    missing += 1
+                    continue
+                digest = file_sha256(video.video_path)
+                original = self.find_by_content_digest(digest, video.model_type)
+                if original:
+                    duplicates.append({"id": video.id, "duplicate_of": original.id})
+                    continue
+                video.content_sha256 = digest
+                # Flush per row so the next lookup sees digests claimed in this batch
+                self.db.flush()
+                hashed += 1
+            self.db.commit()
+
+        return {"hashed": hashed, "duplicates": duplicates, "missing_files": missing}
+
+    def backfill_clip_metadata(self, batch_size: int = 100, workers: int = settings.ISL_INGEST_WORKERS) -> dict:
+        """Probe active videos ingested before their stream metadata was recorded"""
+        probed = 0
+        failed = 0
+        missing = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while True:
+                batch = self.db.query(ISLVideo).filter(
+                    and_(
+                        ISLVideo.id > last_id,
+                        ISLVideo.video_codec == None,
+                        ISLVideo.is_active == True
+                    )
+                ).order_by(ISLVideo.id).limit(batch_size).all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                present = [video for video in batch if os.path.exists(video.video_path)]
+                missing += len(batch) - len(present)
+                for video, metadata in zip(present, pool.map(lambda video: probe_clip_metadata(video.video_path), present)):
+                    if metadata is None:
+                        failed += 1
+                        continue
+                    for field, value in metadata_fields(metadata).items():
+                        setattr(video, field, value)
+                    probed += 1
+                self.db.commit()
+
+        return {"probed": probed, "failed": failed, "missing_files": missing}
 
 
 def get_isl_video_service(db: Session) -> ISLVideoService:
     """Dependency to get ISL video service"""
     return ISLVideoService(db)
+
+
+def backfill_content_digests() -> Optional[dict]:
+    """Fill in content digests for videos ingested before they were recorded"""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = ISLVideoService(db).backfill_content_digests()
+    except Exception as e:
+        print(f"❌ Content digest backfill failed: {e}")
+        return None
+    finally:
+        db.close()
+    if result["hashed"] or result["duplicates"]:
+        print(f"✅ Hashed {result['hashed']} ISL videos, found {len(result['duplicates'])} duplicates")
+    return result
+
+
+def backfill_clip_metadata() -> Optional[dict]:
+    """Fill in stream metadata for videos ingested before it was recorded"""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = ISLVideoService(db).backfill_clip_metadata()
+    except Exception as e:
+        print(f"❌ Clip metadata backfill failed: {e}")
+        return None
+    finally:
+        db.close()
+    if result["probed"] or result["failed"]:
+        print(f"✅ Probed {result['probed']} ISL videos, {result['failed']} could not be read")
+    return result
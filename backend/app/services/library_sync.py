@@ -0,0 +1,396 @@
+import os
+import json
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.isl_ingest_job import ISLIngestJob
+from app.models.isl_video import ISLVideo
+from app.schemas.isl_video import ISLVideoCreate
+from app.services.clip_renditions import generate_renditions
+from app.services.ingest_jobs import get_ingest_worker
+from app.services.isl_video import get_isl_video_service
+from app.services.rendition_ladder import get_rendition_ladder
+from app.services.sign_index import get_sign_index
+from app.utils.uploads import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+SYNC_MANIFEST_DIR = PROJECT_ROOT / "backend" / "cache" / "isl-sync-manifests"
+
+MANIFEST_VERSION = 1
+# Finished sync jobs are kept this long so clients can still poll their status
+JOB_RETENTION_SECONDS = 3600
+INGEST_POLL_SECONDS = 1.0
+
+
+class ManifestEntry(BaseModel):
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class SyncManifest:
+    """Size, mtime and digest of every clip of a model folder as of its last sync"""
+
+    def __init__(self, path: Path, root: str):
+        self.path = Path(path)
+        self.root = root
+        # Keyed by path relative to the model folder: {sign}/{sign}.mp4
+        self.entries: Dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, path: Path, root: str) -> "SyncManifest":
+        manifest = cls(path, root)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            # A manifest of another folder says nothing about this one
+            if data.get("version") == MANIFEST_VERSION and data.get("root") == root:
+                manifest.entries = {name: ManifestEntry(**entry) for name, entry in data["entries"].items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable sync manifest {path}: {e}")
+        return manifest
+
+    def record(self, relative_path: str, path: str):
+        """Record a clip as it is on disk now"""
+        stat = os.stat(path)
+        self.entries[relative_path] = ManifestEntry(
+            size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=file_sha256(path))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "root": self.root,
+                "entries": {name: entry.dict() for name, entry in self.entries.items()}
+            }, f)
+        os.replace(tmp_path, self.path)
+
+
+class ScannedClip(BaseModel):
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def relative_path(self) -> str:
+        return f"{self.name}/{self.name}.mp4"
+
+
+def scan_model_folder(model_path: Path) -> List[ScannedClip]:
+    """Every {sign}/{sign}.mp4 of a model folder with its size and mtime, in one pass"""
+    clips = []
+    with os.scandir(model_path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            path = os.path.join(entry.path, f"{entry.name}.mp4")
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            clips.append(ScannedClip(name=entry.name, path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns))
+    clips.sort(key=lambda clip: clip.name)
+    return clips
+
+
+def needs_renditions(video: ISLVideo) -> bool:
+    return not (video.poster_path and os.path.exists(video.poster_path)
+                and video.proxy_path and os.path.exists(video.proxy_path))
+
+
+def rendition_update(video_path: str, duration: Optional[float]) -> dict:
+    """Generate the poster and proxy of a clip and return the fields recording them"""
+    poster_path, proxy_path = generate_renditions(video_path, duration)
+    return {
+        "poster_path": poster_path,
+        "proxy_path": proxy_path,
+        "proxy_file_size": os.path.getsize(proxy_path) if proxy_path else None
+    }
+
+
+class SyncJob(BaseModel):
+    job_id: str
+    model: str
+    force_reprocess: bool = False
+    status: str = "queued"  # queued | running | completed | failed
+    progress: float = 0.0
+    step: Optional[str] = None
+    scanned: int = 0
+    unchanged: int = 0  # Vouched for by the manifest, not read
+    hashed: int = 0  # New or changed since the last sync
+    removed: int = 0  # In the manifest but gone from disk
+    queued: int = 0  # Handed to the ingest workers
+    ingested: int = 0
+    ingest_failed: int = 0
+    renditions: int = 0
+    ingest_job_ids: List[int] = []
+    errors: List[str] = []
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+
+class LibrarySyncer:
+    """
+    Incremental sync of a model's clip folder with the ISL video table.
+
+    The tree is diffed against an on-disk manifest of (path, size, mtime, digest), so only
+    new or changed clips are read. Existing rows are loaded in one query, and only clips
+    that need ingest go to the ingest workers, which transcode them in parallel. Each sync
+    runs in the background as a job that can be polled.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 manifest_dir: Path = SYNC_MANIFEST_DIR, io_workers: int = settings.ISL_INGEST_WORKERS):
+        self._session_factory = session_factory
+        self.manifest_dir = Path(manifest_dir)
+        self.io_workers = max(1, io_workers)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="isl-sync")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, SyncJob] = {}
+        self._active: Dict[str, str] = {}  # Model -> job ID of its running sync
+
+    def _session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def manifest_path(self, model: str) -> Path:
+        return self.manifest_dir / f"{model}-model.json"
+
+    def start(self, model: str, model_path: Path, force_reprocess: bool = False) -> SyncJob:
+        """Start a sync of model_path in the background; a model already syncing returns its job"""
+        with self._lock:
+            self._prune()
+            active_id = self._active.get(model)
+            if active_id is not None:
+                return self._jobs[active_id]
+            job = SyncJob(job_id=str(uuid.uuid4()), model=model, force_reprocess=force_reprocess,
+                          created_at=datetime.now())
+            self._jobs[job.job_id] = job
+            self._active[model] = job.job_id
+        self._executor.submit(self._run, job, Path(model_path))
+        return job
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        return self._jobs.get(job_id)
+
+    def _run(self, job: SyncJob, model_path: Path):
+        job.status = "running"
+        job.started_at = datetime.now()
+        db = self._session()
+        # Rows loaded up front stay usable across the per-clip commits
+        db.expire_on_commit = False
+        try:
+            self.sync(db, job, model_path)
+            job.status = "completed"
+            job.progress = 1.0
+            job.step = "Completed"
+        except Exception as e:
+            logger.error(f"Sync of the {job.model} model failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+            job.step = "Failed"
+        finally:
+            db.close()
+            job.finished_at = datetime.now()
+            with self._lock:
+                self._active.pop(job.model, None)
+
+    def sync(self, db: Session, job: SyncJob, model_path: Path):
+        manifest = SyncManifest.load(self.manifest_path(job.model), str(model_path))
+
+        job.step = "Scanning"
+        clips = scan_model_folder(model_path)
+        job.scanned = len(clips)
+        present = {clip.relative_path for clip in clips}
+        for name in [name for name in manifest.entries if name not in present]:
+            del manifest.entries[name]
+            job.removed += 1
+        job.progress = 0.05
+
+        # Every row of the model in one query
+        rows: Dict[str, ISLVideo] = {
+            video.video_path: video
+            for video in db.query(ISLVideo).filter(ISLVideo.model_type == job.model).all()
+        }
+        digests: Dict[str, ISLVideo] = {
+            video.content_sha256: video for video in rows.values() if video.is_active and video.content_sha256
+        }
+
+        # Read only the clips the manifest cannot vouch for
+        def unchanged(clip: ScannedClip) -> bool:
+            entry = manifest.entries.get(clip.relative_path)
+            return entry is not None and entry.size == clip.size and entry.mtime_ns == clip.mtime_ns
+
+        changed = [clip for clip in clips if not unchanged(clip)]
+        job.unchanged = len(clips) - len(changed)
+        job.hashed = len(changed)
+        job.step = f"Hashing {len(changed)} new or changed clips"
+        with ThreadPoolExecutor(max_workers=self.io_workers) as pool:
+            hashed = dict(zip(
+                (clip.relative_path for clip in changed),
+                pool.map(lambda clip: file_sha256(clip.path), changed)
+            ))
+        job.progress = 0.2
+
+        job.step = "Updating library"
+        video_service = get_isl_video_service(db)
+        worker = get_ingest_worker()
+        pending: Dict[int, ScannedClip] = {}
+        missing_renditions: List[ISLVideo] = []
+        for i, clip in enumerate(clips):
+            try:
+                previous = manifest.entries.get(clip.relative_path)
+                digest = hashed.get(clip.relative_path) or previous.sha256
+                row = rows.get(clip.path)
+
+                if row and not job.force_reprocess and not self._modified(row, clip, previous, digest):
+                    manifest.entries[clip.relative_path] = ManifestEntry(
+                        size=clip.size, mtime_ns=clip.mtime_ns, sha256=digest)
+                    if needs_renditions(row) or get_rendition_ladder().missing_rungs(row.video_path):
+                        missing_renditions.append(row)
+                    if row.is_active and not row.content_sha256 and digest not in digests:
+                        video_service.record_ingest_metadata(row.id, content_sha256=digest)
+                        digests[digest] = row
+                    continue
+
+                # The same clip already in the library under another folder
+                duplicate = digests.get(digest)
+                if duplicate and (not row or duplicate.id != row.id):
+                    # Remembered, so later syncs skip it without reading it again
+                    manifest.entries[clip.relative_path] = ManifestEntry(
+                        size=clip.size, mtime_ns=clip.mtime_ns, sha256=digest)
+                    job.errors.append(f"Skipped {clip.name}: identical to '{duplicate.filename}'")
+                    continue
+
+                if row:
+                    video = video_service.record_ingest_metadata(
+                        row.id, file_size=clip.size, content_sha256=digest, is_active=True)
+                else:
+                    video = video_service.create_isl_video(ISLVideoCreate(
+                        filename=f"{clip.name}.mp4",
+                        display_name=clip.name,
+                        video_path=clip.path,
+                        file_size=clip.size,
+                        content_sha256=digest,
+                        model_type=job.model,
+                        mime_type="video/mp4",
+                        file_extension="mp4",
+                        is_active=True
+                    ))
+                digests[digest] = video
+
+                ingest_job = worker.enqueue(db, video.id, clip.path, os.path.dirname(clip.path))
+                pending[ingest_job.id] = clip
+                job.ingest_job_ids.append(ingest_job.id)
+                job.queued += 1
+            except Exception as e:
+                db.rollback()
+                job.errors.append(f"Error processing {clip.name}: {e}")
+            job.progress = 0.2 + 0.2 * (i + 1) / len(clips)
+        manifest.save()
+
+        if missing_renditions:
+            job.step = f"Generating renditions for {len(missing_renditions)} clips"
+            self._backfill_renditions(video_service, job, missing_renditions)
+        job.progress = 0.5
+
+        # Clips being ingested are indexed now and refreshed by their job when it finishes
+        get_sign_index().build(job.model)
+
+        if pending:
+            self._wait_for_ingest(db, job, pending, manifest)
+
+    def _modified(self, row: ISLVideo, clip: ScannedClip, previous: Optional[ManifestEntry], digest: str) -> bool:
+        """Whether a clip that already has a row changed on disk since the last sync"""
+        if previous is None or digest == previous.sha256:
+            return False
+        # Replaced through an upload, whose ingest already recorded the file it left on disk;
+        # any other content was replaced outside the app and is ingested again
+        return digest not in (row.content_sha256, row.file_sha256)
+
+    def _backfill_renditions(self, video_service, job: SyncJob, videos: List[ISLVideo]):
+        def render(video: ISLVideo) -> dict:
+            # Ladder rungs are only encoded here and at ingest, never on request
+            get_rendition_ladder().prepare(video.video_path)
+            if not needs_renditions(video):
+                return {}
+            duration = float(video.duration_seconds) if video.duration_seconds else None
+            return rendition_update(video.video_path, duration)
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as pool:
+            for video, update in zip(videos, pool.map(render, videos)):
+                if update:
+                    video_service.record_ingest_metadata(video.id, **update)
+                job.renditions += 1
+
+    def _wait_for_ingest(self, db: Session, job: SyncJob, pending: Dict[int, ScannedClip], manifest: SyncManifest):
+        total = len(pending)
+        job.step = f"Transcoding {total} clips"
+        while pending:
+            finished = db.query(ISLIngestJob.id, ISLIngestJob.status, ISLIngestJob.error).filter(
+                ISLIngestJob.id.in_(list(pending)),
+                ISLIngestJob.status.in_(("completed", "failed"))
+            ).all()
+            # End the read transaction so the ingest workers can write
+            db.commit()
+            for ingest_job_id, status, error in finished:
+                clip = pending.pop(ingest_job_id)
+                if status == "completed":
+                    # The transcode rewrote the clip; remember the new file
+                    manifest.record(clip.relative_path, clip.path)
+                    job.ingested += 1
+                else:
+                    manifest.entries.pop(clip.relative_path, None)
+                    job.ingest_failed += 1
+                    job.errors.append(f"Error processing {clip.name}: {error}")
+            if finished:
+                manifest.save()
+            job.progress = 0.5 + 0.5 * (total - len(pending)) / total
+            job.step = f"Transcoding {len(pending)} of {total} clips"
+            if pending:
+                time.sleep(INGEST_POLL_SECONDS)
+
+    def _prune(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+_library_syncer: Optional[LibrarySyncer] = None
+
+
+def get_library_syncer() -> LibrarySyncer:
+    """Get the process-wide ISL library syncer"""
+    global _library_syncer
+    if _library_syncer is None:
+        _library_syncer = LibrarySyncer()
+    return _library_syncer
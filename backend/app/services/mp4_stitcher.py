@@ -0,0 +1,82 @@
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.sign_index import get_sign_index
+from app.utils.mp4 import SampleTable, parse_sample_table, write_fragmented_mp4
+
+logger = logging.getLogger(__name__)
+
+
+class SampleTableCache:
+    """LRU of parsed clip sample tables, revalidated against each file's size and mtime"""
+
+    def __init__(self, max_entries: int = settings.ISL_SAMPLE_TABLE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._tables: "OrderedDict[str, SampleTable]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> SampleTable:
+        """Sample table of a clip, parsing it on first use or after it changed on disk"""
+        stat = os.stat(path)
+        with self._lock:
+            table = self._tables.get(path)
+            if table and table.file_size == stat.st_size and table.mtime_ns == stat.st_mtime_ns:
+                self._tables.move_to_end(path)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = parse_sample_table(path)
+        with self._lock:
+            self._tables[path] = table
+            self._tables.move_to_end(path)
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
+        return table
+
+    def invalidate_path(self, path: str):
+        """Forget a clip that changed or disappeared"""
+        with self._lock:
+            self._tables.pop(path, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._tables),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+_sample_table_cache: Optional[SampleTableCache] = None
+
+
+def get_sample_table_cache() -> SampleTableCache:
+    """Get the process-wide sample table cache"""
+    global _sample_table_cache
+    if _sample_table_cache is None:
+        _sample_table_cache = SampleTableCache()
+        get_sign_index().add_listener(_sample_table_cache.invalidate_path)
+    return _sample_table_cache
+
+
+def load_sample_tables(video_files: List[str]) -> List[SampleTable]:
+    cache = get_sample_table_cache()
+    return [cache.get(video_file) for video_file in video_files]
+
+
+def concat_videos_with_mp4(video_files: List[str], output_path: str) -> float:
+    """Concatenate videos into a fragmented MP4 in-process and return its duration
+
+    Raises Mp4Error when a clip cannot be parsed or does not match the others.
+    """
+    tables = load_sample_tables(video_files)
+    write_fragmented_mp4(tables, output_path)
+    return sum(table.duration for table in tables) / tables[0].timescale
@@ -0,0 +1,199 @@
+import os
+import subprocess
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.clip_compat import get_clip_normalizer
+from app.services.mp4_stitcher import load_sample_tables
+from app.services.sign_index import SignClip
+from app.services.stitch_cache import StitchCacheEntry, get_stitch_cache, stitch_cache_key
+from app.utils.mp4 import SampleTable, check_compatible, write_fragmented_mp4
+
+logger = logging.getLogger(__name__)
+
+
+class RenditionNotReadyError(LookupError):
+    """Raised when a rung is requested before every clip has its rendition"""
+    pass
+
+
+class LadderRung(BaseModel):
+    height: int
+    kbps: int
+
+
+class RungOutput(BaseModel):
+    """A stitched announcement at one rung of the ladder"""
+    height: int
+    cache_key: str
+    entry: StitchCacheEntry
+
+
+def ladder_rungs() -> List[LadderRung]:
+    """Configured rungs below the native clips, from ISL_RENDITION_LADDER ("480:450,240:200")"""
+    rungs = []
+    for item in settings.ISL_RENDITION_LADDER.split(","):
+        if not item.strip():
+            continue
+        height, _, kbps = item.partition(":")
+        rungs.append(LadderRung(height=int(height), kbps=int(kbps or 0)))
+    return sorted(rungs, key=lambda rung: rung.height, reverse=True)
+
+
+def rung_clip_path(video_path: str, height: int) -> str:
+    """Per-clip rendition for a rung, stored next to the clip ({sign}_480p.mp4)"""
+    video = Path(video_path)
+    return str(video.with_name(f"{video.stem}_{height}p.mp4"))
+
+
+def rung_clip_paths(video_path: str) -> List[str]:
+    return [rung_clip_path(video_path, rung.height) for rung in ladder_rungs()]
+
+
+def rendered_from(output_path: str, source_path: str) -> bool:
+    """Whether a rendition exists and is at least as new as the file it was rendered from"""
+    try:
+        return os.stat(output_path).st_mtime_ns >= os.stat(source_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def create_rung_command(input_path: str, output_path: str, rung: LadderRung) -> List[str]:
+    """
+    FFmpeg command for a clip's rung rendition. Every clip of a rung gets identical
+    encoder settings so a rung stitches by stream copy, like the native clips.
+    """
+    return [
+        "ffmpeg", "-i", input_path,
+        "-vf", f"fps=30:round=up,scale=-2:{rung.height}",
+        "-c:v", "libx264", "-preset", "fast", "-profile:v", "high",
+        "-b:v", f"{rung.kbps}k", "-maxrate", f"{rung.kbps * 3 // 2}k", "-bufsize", f"{rung.kbps * 2}k",
+        "-pix_fmt", "yuv420p", "-an", "-movflags", "+faststart",
+        "-video_track_timescale", "15360",
+        output_path, "-y"
+    ]
+
+
+def rung_width(native: SampleTable, height: int) -> int:
+    return round(native.width * height / native.height / 2) * 2
+
+
+class RenditionLadder:
+    """
+    Per-clip rung renditions and the stitched rungs built from them. Renditions are only
+    encoded at ingest or by library sync; requests use the ones that exist.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.encoded = 0
+        self.stitched = 0
+
+    def _lock_for(self, path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def rung(self, height: int) -> Optional[LadderRung]:
+        return next((rung for rung in ladder_rungs() if rung.height == height), None)
+
+    def ready_clip(self, video_path: str, rung: LadderRung) -> Optional[str]:
+        """Path of a clip's rung rendition, or None when it is missing or older than the clip"""
+        output_path = rung_clip_path(video_path, rung.height)
+        return output_path if rendered_from(output_path, video_path) else None
+
+    def missing_rungs(self, video_path: str) -> List[LadderRung]:
+        return [rung for rung in ladder_rungs() if self.ready_clip(video_path, rung) is None]
+
+    def rung_ready(self, clips: List[SignClip], height: int) -> bool:
+        """Whether every clip has its rendition for a rung"""
+        rung = self.rung(height)
+        return rung is not None and all(self.ready_clip(clip.path, rung) for clip in clips)
+
+    def prepare_clip(self, video_path: str, rung: LadderRung, source_path: Optional[str] = None) -> str:
+        """
+        Path of a clip's rung rendition, encoding it when missing or older than the clip.
+        source_path is an encode of the clip not yet swapped in at video_path to render from.
+        """
+        output_path = rung_clip_path(video_path, rung.height)
+        source_path = source_path or video_path
+        with self._lock_for(output_path):
+            if rendered_from(output_path, source_path):
+                return output_path
+
+            root, ext = os.path.splitext(output_path)
+            tmp_path = f"{root}.tmp{ext}"
+            result = subprocess.run(create_rung_command(source_path, tmp_path, rung),
+                                    capture_output=True, text=True, timeout=300)
+            if result.returncode != 0:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise RuntimeError(f"Rung {rung.height}p failed for {video_path}: {result.stderr[-500:]}")
+            os.replace(tmp_path, output_path)
+            self.encoded += 1
+            return output_path
+
+    def prepare(self, video_path: str, source_path: Optional[str] = None):
+        """Encode every configured rung of an ingested clip"""
+        for rung in ladder_rungs():
+            try:
+                self.prepare_clip(video_path, rung, source_path)
+            except Exception as e:
+                logger.warning(f"Could not prepare ladder rendition: {e}")
+
+    def stitch(self, model: str, clips: List[SignClip], height: Optional[int] = None) -> Tuple[RungOutput, List[SampleTable]]:
+        """
+        Stitch an announcement at one rung (native clips when height is None) into the
+        stitch cache as fragmented MP4, by stream copy. Raises RenditionNotReadyError when
+        a clip has no rendition for the rung yet, Mp4Error when the clips cannot be
+        muxed in-process.
+        """
+        if height is None:
+            files = get_clip_normalizer().plan(model, clips)
+        else:
+            rung = self.rung(height)
+            if rung is None:
+                raise ValueError(f"No {height}p rung configured")
+            files = [self.ready_clip(clip.path, rung) for clip in clips]
+            if None in files:
+                raise RenditionNotReadyError(f"{height}p renditions are not prepared for every clip yet")
+
+        tables = load_sample_tables(files)
+        check_compatible(tables)
+        cache_key = f"{stitch_cache_key(model, clips)}-{f'{height}p' if height else 'native'}"
+
+        cache = get_stitch_cache()
+        entry = cache.get(cache_key)
+        if entry is None:
+            tmp_path = str(cache.cache_dir / f"{cache_key}.{threading.get_ident()}.part")
+            try:
+                write_fragmented_mp4(tables, tmp_path)
+                duration = sum(table.duration for table in tables) / tables[0].timescale
+                entry = cache.put(cache_key, tmp_path, duration)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self.stitched += 1
+        return RungOutput(height=tables[0].height, cache_key=cache_key, entry=entry), tables
+
+    def stats(self) -> dict:
+        return {
+            "rungs": [rung.dict() for rung in ladder_rungs()],
+            "clip_renditions_encoded": self.encoded,
+            "stitched": self.stitched
+        }
+
+
+_rendition_ladder: Optional[RenditionLadder] = None
+
+
+def get_rendition_ladder() -> RenditionLadder:
+    """Get the process-wide rendition ladder"""
+    global _rendition_ladder
+    if _rendition_ladder is None:
+        _rendition_ladder = RenditionLadder()
+    return _rendition_ladder
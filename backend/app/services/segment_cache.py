@@ -0,0 +1,272 @@
+import os
+import re
+import json
+import asyncio
+import hashlib
+import threading
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.sign_index import SignClip, get_sign_index, normalize_sign
+from app.services.clip_compat import get_clip_normalizer
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+SEGMENT_CACHE_DIR = PROJECT_ROOT / "backend" / "temp" / "isl-segments"
+
+# Longest phrase (in signs) that is mined and pre-stitched
+MAX_PHRASE_SIGNS = 8
+
+# Upper bound on tracked n-grams before the long tail is pruned
+MAX_TRACKED_PHRASES = 20000
+
+
+class PhraseSegment(BaseModel):
+    key: str
+    path: str
+    sources: List[str]
+    versions: List[Tuple[int, int]]  # (file_size, mtime_ns) of each source at build time
+    uses: int = 0
+
+
+def _source_versions(paths: List[str]) -> List[Tuple[int, int]]:
+    versions = []
+    for path in paths:
+        stat = os.stat(path)
+        versions.append((stat.st_size, stat.st_mtime_ns))
+    return versions
+
+
+class PhraseMiner:
+    """Counts frequent clip n-grams in generated texts and announcement templates"""
+
+    def __init__(self, max_length: int = MAX_PHRASE_SIGNS):
+        self.max_length = max_length
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def record(self, video_files: List[str], weight: int = 1):
+        """Count every n-gram (2..max_length clips) of a resolved clip sequence"""
+        with self._lock:
+            for length in range(2, min(self.max_length, len(video_files)) + 1):
+                for start in range(len(video_files) - length + 1):
+                    self._counts[tuple(video_files[start:start + length])] += weight
+            if len(self._counts) > MAX_TRACKED_PHRASES:
+                self._counts = Counter(dict(self._counts.most_common(MAX_TRACKED_PHRASES // 2)))
+
+    def candidates(self, min_count: int) -> List[Tuple[str, ...]]:
+        """Phrases seen at least min_count times, best saving (uses * merged inputs) first"""
+        with self._lock:
+            items = [(phrase, count) for phrase, count in self._counts.items() if count >= min_count]
+        items.sort(key=lambda item: item[1] * (len(item[0]) - 1), reverse=True)
+        return [phrase for phrase, _ in items]
+
+
+class SegmentCache:
+    """Pre-stitched phrase segments and the greedy longest-match stitch planner"""
+
+    def __init__(self, segment_dir: Path = SEGMENT_CACHE_DIR, max_segments: int = settings.ISL_SEGMENT_CACHE_MAX_SEGMENTS):
+        self.segment_dir = Path(segment_dir)
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._segments: Dict[Tuple[str, ...], PhraseSegment] = {}
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Reload segments from disk, dropping those whose source clips changed"""
+        for entry in os.scandir(self.segment_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path) as f:
+                    segment = PhraseSegment(**json.load(f))
+                valid = os.path.exists(segment.path) and \
+                    [tuple(v) for v in segment.versions] == _source_versions(segment.sources)
+            except (OSError, ValueError):
+                valid = False
+                segment = None
+            if valid:
+                self._segments[tuple(segment.sources)] = segment
+            else:
+                self._remove_files(entry.name[:-len(".json")])
+
+    def _remove_files(self, key: str):
+        for suffix in (".mp4", ".json"):
+            try:
+                (self.segment_dir / f"{key}{suffix}").unlink()
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, sources: Tuple[str, ...]) -> bool:
+        return sources in self._segments
+
+    def plan(self, video_files: List[str]) -> List[str]:
+        """Cover the clip sequence with the fewest inputs, greedily taking the longest cached phrase"""
+        if not self._segments:
+            return list(video_files)
+
+        inputs = []
+        position = 0
+        total = len(video_files)
+        while position < total:
+            segment = None
+            for length in range(min(MAX_PHRASE_SIGNS, total - position), 1, -1):
+                segment = self._segments.get(tuple(video_files[position:position + length]))
+                if segment:
+                    break
+            if segment:
+                segment.uses += 1
+                inputs.append(segment.path)
+                position += len(segment.sources)
+            else:
+                inputs.append(video_files[position])
+                position += 1
+        return inputs
+
+    def build(self, sources: Tuple[str, ...], concat: Callable[[List[str], str], None]) -> PhraseSegment:
+        """Pre-stitch a phrase with the given concat function and register it"""
+        key = hashlib.sha256("\0".join(sources).encode()).hexdigest()
+        versions = _source_versions(list(sources))
+        output_path = self.segment_dir / f"{key}.mp4"
+        tmp_path = self.segment_dir / f"{key}.tmp.mp4"
+        concat(list(sources), str(tmp_path))
+        os.replace(tmp_path, output_path)
+
+        segment = PhraseSegment(key=key, path=str(output_path), sources=list(sources), versions=versions)
+        with open(self.segment_dir / f"{key}.json", "w") as f:
+            json.dump(segment.dict(), f)
+
+        with self._lock:
+            self._segments[tuple(sources)] = segment
+            while len(self._segments) > self.max_segments:
+                least_used = min(self._segments.values(), key=lambda s: s.uses)
+                self._drop(tuple(least_used.sources))
+        return segment
+
+    def invalidate_path(self, path: str):
+        """Drop every segment built from a clip that changed or disappeared"""
+        with self._lock:
+            for sources in [s for s in self._segments if path in s]:
+                self._drop(sources)
+
+    def _drop(self, sources: Tuple[str, ...]):
+        segment = self._segments.pop(sources)
+        self._remove_files(segment.key)
+        logger.info(f"Dropped phrase segment {segment.key[:12]} ({len(sources)} clips)")
+
+    def stats(self) -> dict:
+        return {
+            "segments": len(self._segments),
+            "max_segments": self.max_segments,
+            "segment_uses": sum(s.uses for s in self._segments.values()),
+            "segment_dir": str(self.segment_dir)
+        }
+
+
+_phrase_miner: Optional[PhraseMiner] = None
+_segment_cache: Optional[SegmentCache] = None
+
+
+def get_phrase_miner() -> PhraseMiner:
+    """Get the process-wide phrase miner"""
+    global _phrase_miner
+    if _phrase_miner is None:
+        _phrase_miner = PhraseMiner()
+    return _phrase_miner
+
+
+def get_segment_cache() -> SegmentCache:
+    """Get the process-wide phrase segment cache"""
+    global _segment_cache
+    if _segment_cache is None:
+        _segment_cache = SegmentCache()
+        get_sign_index().add_listener(_segment_cache.invalidate_path)
+    return _segment_cache
+
+
+def record_template_phrases(miner: PhraseMiner, templates: List[str], models: List[str]):
+    """Seed the miner with the literal text between placeholders of each template"""
+    index = get_sign_index()
+    for template in templates:
+        for chunk in re.split(r'\{[^}]+\}', template):
+            words = [normalize_sign(word) for word in chunk.split()]
+            for model in models:
+                if not index.model_dir(model).exists():
+                    continue
+                # Break runs at unknown words, they are skipped when stitching
+                run: List[SignClip] = []
+                for word in words:
+                    clip = index.lookup(model, word) if word else None
+                    if clip:
+                        run.append(clip)
+                        continue
+                    _record_run(miner, model, run)
+                    run = []
+                _record_run(miner, model, run)
+
+
+def _record_run(miner: PhraseMiner, model: str, run: List[SignClip]):
+    # Record the files generation will actually stitch, normalized where needed
+    if len(run) > 1:
+        miner.record(get_clip_normalizer().plan(model, run), weight=settings.ISL_SEGMENT_MIN_COUNT)
+
+
+def _contains(phrase: Tuple[str, ...], sources: Tuple[str, ...]) -> bool:
+    length = len(sources)
+    return any(phrase[i:i + length] == sources for i in range(len(phrase) - length + 1))
+
+
+def mine_segments_once(concat: Callable[[List[str], str], None], models: List[str], limit: int = 20) -> int:
+    """Build segments for the most valuable phrases not cached yet, return how many were built"""
+    from app.db.session import SessionLocal
+    from app.models.announcement_template import AnnouncementTemplate
+
+    miner = get_phrase_miner()
+    cache = get_segment_cache()
+
+    db = SessionLocal()
+    try:
+        templates = [row.english_template for row in db.query(AnnouncementTemplate.english_template).all()]
+    finally:
+        db.close()
+    template_miner = PhraseMiner()
+    record_template_phrases(template_miner, templates, models)
+
+    candidates = miner.candidates(settings.ISL_SEGMENT_MIN_COUNT)
+    candidates += template_miner.candidates(settings.ISL_SEGMENT_MIN_COUNT)
+
+    built = 0
+    chosen: List[Tuple[str, ...]] = []
+    for sources in candidates:
+        if built >= limit:
+            break
+        # Sub-phrases of a phrase picked in this pass are rarely worth a file of their own
+        if sources in cache or any(_contains(phrase, sources) for phrase in chosen):
+            continue
+        chosen.append(sources)
+        try:
+            cache.build(sources, concat)
+            built += 1
+        except Exception as e:
+            logger.warning(f"Failed to pre-stitch phrase of {len(sources)} clips: {e}")
+    if built:
+        logger.info(f"Pre-stitched {built} phrase segments")
+    return built
+
+
+async def run_segment_miner(concat: Callable[[List[str], str], None], models: List[str]):
+    """Background loop that periodically pre-stitches frequent phrases"""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, mine_segments_once, concat, models)
+        except Exception as e:
+            logger.warning(f"Phrase segment mining failed: {e}")
+        await asyncio.sleep(settings.ISL_SEGMENT_MINER_INTERVAL_SECONDS)
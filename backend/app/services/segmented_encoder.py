@@ -0,0 +1,148 @@
+import os
+import tempfile
+import subprocess
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.clip_compat import target_encoder_args, target_video_filter
+from app.services.sign_index import get_sign_index
+from app.utils.media_probe import StreamFingerprint
+from app.utils.mp4 import parse_sample_table, write_fragmented_mp4
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+SEGMENTS_WORK_DIR = PROJECT_ROOT / "backend" / "temp" / "isl-encode-segments"
+
+# Stream parameters ingest transcodes every clip to (see app/services/ingest_jobs.py)
+DEFAULT_ENCODE_TARGET = StreamFingerprint.from_key("h264|High|1280|720|yuv420p|30/1|1/15360|1:1")
+
+def model_encode_target(model: Optional[str]) -> StreamFingerprint:
+    """
+    Stream parameters re-encoded stitches of a model conform to: the canonical fingerprint
+    of its clips, DEFAULT_ENCODE_TARGET while none of them has ingest metadata
+    """
+    key = get_sign_index().canonical_fingerprint(model) if model else None
+    return StreamFingerprint.from_key(key) if key else DEFAULT_ENCODE_TARGET
+
+
+# Keyframe interval shared by every segment, so segments join on closed GOP boundaries
+GOP_SECONDS = 2
+
+
+def split_groups(video_files: List[str], count: int) -> List[List[str]]:
+    """Split a plan into at most count contiguous groups of roughly equal total size"""
+    count = max(1, min(count, len(video_files)))
+    sizes = [os.path.getsize(video_file) for video_file in video_files]
+    total = sum(sizes) or 1
+    groups: List[List[str]] = [[]]
+    encoded = 0
+    for i, (video_file, size) in enumerate(zip(video_files, sizes)):
+        groups_left = count - len(groups)
+        files_left = len(video_files) - i
+        # Close the group at its share of the bytes, or when every later group needs a file
+        if groups[-1] and groups_left > 0 and (encoded >= total * len(groups) / count or files_left <= groups_left):
+            groups.append([])
+        groups[-1].append(video_file)
+        encoded += size
+    return groups
+
+
+def gop_args(target: StreamFingerprint) -> List[str]:
+    """Fixed, closed GOPs: every segment starts on an IDR and they concat without re-encoding"""
+    gop = max(1, round(Fraction(target.r_frame_rate) * GOP_SECONDS))
+    return ["-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0", "-flags", "+cgop"]
+
+
+def create_segment_command(video_files: List[str], output_path: str, target: StreamFingerprint,
+                           threads: int = 0) -> List[str]:
+    """FFmpeg command encoding a group of clips, back to back, into one segment conforming to target"""
+    cmd = ["ffmpeg"]
+    for video_file in video_files:
+        cmd += ["-i", video_file]
+
+    video_filter = target_video_filter(target)
+    graph = ";".join(f"[{i}:v]{video_filter}[v{i}]" for i in range(len(video_files)))
+    graph += ";" + "".join(f"[v{i}]" for i in range(len(video_files)))
+    graph += f"concat=n={len(video_files)}:v=1:a=0[out]"
+
+    cmd += ["-filter_complex", graph, "-map", "[out]"]
+    cmd += target_encoder_args(target) + gop_args(target)
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd += [output_path, "-y"]
+    return cmd
+
+
+class SegmentedEncoder:
+    """
+    Re-encodes a stitch plan as independent groups of clips in parallel FFmpeg processes,
+    then joins the encoded segments by stream copy. The worker cap is shared by every
+    caller, so concurrent stitches queue for encoder slots rather than oversubscribe the box.
+    """
+
+    def __init__(self, max_workers: int = settings.ISL_ENCODE_WORKERS, work_dir: Path = SEGMENTS_WORK_DIR):
+        self.max_workers = max(1, max_workers)
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="isl-encode")
+        self._lock = threading.Lock()
+        self.encodes = 0
+        self.segments = 0
+
+    def _encode_segment(self, cmd: List[str]):
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        if result.returncode != 0:
+            raise RuntimeError(f"Segment encode failed: {result.stderr[-500:]}")
+
+    def encode(self, video_files: List[str], output_path: str,
+               target: Optional[StreamFingerprint] = None, workers: Optional[int] = None) -> float:
+        """Re-encode video_files into output_path (fragmented MP4) and return its duration"""
+        if not video_files:
+            raise ValueError("No video files to encode")
+        target = target or DEFAULT_ENCODE_TARGET
+        groups = split_groups(video_files, min(workers or self.max_workers, self.max_workers))
+        # Split the cores between the segments running side by side
+        threads = max(1, (os.cpu_count() or 1) // len(groups))
+
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as segment_dir:
+            segment_paths = [os.path.join(segment_dir, f"{i:04d}.mp4") for i in range(len(groups))]
+            futures = [
+                self._pool.submit(self._encode_segment, create_segment_command(group, segment_path, target, threads))
+                for group, segment_path in zip(groups, segment_paths)
+            ]
+            for future in futures:
+                future.result()
+
+            tables = [parse_sample_table(segment_path) for segment_path in segment_paths]
+            write_fragmented_mp4(tables, output_path)
+
+        with self._lock:
+            self.encodes += 1
+            self.segments += len(groups)
+        logger.info(f"Encoded {len(video_files)} clips as {len(groups)} parallel segments")
+        return sum(table.duration for table in tables) / tables[0].timescale
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "encodes": self.encodes,
+            "segments": self.segments
+        }
+
+
+_segmented_encoder: Optional[SegmentedEncoder] = None
+
+
+def get_segmented_encoder() -> SegmentedEncoder:
+    """Get the process-wide segmented encoder"""
+    global _segmented_encoder
+    if _segmented_encoder is None:
+        _segmented_encoder = SegmentedEncoder()
+    return _segmented_encoder
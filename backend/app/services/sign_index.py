@@ -0,0 +1,273 @@
+import hashlib
+import os
+import re
+import threading
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+ISL_VIDEOS_DIR = PROJECT_ROOT / "frontend" / "public" / "videos" / "isl-videos"
+
+# Models with a clip library ({model}-model folders)
+SUPPORTED_MODELS = ["male", "female"]
+
+# Extensions in lookup precedence order. Direct files ({sign}.ext) win over the
+# folder layout ({sign}/{sign}.ext) written by uploads and sync.
+VIDEO_EXTENSIONS = [".mp4", ".MP4", ".avi", ".mov"]
+
+
+def normalize_sign(word: str) -> str:
+    """Normalize a word or file stem to its index key"""
+    return re.sub(r'[^\w\s]', '', word.strip().lower()).strip()
+
+
+def model_relative_path(path: str, model: str) -> Optional[str]:
+    """Path below the last {model}-model folder, e.g. "train/train.mp4"; None if outside one"""
+    parts = Path(path.replace("\\", "/")).parts
+    folder = f"{model}-model"
+    if folder not in parts:
+        return None
+    start = len(parts) - parts[::-1].index(folder)
+    return "/".join(parts[start:]) or None
+
+
+class SignClip(BaseModel):
+    sign: str
+    path: str
+    file_size: int
+    mtime_ns: int
+    rank: int  # Position in the lookup precedence, lower wins
+    duration_seconds: Optional[float] = None
+    fingerprint: Optional[str] = None  # StreamFingerprint key recorded at ingest
+
+    @property
+    def version(self) -> str:
+        """Short content version for cache-busting clip URLs"""
+        return hashlib.sha1(f"{self.path}\0{self.file_size}\0{self.mtime_ns}".encode()).hexdigest()[:12]
+
+
+def load_clip_metadata(model: str) -> List[Tuple[str, Optional[float], Optional[str]]]:
+    """Load (video_path, duration_seconds, codec_fingerprint) of the active ISL videos of a model"""
+    from app.db.session import SessionLocal
+    from app.models.isl_video import ISLVideo
+
+    db = SessionLocal()
+    try:
+        rows = db.query(ISLVideo.video_path, ISLVideo.duration_seconds, ISLVideo.codec_fingerprint).filter(
+            ISLVideo.model_type == model,
+            ISLVideo.is_active == True
+        ).all()
+        return [
+            (path, float(duration) if duration is not None else None, fingerprint)
+            for path, duration, fingerprint in rows
+        ]
+    except Exception as e:
+        logger.warning(f"Could not load clip metadata for model '{model}': {e}")
+        return []
+    finally:
+        db.close()
+
+
+class SignIndex:
+    """In-memory mapping of normalized sign -> resolved clip, one table per model"""
+
+    def __init__(self, videos_dir: Path = ISL_VIDEOS_DIR,
+                 metadata_loader: Optional[Callable[[str], list]] = load_clip_metadata):
+        self.videos_dir = Path(videos_dir)
+        self.metadata_loader = metadata_loader
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, SignClip]] = {}
+        self._listeners: List[Callable[[str], None]] = []
+        self._canonical: Dict[str, Optional[str]] = {}
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Register a callback invoked with the path of every clip that changes or disappears"""
+        self._listeners.append(listener)
+
+    def _notify(self, old: Optional[SignClip], new: Optional[SignClip]):
+        if old is None or (new is not None and new.path == old.path and
+                           new.file_size == old.file_size and new.mtime_ns == old.mtime_ns):
+            return
+        for listener in self._listeners:
+            try:
+                listener(old.path)
+            except Exception as e:
+                logger.warning(f"Sign index listener failed for {old.path}: {e}")
+
+    def model_dir(self, model: str) -> Path:
+        return self.videos_dir / f"{model}-model"
+
+    def build(self, model: Optional[str] = None) -> int:
+        """(Re)build the index for one model, or every model folder on disk"""
+        if model is None:
+            models = []
+            if self.videos_dir.exists():
+                models = [
+                    entry.name[:-len("-model")]
+                    for entry in os.scandir(self.videos_dir)
+                    if entry.is_dir() and entry.name.endswith("-model")
+                ]
+        else:
+            models = [model]
+
+        total = 0
+        for name in models:
+            table = self._scan_model(self.model_dir(name))
+            self._attach_metadata(name, table)
+            with self._lock:
+                previous = self._models.get(name, {})
+                self._models[name] = table
+                self._canonical.pop(name, None)
+            for sign, clip in previous.items():
+                self._notify(clip, table.get(sign))
+            total += len(table)
+            logger.info(f"Indexed {len(table)} signs for model '{name}'")
+        return total
+
+    def _scan_model(self, model_dir: Path) -> Dict[str, SignClip]:
+        """Walk a model folder once and keep the best candidate per sign"""
+        table: Dict[str, SignClip] = {}
+        if not model_dir.exists():
+            return table
+
+        for entry in os.scandir(model_dir):
+            if entry.is_file():
+                clip = self._make_clip(entry.name, entry.path, 0)
+                if clip:
+                    self._keep_best(table, clip)
+            elif entry.is_dir():
+                for child in os.scandir(entry.path):
+                    stem, ext = os.path.splitext(child.name)
+                    if stem != entry.name or not child.is_file():
+                        continue
+                    clip = self._make_clip(child.name, child.path, len(VIDEO_EXTENSIONS))
+                    if clip:
+                        self._keep_best(table, clip)
+        return table
+
+    def _attach_metadata(self, model: str, table: Dict[str, SignClip]):
+        """
+        Copy metadata recorded at ingest onto the clips, matched by path relative to the
+        model folder (recorded paths may have a different root). Unmatched clips keep None.
+        """
+        if not self.metadata_loader or not table:
+            return
+        by_path = {}
+        for path, duration, fingerprint in self.metadata_loader(model):
+            key = model_relative_path(path, model)
+            if key:
+                by_path[key] = (duration, fingerprint)
+        for clip in table.values():
+            clip.duration_seconds, clip.fingerprint = by_path.get(
+                model_relative_path(clip.path, model), (None, None))
+
+    @staticmethod
+    def _make_clip(name: str, path: str, rank_offset: int) -> Optional[SignClip]:
+        stem, ext = os.path.splitext(name)
+        if ext not in VIDEO_EXTENSIONS:
+            return None
+        sign = normalize_sign(stem)
+        if not sign:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return SignClip(
+            sign=sign,
+            path=path,
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            rank=rank_offset + VIDEO_EXTENSIONS.index(ext)
+        )
+
+    @staticmethod
+    def _keep_best(table: Dict[str, SignClip], clip: SignClip):
+        current = table.get(clip.sign)
+        if current is None or clip.rank < current.rank:
+            table[clip.sign] = clip
+
+    def _table(self, model: str) -> Dict[str, SignClip]:
+        table = self._models.get(model)
+        if table is None:
+            self.build(model)
+            table = self._models[model]
+        return table
+
+    def lookup(self, model: str, sign: str) -> Optional[SignClip]:
+        """O(1) lookup of the clip for a single sign"""
+        return self._table(model).get(normalize_sign(sign))
+
+    def resolve(self, signs: List[str], model: str) -> Tuple[List[SignClip], List[str]]:
+        """Resolve signs to clips, return (found_clips, missing_signs)"""
+        if not self.model_dir(model).exists():
+            raise FileNotFoundError(f"Model directory not found: {self.model_dir(model)}")
+
+        table = self._table(model)
+        found = []
+        missing = []
+        for sign in signs:
+            clip = table.get(normalize_sign(sign))
+            if clip:
+                found.append(clip)
+            else:
+                missing.append(sign)
+        return found, missing
+
+    def refresh_sign(self, model: str, sign: str, duration_seconds: Optional[float] = None,
+                     fingerprint: Optional[str] = None) -> Optional[SignClip]:
+        """Re-probe the candidate paths of a single sign after an upload, transcode or delete"""
+        key = normalize_sign(sign)
+        model_dir = self.model_dir(model)
+        best = None
+        for rank_offset, folder in [(0, model_dir), (len(VIDEO_EXTENSIONS), model_dir / sign)]:
+            for ext in VIDEO_EXTENSIONS:
+                candidate = folder / f"{sign}{ext}"
+                if candidate.is_file():
+                    best = self._make_clip(candidate.name, str(candidate), rank_offset)
+                    break
+            if best:
+                break
+        if best:
+            best.duration_seconds = duration_seconds
+            best.fingerprint = fingerprint
+
+        table = self._table(model)
+        with self._lock:
+            previous = table.get(key)
+            if best:
+                table[key] = best
+            else:
+                table.pop(key, None)
+            self._canonical.pop(model, None)
+        self._notify(previous, best)
+        return best
+
+    def canonical_fingerprint(self, model: str) -> Optional[str]:
+        """The most common stream fingerprint of a model's clips, the stitching target"""
+        if model not in self._canonical:
+            counts: Dict[str, int] = {}
+            for clip in list(self._table(model).values()):
+                if clip.fingerprint:
+                    counts[clip.fingerprint] = counts.get(clip.fingerprint, 0) + 1
+            self._canonical[model] = max(counts, key=counts.get) if counts else None
+        return self._canonical[model]
+
+    def stats(self) -> dict:
+        return {model: len(table) for model, table in self._models.items()}
+
+
+_sign_index: Optional[SignIndex] = None
+
+
+def get_sign_index() -> SignIndex:
+    """Get the process-wide sign index"""
+    global _sign_index
+    if _sign_index is None:
+        _sign_index = SignIndex()
+    return _sign_index
@@ -0,0 +1,178 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.sign_index import SignClip, get_sign_index
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+STITCH_CACHE_DIR = PROJECT_ROOT / "backend" / "temp" / "isl-video-cache"
+
+
+def stitch_cache_key(model: str, clips: List[SignClip]) -> str:
+    """
+    Content address of a stitched output: model + resolved clips + clip versions, and the
+    model's canonical fingerprint, which decides what incompatible clips are normalized to
+    """
+    digest = hashlib.sha256(model.encode())
+    digest.update(f"\0{get_sign_index().canonical_fingerprint(model) or ''}".encode())
+    for clip in clips:
+        digest.update(f"\0{clip.path}\0{clip.file_size}\0{clip.mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def link_or_copy(source: str, destination: str):
+    """Hard link a file into place, copying when the link is not possible"""
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+class StitchCacheEntry(BaseModel):
+    key: str
+    path: str
+    size: int
+    duration: float = 0.0
+
+
+class StitchCache:
+    """Size-bounded LRU cache of stitched ISL videos, persisted on disk"""
+
+    def __init__(self, cache_dir: Path = STITCH_CACHE_DIR, max_bytes: int = settings.ISL_STITCH_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, StitchCacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Rebuild the LRU order from the artifacts left by a previous run"""
+        artifacts = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".mp4"):
+                continue
+            key = entry.name[:-len(".mp4")]
+            stat = entry.stat()
+            duration = 0.0
+            try:
+                with open(self._meta_path(key)) as f:
+                    duration = json.load(f).get("duration", 0.0)
+            except (OSError, ValueError):
+                pass
+            artifacts.append((stat.st_mtime, StitchCacheEntry(
+                key=key, path=entry.path, size=stat.st_size, duration=duration
+            )))
+
+        for _, cache_entry in sorted(artifacts, key=lambda item: item[0]):
+            self._entries[cache_entry.key] = cache_entry
+            self.total_bytes += cache_entry.size
+        self._evict()
+
+    def _artifact_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[StitchCacheEntry]:
+        """Look up a stitched output, counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not os.path.exists(entry.path):
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Persist recency so LRU order survives restarts
+        try:
+            os.utime(entry.path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, source_path: str, duration: float) -> StitchCacheEntry:
+        """Add a freshly stitched file to the cache (the source file is kept)"""
+        artifact = self._artifact_path(key)
+        tmp_artifact = self.cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        link_or_copy(source_path, str(tmp_artifact))
+        os.replace(tmp_artifact, artifact)
+        with open(self._meta_path(key), "w") as f:
+            json.dump({"duration": duration}, f)
+
+        entry = StitchCacheEntry(
+            key=key, path=str(artifact), size=os.path.getsize(artifact), duration=duration
+        )
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries[key].size
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.total_bytes += entry.size
+            self._evict(keep=key)
+        return entry
+
+    def materialize(self, entry: StitchCacheEntry, destination: str):
+        """Place a cached artifact at a preview location without copying bytes"""
+        link_or_copy(entry.path, destination)
+
+    def _evict(self, keep: Optional[str] = None):
+        while self.total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+        for path in (self._artifact_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        logger.info(f"Evicted stitched video {key} from cache")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "cache_dir": str(self.cache_dir)
+        }
+
+
+_stitch_cache: Optional[StitchCache] = None
+
+
+def get_stitch_cache() -> StitchCache:
+    """Get the process-wide stitched video cache"""
+    global _stitch_cache
+    if _stitch_cache is None:
+        _stitch_cache = StitchCache()
+    return _stitch_cache
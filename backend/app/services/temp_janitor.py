@@ -0,0 +1,204 @@
+import os
+import time
+import asyncio
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Directory paths
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+TEMP_DIR = PROJECT_ROOT / "backend" / "temp"
+
+
+class TempDirectoryPolicy(BaseModel):
+    name: str
+    directory: str
+    ttl_seconds: int
+
+
+class TempFile(BaseModel):
+    path: str
+    size: int
+    last_used: float
+
+
+class TempDirectoryStats(BaseModel):
+    name: str
+    directory: str
+    ttl_seconds: int
+    files: int = 0
+    bytes: int = 0
+    oldest_seconds: Optional[float] = None
+
+
+def default_policies() -> List[TempDirectoryPolicy]:
+    """
+    Temp directories owned by request flows. isl-video-cache, isl-segments and isl-normalized
+    are not swept here: the stitch, segment and clip normalizer caches each evict by their
+    own quota and keep an in-memory index of their files.
+    """
+    return [
+        TempDirectoryPolicy(name="isl-videos", directory=str(TEMP_DIR / "isl-videos"),
+                            ttl_seconds=settings.TEMP_VIDEO_TTL_SECONDS),
+        TempDirectoryPolicy(name="audio", directory=str(TEMP_DIR / "audio"),
+                            ttl_seconds=settings.TEMP_AUDIO_TTL_SECONDS),
+        TempDirectoryPolicy(name="speech-to-isl", directory=str(TEMP_DIR / "speech-to-isl"),
+                            ttl_seconds=settings.TEMP_AUDIO_TTL_SECONDS),
+    ]
+
+
+def last_used(stat: os.stat_result) -> float:
+    # touch() records reads in atime; writes show up in mtime
+    return max(stat.st_atime, stat.st_mtime)
+
+
+class TempJanitor:
+    """Sweeps temp artifacts by per-directory TTL, then evicts least recently used files over a byte quota"""
+
+    def __init__(self, policies: Optional[List[TempDirectoryPolicy]] = None,
+                 max_bytes: int = settings.TEMP_MAX_BYTES,
+                 min_age_seconds: int = settings.TEMP_JANITOR_MIN_AGE_SECONDS):
+        self.policies = policies if policies is not None else default_policies()
+        self.max_bytes = max_bytes
+        # Files younger than this are never evicted for quota, they may still be in use
+        self.min_age_seconds = min_age_seconds
+        self._lock = threading.Lock()
+        self.sweeps = 0
+        self.expired = 0
+        self.evicted = 0
+        self.bytes_reclaimed = 0
+        self.last_sweep_at: Optional[datetime] = None
+        self.last_sweep_seconds: Optional[float] = None
+        self._last_stats: List[TempDirectoryStats] = []
+
+    def touch(self, path) -> None:
+        """Mark an artifact as just used so it survives TTL and LRU eviction"""
+        try:
+            stat = os.stat(path)
+            os.utime(path, (time.time(), stat.st_mtime))
+        except OSError as e:
+            logger.debug(f"Could not touch temp artifact {path}: {e}")
+
+    def _scan(self, policy: TempDirectoryPolicy) -> List[TempFile]:
+        files = []
+        try:
+            entries = list(os.scandir(policy.directory))
+        except FileNotFoundError:
+            return files
+        for entry in entries:
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            files.append(TempFile(path=entry.path, size=stat.st_size, last_used=last_used(stat)))
+        return files
+
+    def _remove(self, temp_file: TempFile) -> bool:
+        try:
+            os.remove(temp_file.path)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Failed to remove temp artifact {temp_file.path}: {e}")
+            return False
+        self.bytes_reclaimed += temp_file.size
+        return True
+
+    def sweep(self) -> dict:
+        """Run one TTL + quota pass, return what was removed"""
+        with self._lock:
+            started = time.perf_counter()
+            now = time.time()
+            expired = 0
+            evicted = 0
+            remaining: List[Tuple[TempDirectoryStats, TempFile]] = []
+            directory_stats: Dict[str, TempDirectoryStats] = {}
+
+            for policy in self.policies:
+                stats = TempDirectoryStats(name=policy.name, directory=policy.directory,
+                                           ttl_seconds=policy.ttl_seconds)
+                directory_stats[policy.name] = stats
+                for temp_file in self._scan(policy):
+                    if now - temp_file.last_used > policy.ttl_seconds:
+                        if self._remove(temp_file):
+                            expired += 1
+                        continue
+                    remaining.append((stats, temp_file))
+                    stats.files += 1
+                    stats.bytes += temp_file.size
+
+            total_bytes = sum(temp_file.size for _, temp_file in remaining)
+            if total_bytes > self.max_bytes:
+                remaining.sort(key=lambda item: item[1].last_used)
+                kept = []
+                for stats, temp_file in remaining:
+                    if total_bytes > self.max_bytes and now - temp_file.last_used > self.min_age_seconds:
+                        if self._remove(temp_file):
+                            evicted += 1
+                            total_bytes -= temp_file.size
+                            stats.files -= 1
+                            stats.bytes -= temp_file.size
+                            continue
+                    kept.append((stats, temp_file))
+                remaining = kept
+
+            for stats, temp_file in remaining:
+                age = now - temp_file.last_used
+                if stats.oldest_seconds is None or age > stats.oldest_seconds:
+                    stats.oldest_seconds = age
+
+            self.sweeps += 1
+            self.expired += expired
+            self.evicted += evicted
+            self.last_sweep_at = datetime.now()
+            self.last_sweep_seconds = time.perf_counter() - started
+            self._last_stats = list(directory_stats.values())
+
+        if expired or evicted:
+            logger.info(f"Temp janitor removed {expired} expired and {evicted} over-quota artifacts")
+        return {"expired": expired, "evicted": evicted, "total_bytes": total_bytes}
+
+    def stats(self) -> dict:
+        return {
+            "max_bytes": self.max_bytes,
+            "total_bytes": sum(stats.bytes for stats in self._last_stats),
+            "directories": [stats.dict() for stats in self._last_stats],
+            "sweeps": self.sweeps,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "last_sweep_at": self.last_sweep_at,
+            "last_sweep_seconds": self.last_sweep_seconds
+        }
+
+
+_temp_janitor: Optional[TempJanitor] = None
+
+
+def get_temp_janitor() -> TempJanitor:
+    """Get the process-wide temp artifact janitor"""
+    global _temp_janitor
+    if _temp_janitor is None:
+        _temp_janitor = TempJanitor()
+    return _temp_janitor
+
+
+async def run_temp_janitor():
+    """Background loop sweeping temp artifacts every TEMP_JANITOR_INTERVAL_SECONDS"""
+    loop = asyncio.get_running_loop()
+    janitor = get_temp_janitor()
+    while True:
+        try:
+            await loop.run_in_executor(None, janitor.sweep)
+        except Exception as e:
+            logger.warning(f"Temp janitor sweep failed: {e}")
+        await asyncio.sleep(settings.TEMP_JANITOR_INTERVAL_SECONDS)
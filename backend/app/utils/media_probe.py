@@ -0,0 +1,158 @@
+import json
+import subprocess
+import logging
+from typing import Optional
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class StreamFingerprint(BaseModel):
+    """Video stream parameters that must match for stream-copy concatenation"""
+    codec_name: str
+    profile: str
+    width: int
+    height: int
+    pix_fmt: str
+    r_frame_rate: str
+    time_base: str
+    sample_aspect_ratio: str
+
+    @property
+    def key(self) -> str:
+        return "|".join([
+            self.codec_name, self.profile, str(self.width), str(self.height),
+            self.pix_fmt, self.r_frame_rate, self.time_base, self.sample_aspect_ratio
+        ])
+
+    @classmethod
+    def from_key(cls, key: str) -> "StreamFingerprint":
+        codec_name, profile, width, height, pix_fmt, r_frame_rate, time_base, sar = key.split("|")
+        return cls(
+            codec_name=codec_name, profile=profile, width=int(width), height=int(height),
+            pix_fmt=pix_fmt, r_frame_rate=r_frame_rate, time_base=time_base, sample_aspect_ratio=sar
+        )
+
+
+# profile_idc and constraint flags of the H.264 profiles ffprobe reports
+H264_PROFILES = {
+    "Baseline": (0x42, 0x00),
+    "Constrained Baseline": (0x42, 0x40),
+    "Main": (0x4D, 0x00),
+    "Extended": (0x58, 0x00),
+    "High": (0x64, 0x00),
+    "High 10": (0x6E, 0x00),
+    "High 4:2:2": (0x7A, 0x00),
+    "High 4:4:4 Predictive": (0xF4, 0x00),
+}
+# general_profile_idc and compatibility flags (hex, bit-reversed) of the common HEVC profiles
+HEVC_PROFILES = {"Main": (1, "6"), "Main 10": (2, "4")}
+
+
+def rfc6381_codec(codec_name: Optional[str], profile: Optional[str], level: Optional[int]) -> Optional[str]:
+    """
+    The RFC 6381 codecs parameter of a video stream, e.g. avc1.64001f for H.264 High 3.1,
+    or None when the codec or profile has no known mapping.
+    """
+    if codec_name == "h264" and profile in H264_PROFILES and level and level > 0:
+        profile_idc, constraints = H264_PROFILES[profile]
+        return f"avc1.{profile_idc:02x}{constraints:02x}{level:02x}"
+    if codec_name == "hevc" and profile in HEVC_PROFILES and level and level > 0:
+        profile_idc, compatibility = HEVC_PROFILES[profile]
+        return f"hvc1.{profile_idc}.{compatibility}.L{level}.B0"
+    return None
+
+
+def _fraction(value: Optional[str]) -> Optional[float]:
+    try:
+        numerator, _, denominator = (value or "").partition("/")
+        return float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ClipMetadata(BaseModel):
+    """Everything stitching, proxies and compatibility checks need to know about a clip"""
+    fingerprint: StreamFingerprint
+    duration_seconds: Optional[float] = None
+    fps: Optional[float] = None
+    codec_level: Optional[int] = None
+    codec_string: Optional[str] = None  # RFC 6381, e.g. avc1.64001f
+    bit_rate: Optional[int] = None
+    frame_count: Optional[int] = None
+    has_audio: bool = False
+    format_name: Optional[str] = None
+
+    @property
+    def content_type(self) -> str:
+        """MIME type with the codecs parameter, as browsers' canPlayType/MSE expect it"""
+        mime_type = "video/webm" if self.format_name and "webm" in self.format_name else "video/mp4"
+        return f'{mime_type}; codecs="{self.codec_string}"' if self.codec_string else mime_type
+
+
+def probe_clip_metadata(video_path: str) -> Optional[ClipMetadata]:
+    """Read the container and every stream property of a clip with a single ffprobe call"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries",
+        "format=duration,bit_rate,format_name:"
+        "stream=codec_type,codec_name,profile,level,width,height,pix_fmt,r_frame_rate,"
+        "avg_frame_rate,time_base,sample_aspect_ratio,nb_frames,bit_rate",
+        "-of", "json", video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            logger.warning(f"Could not probe {video_path}: {result.stderr}")
+            return None
+        data = json.loads(result.stdout)
+    except Exception as e:
+        logger.warning(f"Error probing {video_path}: {e}")
+        return None
+
+    streams = data.get("streams", [])
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), None)
+    if video is None:
+        return None
+    container = data.get("format", {})
+    duration = _fraction(container.get("duration"))
+    level = _int(video.get("level"))
+    return ClipMetadata(
+        fingerprint=StreamFingerprint(
+            codec_name=video.get("codec_name", "unknown"),
+            profile=video.get("profile", "unknown"),
+            width=video.get("width", 0),
+            height=video.get("height", 0),
+            pix_fmt=video.get("pix_fmt", "unknown"),
+            r_frame_rate=video.get("r_frame_rate", "0/0"),
+            time_base=video.get("time_base", "0/0"),
+            sample_aspect_ratio=video.get("sample_aspect_ratio", "1:1")
+        ),
+        duration_seconds=duration if duration and duration > 0 else None,
+        fps=_fraction(video.get("avg_frame_rate")) or _fraction(video.get("r_frame_rate")),
+        codec_level=level,
+        codec_string=rfc6381_codec(video.get("codec_name"), video.get("profile"), level),
+        bit_rate=_int(video.get("bit_rate")) or _int(container.get("bit_rate")),
+        frame_count=_int(video.get("nb_frames")),
+        has_audio=any(stream.get("codec_type") == "audio" for stream in streams),
+        format_name=container.get("format_name")
+    )
+
+
+def probe_stream_fingerprint(video_path: str) -> Optional[StreamFingerprint]:
+    """Read the first video stream's parameters"""
+    metadata = probe_clip_metadata(video_path)
+    return metadata.fingerprint if metadata else None
+
+
+def probe_duration(video_path: str) -> float:
+    """Container duration in seconds, 0.0 when it cannot be read"""
+    metadata = probe_clip_metadata(video_path)
+    return (metadata.duration_seconds or 0.0) if metadata else 0.0
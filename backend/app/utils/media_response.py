@@ -0,0 +1,168 @@
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Fixed read size for response bodies (a browser seek fetches only what it needs)
+MEDIA_CHUNK_SIZE = 256 * 1024
+
+
+def media_etag(stat_result: os.stat_result) -> str:
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range Range header into an inclusive (start, end).
+    Returns None for headers that should be ignored (malformed or multiple ranges),
+    raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    if not (first.isdigit() or first == "") or not (last.isdigit() or last == "") or first == last == "":
+        return None
+    if first == "":
+        # Suffix range: the last N bytes
+        suffix_length = int(last)
+        if suffix_length == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - suffix_length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class MediaFileResponse(Response):
+    """
+    File response for media: single byte ranges (206/416), ETag and Last-Modified,
+    conditional GET (304) and fixed-size chunks, or the server's pathsend extension
+    for whole files. A drop-in for FileResponse on preview, library and saved videos.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        media_type: str = "video/mp4",
+        headers: Optional[Mapping[str, str]] = None,
+        filename: Optional[str] = None,
+        content_disposition_type: str = "inline",
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.path = str(path)
+        self.status_code = 200
+        self.media_type = media_type
+        self.background = background
+        self.init_headers(headers)
+        self.headers.setdefault("accept-ranges", "bytes")
+        if filename is not None:
+            self.headers.setdefault(
+                "content-disposition", f"{content_disposition_type}; filename*=utf-8''{quote(filename)}"
+            )
+
+    def _not_modified(self, request_headers: Mapping[str, str], etag: str, mtime: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _range_applies(self, request_headers: Mapping[str, str], etag: str, last_modified: str) -> bool:
+        # If-Range: only honour the range when the client's copy is still current
+        if_range = request_headers.get("if-range")
+        return if_range is None or if_range == etag or if_range == last_modified
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        method = scope.get("method", "GET").upper()
+        request_headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope.get("headers", [])
+        }
+
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            await self._send_status(send, 404, b"File not found")
+            return
+        if not stat.S_ISREG(stat_result.st_mode):
+            await self._send_status(send, 404, b"File not found")
+            return
+
+        size = stat_result.st_size
+        # Callers may pin their own validator (e.g. a clip version)
+        etag = self.headers.setdefault("etag", media_etag(stat_result))
+        last_modified = self.headers.setdefault("last-modified", formatdate(stat_result.st_mtime, usegmt=True))
+
+        if self._not_modified(request_headers, etag, stat_result.st_mtime):
+            # 304 carries the validators but no body headers
+            for header in ("content-type", "content-length", "content-disposition"):
+                if header in self.headers:
+                    del self.headers[header]
+            self.status_code = 304
+            await send({"type": "http.response.start", "status": 304, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        start, end = 0, size - 1
+        range_header = request_headers.get("range")
+        if range_header and size > 0 and self._range_applies(request_headers, etag, last_modified):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except ValueError:
+                self.headers["content-range"] = f"bytes */{size}"
+                await self._send_status(send, 416, b"Range not satisfiable")
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                self.status_code = 206
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        length = max(0, end - start + 1)
+        self.headers["content-length"] = str(length)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if method == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+        elif self.status_code == 200 and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": self.path})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = await file.read(min(MEDIA_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    # File shrank underneath us; end the body rather than hang the client
+                    await send({"type": "http.response.body", "body": b""})
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_status(self, send: Send, status_code: int, body: bytes) -> None:
+        self.status_code = status_code
+        for header in ("content-disposition", "etag", "last-modified"):
+            if header in self.headers:
+                del self.headers[header]
+        self.headers["content-type"] = "text/plain; charset=utf-8"
+        self.headers["content-length"] = str(len(body))
+        await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+        await send({"type": "http.response.body", "body": body})
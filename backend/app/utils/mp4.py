@@ -0,0 +1,529 @@
+"""
+Minimal ISO BMFF (MP4) support for stitching single-track video clips without FFmpeg.
+
+Clips are parsed once into a SampleTable (sample sizes, file offsets, durations,
+composition offsets and sync flags). Stitching writes a fragmented MP4: one
+init segment listing the distinct sample descriptions of the clips, then one
+moof/mdat fragment per clip, selecting its description and carrying a payload
+copied straight from the clip file.
+"""
+import os
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# trun sample flags (ISO/IEC 14496-12 8.8.3.1)
+SYNC_SAMPLE_FLAGS = 0x02000000
+NON_SYNC_SAMPLE_FLAGS = 0x01010000
+
+UNITY_MATRIX = struct.pack(">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+# SampleEntry (8 bytes) plus VisualSampleEntry fields (70 bytes), child boxes follow
+VISUAL_SAMPLE_ENTRY_SIZE = 78
+
+# A copy from a clip file: (path, offset, length)
+FileRange = Tuple[str, int, int]
+
+
+class Mp4Error(Exception):
+    """Raised when a file cannot be parsed or stitched by the in-process muxer"""
+    pass
+
+
+def iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, payload_start, box_end) for the boxes in data[start:end]"""
+    end = len(data) if end is None else end
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            raise Mp4Error(f"Truncated {box_type!r} box")
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def find_box(data: bytes, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found_type, payload_start, box_end in iter_boxes(data, start, end):
+        if found_type == box_type:
+            return payload_start, box_end
+    return None
+
+
+def read_moov(path: str) -> bytes:
+    """Read the moov box of a file, wherever it sits among the top-level boxes"""
+    with open(path, "rb") as f:
+        file_size = os.fstat(f.fileno()).st_size
+        offset = 0
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            header = f.read(16)
+            size, box_type = struct.unpack_from(">I4s", header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack_from(">Q", header, 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = file_size - offset
+            if size < header_size:
+                raise Mp4Error(f"Invalid {box_type!r} box in {path}")
+            if box_type == b"moov":
+                f.seek(offset)
+                return f.read(size)
+            if box_type == b"moof":
+                raise Mp4Error(f"Fragmented input is not supported: {path}")
+            offset += size
+    raise Mp4Error(f"No moov box in {path}")
+
+
+class SampleTable:
+    """Parsed sample layout of the video track of one MP4 clip"""
+
+    __slots__ = (
+        "path", "file_size", "mtime_ns", "timescale", "sample_entry", "codec", "width", "height", "tkhd_tail",
+        "media_time", "durations", "sizes", "composition_offsets", "sync_samples",
+        "data_ranges", "duration", "data_size", "_trun_samples"
+    )
+
+    def __init__(self, path: str, file_size: int, mtime_ns: int):
+        self.path = path
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+        self.timescale = 0
+        self.sample_entry = b""
+        self.codec = b""
+        self.width = 0
+        self.height = 0
+        self.tkhd_tail = b""
+        self.media_time = 0
+        self.durations = array("I")
+        self.sizes = array("I")
+        self.composition_offsets = array("i")
+        self.sync_samples: Optional[bytearray] = None
+        self.data_ranges: List[Tuple[int, int]] = []
+        self.duration = 0
+        self.data_size = 0
+        self._trun_samples: Optional[bytes] = None
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.sizes)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.duration / self.timescale if self.timescale else 0.0
+
+    @property
+    def trun_samples(self) -> bytes:
+        """Per-sample trun entries (duration, size, flags, composition offset), built once"""
+        if self._trun_samples is None:
+            sync = self.sync_samples
+            # Signed offsets shift the clip by its edit list so presentation starts at its decode start
+            shift = self.media_time
+            samples = array("i")
+            for i in range(self.sample_count):
+                flags = SYNC_SAMPLE_FLAGS if sync is None or sync[i] else NON_SYNC_SAMPLE_FLAGS
+                samples.extend((self.durations[i], self.sizes[i], flags, self.composition_offsets[i] - shift))
+            samples.byteswap()
+            self._trun_samples = samples.tobytes()
+        return self._trun_samples
+
+    def compatible_with(self, other: "SampleTable") -> bool:
+        """Whether both clips can be fragments of one track (their decoder configs may differ)"""
+        return (self.timescale, self.codec, self.width, self.height) == \
+            (other.timescale, other.codec, other.width, other.height)
+
+
+def parse_sample_table(path: str) -> SampleTable:
+    """Parse the single video track of a non-fragmented MP4 file"""
+    stat = os.stat(path)
+    moov = read_moov(path)
+    table = SampleTable(path, stat.st_size, stat.st_mtime_ns)
+
+    video_trak = None
+    for box_type, start, end in iter_boxes(moov, 8):
+        if box_type != b"trak":
+            continue
+        if video_trak is not None:
+            raise Mp4Error(f"More than one track in {path}")
+        video_trak = (start, end)
+    if video_trak is None:
+        raise Mp4Error(f"No track in {path}")
+    trak_start, trak_end = video_trak
+
+    mdia = find_box(moov, trak_start, trak_end, b"mdia")
+    if mdia is None:
+        raise Mp4Error(f"No mdia box in {path}")
+    hdlr = find_box(moov, mdia[0], mdia[1], b"hdlr")
+    if hdlr is None or moov[hdlr[0] + 8:hdlr[0] + 12] != b"vide":
+        raise Mp4Error(f"Track in {path} is not video")
+
+    tkhd = find_box(moov, trak_start, trak_end, b"tkhd")
+    if tkhd is None:
+        raise Mp4Error(f"No tkhd box in {path}")
+    # Layer, volume, matrix and dimensions follow the version-dependent times and duration
+    tail_start = tkhd[0] + (36 if moov[tkhd[0]] == 1 else 24)
+    table.tkhd_tail = moov[tail_start:tkhd[1]]
+
+    mdhd = find_box(moov, mdia[0], mdia[1], b"mdhd")
+    if mdhd is None:
+        raise Mp4Error(f"No mdhd box in {path}")
+    timescale_offset = mdhd[0] + (20 if moov[mdhd[0]] == 1 else 12)
+    table.timescale = struct.unpack_from(">I", moov, timescale_offset)[0]
+
+    table.media_time = _parse_media_time(moov, trak_start, trak_end)
+
+    minf = find_box(moov, mdia[0], mdia[1], b"minf")
+    stbl = find_box(moov, minf[0], minf[1], b"stbl") if minf else None
+    if stbl is None:
+        raise Mp4Error(f"No sample table in {path}")
+    boxes = {box_type: (start, end) for box_type, start, end in iter_boxes(moov, stbl[0], stbl[1])}
+    for required in (b"stsd", b"stts", b"stsc", b"stsz"):
+        if required not in boxes:
+            raise Mp4Error(f"No {required.decode()} box in {path}")
+
+    stsd_start, stsd_end = boxes[b"stsd"]
+    if struct.unpack_from(">I", moov, stsd_start + 4)[0] != 1:
+        raise Mp4Error(f"Multiple sample descriptions in {path}")
+    _parse_sample_entry(table, moov, stsd_start + 8, stsd_end)
+
+    _parse_sizes(table, moov, *boxes[b"stsz"])
+    count = table.sample_count
+    _parse_durations(table, moov, *boxes[b"stts"])
+    if len(table.durations) != count:
+        raise Mp4Error(f"stts and stsz disagree in {path}")
+    if b"ctts" in boxes:
+        _parse_composition_offsets(table, moov, *boxes[b"ctts"])
+        if len(table.composition_offsets) != count:
+            raise Mp4Error(f"ctts and stsz disagree in {path}")
+    else:
+        table.composition_offsets = array("i", bytes(4 * count))
+    if b"stss" in boxes:
+        table.sync_samples = _parse_sync_samples(moov, *boxes[b"stss"], count)
+
+    if b"stco" in boxes:
+        chunk_offsets = _parse_chunk_offsets(moov, *boxes[b"stco"], wide=False)
+    elif b"co64" in boxes:
+        chunk_offsets = _parse_chunk_offsets(moov, *boxes[b"co64"], wide=True)
+    else:
+        raise Mp4Error(f"No chunk offsets in {path}")
+    _build_data_ranges(table, moov, *boxes[b"stsc"], chunk_offsets)
+
+    table.duration = sum(table.durations)
+    table.data_size = sum(table.sizes)
+    if any(offset + length > table.file_size for offset, length in table.data_ranges):
+        raise Mp4Error(f"Sample data outside of {path}")
+    return table
+
+
+def _parse_sample_entry(table: SampleTable, data: bytes, start: int, end: int):
+    entries = list(iter_boxes(data, start, end))
+    codec, entry_start, entry_end = entries[0]
+    if entry_end - entry_start < VISUAL_SAMPLE_ENTRY_SIZE:
+        raise Mp4Error(f"Invalid {codec!r} sample entry")
+    table.codec = codec
+    table.width, table.height = struct.unpack_from(">HH", data, entry_start + 24)
+    # btrt only records the clip's own bitrate; dropping it lets identical configs share an entry
+    children = [
+        data[payload_start - 8:box_end]
+        for box_type, payload_start, box_end in iter_boxes(data, entry_start + VISUAL_SAMPLE_ENTRY_SIZE, entry_end)
+        if box_type != b"btrt"
+    ]
+    table.sample_entry = _box(codec, data[entry_start:entry_start + VISUAL_SAMPLE_ENTRY_SIZE], *children)
+
+
+def _parse_media_time(moov: bytes, trak_start: int, trak_end: int) -> int:
+    edts = find_box(moov, trak_start, trak_end, b"edts")
+    elst = find_box(moov, edts[0], edts[1], b"elst") if edts else None
+    if elst is None:
+        return 0
+    version = moov[elst[0]]
+    entry_count = struct.unpack_from(">I", moov, elst[0] + 4)[0]
+    offset = elst[0] + 8
+    for _ in range(entry_count):
+        if version == 1:
+            _, media_time = struct.unpack_from(">Qq", moov, offset)
+            offset += 20
+        else:
+            _, media_time = struct.unpack_from(">Ii", moov, offset)
+            offset += 12
+        # Skip empty edits, the first real edit says where presentation starts
+        if media_time >= 0:
+            return media_time
+    return 0
+
+
+def _parse_sizes(table: SampleTable, data: bytes, start: int, end: int):
+    sample_size, count = struct.unpack_from(">II", data, start + 4)
+    if sample_size:
+        table.sizes = array("I", [sample_size]) * count
+        return
+    sizes = array("I", data[start + 12:start + 12 + 4 * count])
+    if len(sizes) != count:
+        raise Mp4Error("Truncated stsz box")
+    sizes.byteswap()
+    table.sizes = sizes
+
+
+def _parse_durations(table: SampleTable, data: bytes, start: int, end: int):
+    entry_count = struct.unpack_from(">I", data, start + 4)[0]
+    durations = array("I")
+    for sample_count, delta in struct.iter_unpack(">II", data[start + 8:start + 8 + 8 * entry_count]):
+        durations.extend(array("I", [delta]) * sample_count)
+    table.durations = durations
+
+
+def _parse_composition_offsets(table: SampleTable, data: bytes, start: int, end: int):
+    version = data[start]
+    entry_count = struct.unpack_from(">I", data, start + 4)[0]
+    # Version 0 offsets are unsigned but encoders write small values only
+    entry_format = ">Ii" if version == 1 else ">II"
+    offsets = array("i")
+    for sample_count, offset in struct.iter_unpack(entry_format, data[start + 8:start + 8 + 8 * entry_count]):
+        offsets.extend(array("i", [offset]) * sample_count)
+    table.composition_offsets = offsets
+
+
+def _parse_sync_samples(data: bytes, start: int, end: int, count: int) -> bytearray:
+    entry_count = struct.unpack_from(">I", data, start + 4)[0]
+    numbers = array("I", data[start + 8:start + 8 + 4 * entry_count])
+    numbers.byteswap()
+    sync = bytearray(count)
+    for number in numbers:
+        if 0 < number <= count:
+            sync[number - 1] = 1
+    return sync
+
+
+def _parse_chunk_offsets(data: bytes, start: int, end: int, wide: bool) -> array:
+    entry_count = struct.unpack_from(">I", data, start + 4)[0]
+    item_size = 8 if wide else 4
+    offsets = array("Q" if wide else "I", data[start + 8:start + 8 + item_size * entry_count])
+    if len(offsets) != entry_count:
+        raise Mp4Error("Truncated chunk offset box")
+    offsets.byteswap()
+    return offsets
+
+
+def _build_data_ranges(table: SampleTable, data: bytes, start: int, end: int, chunk_offsets: array):
+    """Resolve stsc runs into file ranges, merging samples that are contiguous on disk"""
+    entry_count = struct.unpack_from(">I", data, start + 4)[0]
+    entries = list(struct.iter_unpack(">III", data[start + 8:start + 8 + 12 * entry_count]))
+    sizes = table.sizes
+    ranges: List[Tuple[int, int]] = []
+    sample = 0
+    for i, (first_chunk, samples_per_chunk, _) in enumerate(entries):
+        last_chunk = entries[i + 1][0] - 1 if i + 1 < len(entries) else len(chunk_offsets)
+        for chunk in range(first_chunk - 1, last_chunk):
+            offset = chunk_offsets[chunk]
+            length = sum(sizes[sample:sample + samples_per_chunk])
+            sample += samples_per_chunk
+            if ranges and ranges[-1][0] + ranges[-1][1] == offset:
+                ranges[-1] = (ranges[-1][0], ranges[-1][1] + length)
+            else:
+                ranges.append((offset, length))
+    if sample != table.sample_count:
+        raise Mp4Error("stsc and stsz disagree")
+    table.data_ranges = ranges
+
+
+def _box(box_type: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+
+def _full_box(box_type: bytes, version: int, flags: int, *payload: bytes) -> bytes:
+    return _box(box_type, struct.pack(">I", (version << 24) | flags), *payload)
+
+
+def build_init_segment(reference: SampleTable, sample_entries: List[bytes], total_duration: int) -> bytes:
+    """ftyp and moov for a fragmented file whose fragments use the given sample entries"""
+    ftyp = _box(b"ftyp", b"isom", struct.pack(">I", 0x200), b"isom", b"iso6", b"iso2", b"avc1", b"mp41")
+    mvhd = _full_box(
+        b"mvhd", 0, 0,
+        struct.pack(">IIII", 0, 0, reference.timescale, 0),
+        struct.pack(">IH", 0x00010000, 0x0100), bytes(10),
+        UNITY_MATRIX, bytes(24), struct.pack(">I", 2)
+    )
+    tkhd = _full_box(b"tkhd", 0, 3, struct.pack(">IIIII", 0, 0, 1, 0, 0), reference.tkhd_tail)
+    mdhd = _full_box(b"mdhd", 0, 0, struct.pack(">IIIIHH", 0, 0, reference.timescale, 0, 0x55C4, 0))
+    hdlr = _full_box(b"hdlr", 0, 0, struct.pack(">I4s", 0, b"vide"), bytes(12), b"VideoHandler\0")
+    vmhd = _full_box(b"vmhd", 0, 1, bytes(8))
+    dinf = _box(b"dinf", _full_box(b"dref", 0, 0, struct.pack(">I", 1), _full_box(b"url ", 0, 1)))
+    stbl = _box(
+        b"stbl",
+        _full_box(b"stsd", 0, 0, struct.pack(">I", len(sample_entries)), *sample_entries),
+        _full_box(b"stts", 0, 0, struct.pack(">I", 0)),
+        _full_box(b"stsc", 0, 0, struct.pack(">I", 0)),
+        _full_box(b"stsz", 0, 0, struct.pack(">II", 0, 0)),
+        _full_box(b"stco", 0, 0, struct.pack(">I", 0))
+    )
+    trak = _box(b"trak", tkhd, _box(b"mdia", mdhd, hdlr, _box(b"minf", vmhd, dinf, stbl)))
+    mvex = _box(
+        b"mvex",
+        _full_box(b"mehd", 1, 0, struct.pack(">Q", total_duration)),
+        _full_box(b"trex", 0, 0, struct.pack(">IIIII", 1, 1, 0, 0, 0))
+    )
+    return ftyp + _box(b"moov", mvhd, trak, mvex)
+
+
+def build_fragment_header(table: SampleTable, sequence_number: int, base_decode_time: int,
+                          sample_description_index: int = 1) -> bytes:
+    """moof describing every sample of a clip, followed by the header of its mdat"""
+    count = table.sample_count
+    samples = table.trun_samples
+    # data-offset, duration, size, flags and composition offset present
+    trun_flags = 0x000001 | 0x000100 | 0x000200 | 0x000400 | 0x000800
+
+    def moof(data_offset: int) -> bytes:
+        return _box(
+            b"moof",
+            _full_box(b"mfhd", 0, 0, struct.pack(">I", sequence_number)),
+            _box(
+                b"traf",
+                # default-base-is-moof, sample-description-index-present
+                _full_box(b"tfhd", 0, 0x020002, struct.pack(">II", 1, sample_description_index)),
+                _full_box(b"tfdt", 1, 0, struct.pack(">Q", base_decode_time)),
+                _full_box(b"trun", 1, trun_flags, struct.pack(">Ii", count, data_offset), samples)
+            )
+        )
+
+    mdat_size = 8 + table.data_size
+    mdat_header = struct.pack(">I4s", mdat_size, b"mdat")
+    if mdat_size > 0xFFFFFFFF:
+        mdat_header = struct.pack(">I4sQ", 1, b"mdat", 16 + table.data_size)
+    moof_size = len(moof(0))
+    return moof(moof_size + len(mdat_header)) + mdat_header
+
+
+def check_compatible(tables: List[SampleTable]):
+    if not tables:
+        raise Mp4Error("No clips to stitch")
+    reference = tables[0]
+    for table in tables[1:]:
+        if not reference.compatible_with(table):
+            raise Mp4Error(f"{table.path} does not match the codec, size or timescale of {reference.path}")
+
+
+def iter_fragmented_parts(tables: List[SampleTable]) -> Iterator[Union[bytes, FileRange]]:
+    """Output of a stitch as generated headers and file ranges to copy from the clips"""
+    check_compatible(tables)
+    sample_entries: List[bytes] = []
+    for table in tables:
+        if table.sample_entry not in sample_entries:
+            sample_entries.append(table.sample_entry)
+    yield build_init_segment(tables[0], sample_entries, sum(table.duration for table in tables))
+    decode_time = 0
+    for sequence_number, table in enumerate(tables, start=1):
+        description_index = sample_entries.index(table.sample_entry) + 1
+        yield build_fragment_header(table, sequence_number, decode_time, description_index)
+        for offset, length in table.data_ranges:
+            yield (table.path, offset, length)
+        decode_time += table.duration
+
+
+def fragmented_layout(tables: List[SampleTable]) -> List[Tuple[int, int]]:
+    """(offset, length) of the init segment, then of each clip's fragment, in a stitch of tables"""
+    layout: List[Tuple[int, int]] = []
+    position = 0
+    for part in iter_fragmented_parts(tables):
+        # Generated headers open the init segment and every fragment
+        length = len(part) if isinstance(part, bytes) else part[2]
+        if isinstance(part, bytes):
+            layout.append((position, 0))
+        offset, current = layout[-1]
+        layout[-1] = (offset, current + length)
+        position += length
+    return layout
+
+
+def read_parts(parts: Iterable[Union[bytes, FileRange]], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """Resolve generated headers and file ranges into a stream of byte chunks"""
+    current_path = None
+    current_file = None
+    try:
+        for part in parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+            path, offset, length = part
+            if path != current_path:
+                if current_file:
+                    current_file.close()
+                current_file = open(path, "rb")
+                current_path = path
+            current_file.seek(offset)
+            while length > 0:
+                chunk = current_file.read(min(chunk_size, length))
+                if not chunk:
+                    raise Mp4Error(f"{path} is shorter than its sample table")
+                length -= len(chunk)
+                yield chunk
+    finally:
+        if current_file:
+            current_file.close()
+
+
+def iter_fragmented_mp4(tables: List[SampleTable], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stitched fragmented MP4 as a stream of byte chunks"""
+    return read_parts(iter_fragmented_parts(tables), chunk_size)
+
+
+def build_clip_init_segment(table: SampleTable) -> bytes:
+    """Init segment for serving a single clip as fragmented MP4 (e.g. an HLS EXT-X-MAP)"""
+    return build_init_segment(table, [table.sample_entry], table.duration)
+
+
+def iter_clip_fragment(table: SampleTable, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """A single clip as one moof/mdat media segment, to follow build_clip_init_segment"""
+    header = build_fragment_header(table, 1, 0)
+    return read_parts([header] + [(table.path, offset, length) for offset, length in table.data_ranges], chunk_size)
+
+
+def clip_fragment_size(table: SampleTable) -> int:
+    return len(build_fragment_header(table, 1, 0)) + table.data_size
+
+
+def write_fragmented_mp4(tables: List[SampleTable], output_path: str):
+    """Stitch clips into output_path, copying sample data in-kernel where the platform allows"""
+    copy_range = getattr(os, "copy_file_range", None)
+    with open(output_path, "wb", buffering=0) as out:
+        current_path = None
+        current_file = None
+        try:
+            for part in iter_fragmented_parts(tables):
+                if isinstance(part, bytes):
+                    out.write(part)
+                    continue
+                path, offset, length = part
+                if path != current_path:
+                    if current_file:
+                        current_file.close()
+                    current_file = open(path, "rb")
+                    current_path = path
+                while length > 0:
+                    copied = 0
+                    if copy_range:
+                        try:
+                            copied = copy_range(current_file.fileno(), out.fileno(), length, offset)
+                        except OSError:
+                            copy_range = None
+                    if not copied:
+                        current_file.seek(offset)
+                        chunk = current_file.read(min(READ_CHUNK_SIZE, length))
+                        if not chunk:
+                            raise Mp4Error(f"{path} is shorter than its sample table")
+                        out.write(chunk)
+                        copied = len(chunk)
+                    offset += copied
+                    length -= copied
+        finally:
+            if current_file:
+                current_file.close()
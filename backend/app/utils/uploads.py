@@ -0,0 +1,83 @@
+import os
+import hashlib
+import uuid
+from pathlib import Path
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+
+# Fixed read size: memory per upload stays bounded whatever the file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """Hex SHA-256 of a file on disk, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds its size limit; nothing is left on disk"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes} byte limit")
+        self.max_bytes = max_bytes
+
+
+class StagedUpload(BaseModel):
+    """An upload written to a temporary file next to its destination"""
+    path: str
+    size: int
+    sha256: str
+
+    def commit(self, destination) -> None:
+        """Atomically move the upload into place, replacing any existing file"""
+        os.replace(self.path, destination)
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def stage_upload(upload: UploadFile, directory, max_bytes: int,
+                       chunk_size: int = UPLOAD_CHUNK_SIZE) -> StagedUpload:
+    """
+    Stream an upload to a temporary file in directory in fixed-size chunks, hashing and
+    counting on the way through. The limit is enforced mid-stream. Writing, hashing and
+    fsync run in the threadpool, so the event loop never waits on the disk.
+    """
+    staged_path = Path(directory) / f".upload-{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    def write(out, chunk: bytes):
+        digest.update(chunk)
+        out.write(chunk)
+
+    def sync(out):
+        out.flush()
+        os.fsync(out.fileno())
+
+    try:
+        with open(staged_path, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                await run_in_threadpool(write, out, chunk)
+            await run_in_threadpool(sync, out)
+    except BaseException:
+        try:
+            os.remove(staged_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return StagedUpload(path=str(staged_path), size=size, sha256=digest.hexdigest())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark segmented re-encoding: wall-clock time of one stitched re-encode as the number
+of parallel segment workers grows, against a single FFmpeg process.
+
+Run from the backend directory:
+    python -m benchmarks.segmented_encode --clips 24 --runs 3
+    python -m benchmarks.segmented_encode --workers 1,2,4,8,16
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.segmented_encoder import SegmentedEncoder  # noqa: E402
+from benchmarks.stitch_backends import pick_clips  # noqa: E402
+
+
+def default_worker_counts():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="male")
+    parser.add_argument("--clips", type=int, default=24, help="Clips per stitched video")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", help="Comma separated worker counts (default: powers of two up to the core count)")
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(",")] if args.workers else default_worker_counts()
+    clips = pick_clips(args.model, args.clips)
+    print("🎬 Segmented encode benchmark")
+    print("=" * 50)
+    print(f"   Model: {args.model}   Clips: {len(clips)}   Runs: {args.runs}   Cores: {os.cpu_count()}")
+    print()
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        encoder = SegmentedEncoder(max_workers=max(worker_counts), work_dir=Path(work_dir))
+        for workers in worker_counts:
+            timings = []
+            for run in range(args.runs):
+                output_path = os.path.join(work_dir, f"out-{workers}-{run}.mp4")
+                start = time.perf_counter()
+                encoder.encode(clips, output_path, workers=workers)
+                timings.append(time.perf_counter() - start)
+                os.remove(output_path)
+            results.append((workers, statistics.median(timings)))
+
+    baseline = results[0][1]
+    print(f"   {'workers':>7}   {'median':>9}   {'speedup':>7}")
+    for workers, median in results:
+        print(f"   {workers:>7}   {median:8.2f}s   {baseline / median:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
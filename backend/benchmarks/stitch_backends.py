@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ISL video stitching backends: FFmpeg stream copy vs the in-process MP4 muxer.
+
+Run from the backend directory:
+    python -m benchmarks.stitch_backends --clips 12 --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.ffmpeg_concat import concat_videos_with_ffmpeg  # noqa: E402
+from app.services.mp4_stitcher import concat_videos_with_mp4, get_sample_table_cache  # noqa: E402
+from app.services.sign_index import ISL_VIDEOS_DIR  # noqa: E402
+
+
+def pick_clips(model: str, count: int):
+    model_dir = ISL_VIDEOS_DIR / f"{model}-model"
+    clips = sorted(str(path) for path in model_dir.glob("*/*.mp4"))
+    if len(clips) < count:
+        raise SystemExit(f"❌ Only {len(clips)} clips found in {model_dir}")
+    return clips[:count]
+
+
+def time_backend(name, concat, clips, runs, output_dir):
+    timings = []
+    for run in range(runs):
+        output_path = os.path.join(output_dir, f"{name}-{run}.mp4")
+        start = time.perf_counter()
+        concat(clips, output_path)
+        timings.append((time.perf_counter() - start) * 1000)
+        os.remove(output_path)
+    return timings
+
+
+def report(name, timings):
+    print(f"   {name:<8} mean {statistics.mean(timings):8.2f} ms   "
+          f"median {statistics.median(timings):8.2f} ms   min {min(timings):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="male")
+    parser.add_argument("--clips", type=int, default=12, help="Clips per stitched video")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    clips = pick_clips(args.model, args.clips)
+    print("🎬 Stitch backend benchmark")
+    print("=" * 50)
+    print(f"   Model: {args.model}   Clips: {len(clips)}   Runs: {args.runs}")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Cold run parses every sample table, later runs hit the cache
+        start = time.perf_counter()
+        concat_videos_with_mp4(clips, os.path.join(output_dir, "cold.mp4"))
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        ffmpeg_timings = time_backend("ffmpeg", concat_videos_with_ffmpeg, clips, args.runs, output_dir)
+        mp4_timings = time_backend("mp4", concat_videos_with_mp4, clips, args.runs, output_dir)
+
+    print()
+    report("ffmpeg", ffmpeg_timings)
+    report("mp4", mp4_timings)
+    print(f"   mp4 cold run (sample tables parsed): {cold_ms:.2f} ms")
+    print(f"   Speedup (median): {statistics.median(ffmpeg_timings) / statistics.median(mp4_timings):.1f}x")
+    print(f"   Sample table cache: {get_sample_table_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Benchmark the text-to-ISL stitching path in-process against a synthetic sign library.
+
+Generates testsrc clips for every --profiles entry (WIDTHxHEIGHT:codec), then drives
+parse_text_to_signs -> get_video_files_for_signs -> stitch backend for texts of each
+--sign-counts length at each --concurrency level. Records p50/p95/p99 latency, CPU time
+(this process plus FFmpeg children) and bytes written, and writes them as JSON.
+
+Run from the backend directory:
+    python -m benchmarks.text_to_isl --json results.json
+    python -m benchmarks.text_to_isl --sign-counts 1,20,200 --concurrency 1,8 --backends ffmpeg,mp4
+    python -m benchmarks.text_to_isl --baseline results.json --tolerance 0.25
+
+With --baseline the run exits non-zero when any scenario's p95 latency regressed by more
+than --tolerance.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.api.v1.endpoints.isl_video_generation import (  # noqa: E402
+    STITCH_BACKENDS, get_video_files_for_signs, parse_text_to_signs
+)
+from app.services import sign_index  # noqa: E402
+from app.services.sign_index import SignIndex  # noqa: E402
+
+MODEL = "male"
+ENCODERS = {"h264": "libx264", "hevc": "libx265", "mpeg4": "mpeg4"}
+
+
+def parse_profile(profile: str):
+    size, _, codec = profile.partition(":")
+    width, height = (int(value) for value in size.split("x"))
+    return width, height, codec or "h264"
+
+
+def generate_clip(path: Path, width: int, height: int, codec: str, duration: float, seed: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        "ffmpeg", "-v", "error", "-f", "lavfi",
+        "-i", f"testsrc2=size={width}x{height}:rate=30:duration={duration:.2f}",
+        "-vf", f"hue=h={seed * 37 % 360}",
+        "-c:v", ENCODERS[codec], "-g", "30", "-pix_fmt", "yuv420p",
+        "-video_track_timescale", "15360", "-an", str(path), "-y"
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+def build_corpus(root: Path, profiles, signs: int, seed: int):
+    """One sign library per profile, laid out like the real {model}-model/{sign}/{sign}.mp4 tree"""
+    rng = random.Random(seed)
+    durations = [rng.uniform(0.8, 2.5) for _ in range(signs)]
+    libraries = {}
+    for profile in profiles:
+        width, height, codec = parse_profile(profile)
+        library = root / profile.replace(":", "-")
+        model_dir = library / f"{MODEL}-model"
+        for i in range(signs):
+            sign = f"sign{i:04d}"
+            clip = model_dir / sign / f"{sign}.mp4"
+            if not clip.exists():
+                generate_clip(clip, width, height, codec, durations[i], i)
+        libraries[profile] = library
+    return libraries
+
+
+def use_library(library: Path):
+    """Point the process-wide sign index at a synthetic library"""
+    index = SignIndex(videos_dir=library, metadata_loader=None)
+    index.build(MODEL)
+    sign_index._sign_index = index
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def run_request(stitch, text: str, output_path: str):
+    start = time.perf_counter()
+    signs = parse_text_to_signs(text)
+    video_files, _ = get_video_files_for_signs(signs, MODEL)
+    stitch(video_files, output_path, model=MODEL)
+    latency = time.perf_counter() - start
+    written = os.path.getsize(output_path)
+    os.remove(output_path)
+    return latency, written
+
+
+def run_scenario(stitch, texts, concurrency: int, output_dir: str) -> dict:
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda item: run_request(stitch, item[1], os.path.join(output_dir, f"out-{item[0]}.mp4")),
+            enumerate(texts)
+        ))
+    wall = time.perf_counter() - wall_start
+    cpu = cpu_seconds() - cpu_start
+
+    latencies = [latency * 1000 for latency, _ in results]
+    return {
+        "requests": len(texts),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(texts) / wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_ms_per_request": round(cpu * 1000 / len(texts), 3),
+        "bytes_written": sum(written for _, written in results)
+    }
+
+
+def scenario_key(result: dict) -> str:
+    return f"{result['profile']}/{result['backend']}/{result['signs']}/{result['concurrency']}"
+
+
+def compare(results, baseline_path: str, tolerance: float) -> list:
+    with open(baseline_path) as f:
+        baseline = {scenario_key(result): result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get(scenario_key(result))
+        if before and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario_key(result)}: p95 {before['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="640x360:h264,1280x720:h264",
+                        help="Comma separated WIDTHxHEIGHT:codec (h264, hevc, mpeg4)")
+    parser.add_argument("--library-signs", type=int, default=40, help="Distinct clips per synthetic library")
+    parser.add_argument("--sign-counts", default="1,5,20,50,100,200", help="Signs per text")
+    parser.add_argument("--concurrency", default="1,4", help="Concurrent requests")
+    parser.add_argument("--requests", type=int, default=8, help="Requests per scenario")
+    parser.add_argument("--backends", default="ffmpeg", help=f"Stitch backends: {','.join(STITCH_BACKENDS)}")
+    parser.add_argument("--corpus-dir", help="Keep generated clips here and reuse them across runs")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Earlier --json output to check for p95 regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # The stitching path logs every request
+    logging.disable(logging.WARNING)
+    profiles = [profile for profile in args.profiles.split(",") if profile]
+    sign_counts = [int(count) for count in args.sign_counts.split(",")]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    backends = [backend for backend in args.backends.split(",") if backend]
+    for backend in backends:
+        if backend not in STITCH_BACKENDS:
+            raise SystemExit(f"❌ Unknown backend {backend}")
+
+    print("🎬 Text-to-ISL stitching benchmark")
+    print("=" * 50)
+    corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(tempfile.mkdtemp(prefix="isl-corpus-"))
+    start = time.perf_counter()
+    libraries = build_corpus(corpus_dir, profiles, args.library_signs, args.seed)
+    print(f"   Corpus: {len(profiles)} profiles x {args.library_signs} clips in {corpus_dir} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    rng = random.Random(args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for profile, library in libraries.items():
+            use_library(library)
+            for backend in backends:
+                for signs in sign_counts:
+                    texts = [
+                        " ".join(f"sign{rng.randrange(args.library_signs):04d}" for _ in range(signs))
+                        for _ in range(args.requests)
+                    ]
+                    for concurrency in concurrency_levels:
+                        result = {"profile": profile, "backend": backend, "signs": signs, "concurrency": concurrency}
+                        result.update(run_scenario(STITCH_BACKENDS[backend], texts, concurrency, output_dir))
+                        results.append(result)
+                        print(f"   {profile:<16} {backend:<9} signs {signs:>3}  x{concurrency:<2}  "
+                              f"p50 {result['p50_ms']:9.1f}  p95 {result['p95_ms']:9.1f}  "
+                              f"p99 {result['p99_ms']:9.1f} ms  cpu {result['cpu_ms_per_request']:8.1f} ms/req  "
+                              f"{result['bytes_written'] / 1024 ** 2:7.1f} MiB")
+    if not args.corpus_dir:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        "benchmark": "text_to_isl",
+        "created_at": datetime.now().isoformat(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": vars(args),
+        "results": results
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"   Results written to {args.json}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression {regression}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No p95 regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
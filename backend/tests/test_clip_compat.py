@@ -0,0 +1,67 @@
+import os
+import subprocess
+
+from app.services import clip_compat
+from app.services.clip_compat import ClipNormalizer, create_normalize_command
+from app.services.sign_index import SignClip
+from app.utils.media_probe import StreamFingerprint
+
+REFERENCE = "h264|High|1280|720|yuv420p|30/1|1/15360|1:1"
+OTHER = "h264|Main|640|480|yuv420p|25/1|1/12800|1:1"
+
+
+def _clip(sign, fingerprint):
+    return SignClip(sign=sign, path=f"/clips/{sign}.mp4", file_size=1, mtime_ns=1, rank=0,
+                    fingerprint=fingerprint)
+
+
+def test_normalize_command_targets_reference_stream():
+    cmd = create_normalize_command("in.mp4", "out.mp4", StreamFingerprint.from_key(REFERENCE))
+    assert "libx264" in cmd
+    assert cmd[cmd.index("-video_track_timescale") + 1] == "15360"
+    assert cmd[cmd.index("-profile:v") + 1] == "high"
+    assert "fps=30/1" in cmd[cmd.index("-vf") + 1]
+
+
+def test_profiles_map_to_encoder_names():
+    constrained = StreamFingerprint.from_key("h264|Constrained Baseline|1280|720|yuv420p|30/1|1/15360|1:1")
+    cmd = create_normalize_command("in.mp4", "out.mp4", constrained)
+    assert cmd[cmd.index("-profile:v") + 1] == "baseline"
+
+    extended = StreamFingerprint.from_key("h264|Extended|1280|720|yuv420p|30/1|1/15360|1:1")
+    assert "-profile:v" not in create_normalize_command("in.mp4", "out.mp4", extended)
+
+
+def test_plan_only_normalizes_mismatching_clips(tmp_path, monkeypatch):
+    class Index:
+        def canonical_fingerprint(self, model):
+            return REFERENCE
+
+    monkeypatch.setattr(clip_compat, "get_sign_index", lambda: Index())
+    normalizer = ClipNormalizer(tmp_path)
+    monkeypatch.setattr(normalizer, "normalize", lambda clip, target: f"/normalized/{clip.sign}.mp4")
+
+    files = normalizer.plan("male", [_clip("train", REFERENCE), _clip("late", OTHER)])
+    assert files == ["/clips/train.mp4", "/normalized/late.mp4"]
+
+
+def test_normalized_copies_are_lru_bounded_and_dropped_with_their_source(tmp_path, monkeypatch):
+    def fake_encode(cmd, **kwargs):
+        with open(cmd[-2], "wb") as f:
+            f.write(b"\0" * 100)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(clip_compat.subprocess, "run", fake_encode)
+    normalizer = ClipNormalizer(tmp_path, max_bytes=250)
+    first = normalizer.normalize(_clip("train", OTHER), REFERENCE)
+    second = normalizer.normalize(_clip("late", OTHER), REFERENCE)
+    normalizer.normalize(_clip("train", OTHER), REFERENCE)
+    normalizer.normalize(_clip("today", OTHER), REFERENCE)
+
+    # "late" was least recently used
+    assert os.path.exists(first) and not os.path.exists(second)
+    assert normalizer.stats()["total_bytes"] == 200
+
+    normalizer.invalidate_path("/clips/train.mp4")
+    assert not os.path.exists(first)
+    assert normalizer.stats()["entries"] == 1
@@ -0,0 +1,38 @@
+import shutil
+import subprocess
+
+import pytest
+
+from app.services.clip_renditions import (
+    create_poster_command, create_proxy_command, generate_renditions, rendition_paths
+)
+
+
+def test_rendition_commands_scale_down_and_cap_bitrate():
+    poster = create_poster_command("in.mp4", "in_poster.webp", 1.2)
+    assert poster[poster.index("-ss") + 1] == "1.200"
+    assert poster[poster.index("-frames:v") + 1] == "1"
+    assert "libwebp" in poster
+    assert "libwebp" not in create_poster_command("in.mp4", "in_poster.jpg")
+
+    proxy = create_proxy_command("in.mp4", "in_proxy.mp4")
+    assert proxy[proxy.index("-vf") + 1].startswith("scale=-2:")
+    assert "-maxrate" in proxy and "-an" in proxy
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_generate_renditions_next_to_clip(tmp_path):
+    clip = tmp_path / "hello" / "hello.mp4"
+    clip.parent.mkdir()
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=size=1280x720:rate=30:duration=1",
+         "-c:v", "libx264", "-pix_fmt", "yuv420p", str(clip), "-y"],
+        capture_output=True, check=True
+    )
+
+    poster, proxy = generate_renditions(str(clip), 1.0)
+
+    assert (poster, proxy) == rendition_paths(str(clip))
+    assert sorted(path.name for path in clip.parent.iterdir()) == sorted(
+        ["hello.mp4", "hello_poster.webp", "hello_proxy.mp4"])
+    assert (clip.parent / "hello_proxy.mp4").stat().st_size < clip.stat().st_size
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.full_text import match_expression
+from app.db.migrations import upgrade_schema
+from app.models.isl_video import ISLVideo
+from app.schemas.isl_video import ISLVideoSearch
+from app.services.isl_video import ISLVideoService
+
+
+@pytest.fixture
+def service(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    upgrade_schema(engine)
+    db = sessionmaker(bind=engine)()
+    yield ISLVideoService(db)
+    db.close()
+
+
+def _add(service, name, **fields):
+    video = ISLVideo(filename=f"{name}.mp4", video_path=f"/clips/{name}.mp4", file_size=1, model_type="male",
+                     mime_type="video/mp4", file_extension="mp4", **fields)
+    service.db.add(video)
+    service.db.commit()
+    return video
+
+
+def _search(service, text):
+    return [video.filename for video in service.search_isl_videos(ISLVideoSearch(search_text=text))]
+
+
+def test_match_expression_quotes_words_and_prefixes_the_last():
+    assert match_expression('platform "2" OR') == '"platform" """2""" "OR"*'
+    assert match_expression("  ") is None
+    assert match_expression("%") is None
+
+
+def test_search_is_ranked_prefix_match_kept_in_sync_by_triggers(service):
+    _add(service, "platform", display_name="Platform")
+    _add(service, "train", description="Train arriving at the platform")
+    _add(service, "ticket")
+
+    # Name matches outrank description matches
+    assert _search(service, "plat") == ["platform.mp4", "train.mp4"]
+    assert service.count_isl_videos(ISLVideoSearch(search_text="plat")) == 2
+    assert _search(service, "arriving plat") == ["train.mp4"]
+
+    ticket = service.db.query(ISLVideo).filter(ISLVideo.filename == "ticket.mp4").one()
+    ticket.tags = "platform ticket"
+    service.db.commit()
+    assert set(_search(service, "platform")) == {"platform.mp4", "train.mp4", "ticket.mp4"}
+
+    service.db.delete(ticket)
+    service.db.commit()
+    assert "ticket.mp4" not in _search(service, "platform")
+
+
+def test_cursor_pages_continue_in_rank_order(service):
+    _add(service, "train_a", display_name="Train")
+    _add(service, "train_b", tags="train")
+    _add(service, "c", description="The train")
+    _add(service, "d", description="A slow train on a long line")
+    ranked = _search(service, "train")
+
+    pages, cursor = [], None
+    while True:
+        videos, cursor = service.search_isl_videos_page(ISLVideoSearch(search_text="train", limit=2, cursor=cursor))
+        pages += [video.filename for video in videos]
+        if not cursor:
+            break
+    assert pages == ranked and len(pages) == 4
+
+    # A listing cursor does not continue a ranked search
+    _, listing_cursor = service.search_isl_videos_page(ISLVideoSearch(limit=1))
+    with pytest.raises(ValueError):
+        service.search_isl_videos_page(ISLVideoSearch(search_text="train", cursor=listing_cursor))
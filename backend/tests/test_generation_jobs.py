@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+from app.services.generation_jobs import GenerationJobQueue
+
+
+def test_identical_jobs_attach_to_the_running_one():
+    queue = GenerationJobQueue(max_workers=2, max_queued=0)
+    release = threading.Event()
+    runs = []
+    followed = []
+
+    def work(job, report):
+        runs.append(job.job_id)
+        release.wait(5)
+
+    def follow(leader, follower):
+        followed.append((leader.job_id, follower.job_id))
+
+    leader = queue.submit(queue.create_job("video-1", "male"), work, key="same", follow=follow)
+    follower = queue.submit(queue.create_job("video-2", "male"), work, key="same", follow=follow)
+    # Followers do not take queue capacity
+    other = queue.submit(queue.create_job("video-3", "male"), work, key="other")
+    assert follower.coalesced_with == leader.job_id
+
+    release.set()
+
+    async def wait_all():
+        for job in (leader, follower, other):
+            await queue.wait(job)
+
+    asyncio.run(wait_all())
+    assert sorted(runs) == sorted([leader.job_id, other.job_id])
+    assert followed == [(leader.job_id, follower.job_id)]
+    assert follower.status == "completed"
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_followers_fail_with_their_leader():
+    queue = GenerationJobQueue(max_workers=1, max_queued=0)
+    release = threading.Event()
+
+    def work(job, report):
+        release.wait(5)
+        raise RuntimeError("ffmpeg exploded")
+
+    leader = queue.submit(queue.create_job("video-1", "male"), work, key="same")
+    follower = queue.submit(queue.create_job("video-2", "male"), work, key="same")
+    release.set()
+    asyncio.run(queue.wait(follower))
+    assert leader.status == "failed"
+    assert follower.status == "failed"
+    assert "ffmpeg exploded" in follower.error
+
+
+def test_wait_covers_jobs_run_outside_the_queue():
+    # Stream and batch jobs are created here but finished by their own workers
+    queue = GenerationJobQueue(max_workers=1, max_queued=0)
+    job = queue.create_job("video-1", "male")
+    job.status = "running"
+    threading.Timer(0.1, queue.finish, args=(job,)).start()
+
+    asyncio.run(queue.wait(job))
+    assert job.status == "completed"
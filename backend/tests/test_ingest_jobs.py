@@ -0,0 +1,121 @@
+import shutil
+import subprocess
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrations import upgrade_schema
+from app.models.isl_ingest_job import ISLIngestJob
+from app.models.isl_video import ISLVideo
+from app.services.ingest_jobs import IngestWorker, transcode_clip
+from app.services.isl_video import ISLVideoService
+from app.utils.uploads import file_sha256
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    upgrade_schema(engine)
+    return sessionmaker(bind=engine)
+
+
+def _job(db, name="hello", attempts=1, max_attempts=2, root="/clips"):
+    video = ISLVideo(filename=f"{name}.mp4", video_path=f"{root}/{name}/{name}.mp4", file_size=1,
+                     model_type="male", mime_type="video/mp4", file_extension="mp4")
+    db.add(video)
+    db.commit()
+    job = ISLIngestJob(video_id=video.id, input_path=video.video_path, output_folder=f"{root}/{name}",
+                       status="running", progress=0.0, attempts=attempts, max_attempts=max_attempts,
+                       started_at=datetime.now())
+    db.add(job)
+    db.commit()
+    return video.id, job.id
+
+
+def test_failed_attempts_back_off_then_fail_and_deactivate_the_video(session_factory):
+    worker = IngestWorker(session_factory=session_factory, max_workers=1, retry_backoff_seconds=60)
+    worker._in_process = lambda fn, *args: fn(*args)
+    db = session_factory()
+    video_id, job_id = _job(db, attempts=1, max_attempts=2)
+
+    # Missing input: FFmpeg fails
+    worker._execute(job_id)
+    job = db.get(ISLIngestJob, job_id)
+    assert job.status == "queued"
+    assert job.error
+    assert job.next_attempt_at > datetime.now()
+    # Not due yet, so nothing starts
+    assert worker.dispatch() == 0
+
+    job.status = "running"
+    job.attempts = 2
+    db.commit()
+    worker._execute(job_id)
+    db.expire_all()
+    assert db.get(ISLIngestJob, job_id).status == "failed"
+    assert db.get(ISLVideo, video_id).is_active is False
+    db.close()
+
+
+def test_resume_requeues_interrupted_jobs(session_factory):
+    worker = IngestWorker(session_factory=session_factory, max_workers=1)
+    db = session_factory()
+    _, resumable = _job(db, attempts=1, max_attempts=3)
+    _, exhausted = _job(db, name="bye", attempts=3, max_attempts=3)
+
+    assert worker.resume() == 1
+    db.expire_all()
+    assert db.get(ISLIngestJob, resumable).status == "queued"
+    assert db.get(ISLIngestJob, exhausted).status == "failed"
+    db.close()
+
+
+def test_transcode_raises_on_ffmpeg_failure(tmp_path):
+    with pytest.raises(RuntimeError):
+        transcode_clip(str(tmp_path / "missing.mp4"), str(tmp_path))
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_original_is_kept_until_recorded_and_an_encode_is_never_reencoded(session_factory, tmp_path, monkeypatch):
+    clip = tmp_path / "hello" / "hello.mp4"
+    clip.parent.mkdir()
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=size=320x240:rate=25:duration=1",
+         "-c:v", "libx264", "-pix_fmt", "yuv420p", str(clip), "-y"],
+        capture_output=True, check=True
+    )
+    original = file_sha256(str(clip))
+    worker = IngestWorker(session_factory=session_factory, max_workers=1, retry_backoff_seconds=60)
+    worker._in_process = lambda fn, *args: fn(*args)
+    db = session_factory()
+    video_id, job_id = _job(db, attempts=1, max_attempts=3, root=str(tmp_path))
+
+    # Failing to record the encode leaves the original in place for the retry
+    def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(ISLVideoService, "record_ingest_metadata", fail)
+    worker._execute(job_id)
+    assert file_sha256(str(clip)) == original
+    monkeypatch.undo()
+
+    job = db.get(ISLIngestJob, job_id)
+    job.status = "running"
+    db.commit()
+    worker._execute(job_id)
+    db.expire_all()
+    assert db.get(ISLIngestJob, job_id).status == "completed"
+    encoded = db.get(ISLVideo, video_id).file_sha256
+    assert file_sha256(str(clip)) == encoded != original
+    assert not (clip.parent / "hello_processed.mp4").exists()
+
+    # Interrupted after the swap but before completion was recorded: the retry keeps the encode
+    mtime = clip.stat().st_mtime_ns
+    db.get(ISLIngestJob, job_id).status = "running"
+    db.commit()
+    worker._execute(job_id)
+    db.expire_all()
+    assert db.get(ISLIngestJob, job_id).status == "completed"
+    assert clip.stat().st_mtime_ns == mtime and file_sha256(str(clip)) == encoded
+    db.close()
@@ -0,0 +1,77 @@
+import hashlib
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrations import upgrade_schema
+from app.schemas.isl_video import ISLVideoCreate, ISLVideoUpdate
+from app.services.isl_video import ISLVideoService
+
+
+@pytest.fixture
+def service(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    upgrade_schema(engine)
+    db = sessionmaker(bind=engine)()
+    yield ISLVideoService(db)
+    db.close()
+
+
+def _clip(tmp_path, name, content: bytes, model_type="male", **fields):
+    path = tmp_path / f"{name}.mp4"
+    path.write_bytes(content)
+    return ISLVideoCreate(
+        filename=path.name, display_name=name, video_path=str(path), file_size=len(content),
+        model_type=model_type, mime_type="video/mp4", file_extension="mp4", **fields
+    )
+
+
+def test_content_digest_is_unique_per_model_among_active_videos(service, tmp_path):
+    digest = hashlib.sha256(b"hello").hexdigest()
+    original = service.create_isl_video(_clip(tmp_path, "hello", b"hello", content_sha256=digest))
+
+    # A renamed copy is found by content, not filename
+    assert service.check_duplicate_video("other.mp4", "male", content_sha256=digest).id == original.id
+    assert service.check_duplicate_video("other.mp4", "female", content_sha256=digest) is None
+
+    with pytest.raises(IntegrityError):
+        service.create_isl_video(_clip(tmp_path, "copy", b"hello", content_sha256=digest))
+    service.db.rollback()
+
+    # Same content for the other model, or once the original is soft-deleted, is allowed
+    service.create_isl_video(_clip(tmp_path, "hello-f", b"hello", model_type="female", content_sha256=digest))
+    original.is_active = False
+    service.db.commit()
+    service.create_isl_video(_clip(tmp_path, "copy", b"hello", content_sha256=digest))
+
+
+def test_backfill_hashes_rows_and_reports_duplicates(service, tmp_path):
+    first = service.create_isl_video(_clip(tmp_path, "a", b"same"))
+    second = service.create_isl_video(_clip(tmp_path, "b", b"same"))
+    third = service.create_isl_video(_clip(tmp_path, "c", b"other"))
+    gone = service.create_isl_video(_clip(tmp_path, "d", b"gone"))
+    (tmp_path / "d.mp4").unlink()
+
+    result = service.backfill_content_digests(batch_size=2)
+    assert result == {"hashed": 2, "duplicates": [{"id": second.id, "duplicate_of": first.id}], "missing_files": 1}
+    assert first.content_sha256 == hashlib.sha256(b"same").hexdigest()
+    assert second.content_sha256 is None
+    assert third.content_sha256 == hashlib.sha256(b"other").hexdigest()
+    assert gone.content_sha256 is None
+
+
+def test_public_update_cannot_write_ingest_owned_fields(service, tmp_path):
+    video = service.create_isl_video(_clip(tmp_path, "hello", b"hello"))
+
+    # Fields the PUT body does not carry are dropped, so a client cannot repoint the row
+    service.update_isl_video(video.id, ISLVideoUpdate(
+        display_name="Hi", video_path="/etc/passwd", file_size=1, poster_path="/etc/passwd", content_sha256="0" * 64))
+    assert (video.display_name, video.video_path, video.file_size, video.poster_path, video.content_sha256) == (
+        "Hi", str(tmp_path / "hello.mp4"), 5, None, None)
+
+    service.record_ingest_metadata(video.id, file_size=7, width=1280)
+    assert (video.file_size, video.width) == (7, 1280)
+    with pytest.raises(ValueError):
+        service.record_ingest_metadata(video.id, not_a_column=1)
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.db.migrations import upgrade_schema
+from app.models.isl_video import ISLVideo
+from app.schemas.isl_video import ISLVideoSearch
+from app.services.isl_video import ISLVideoService, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def service(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    upgrade_schema(engine)
+    db = sessionmaker(bind=engine)()
+    # Several clips share a timestamp, so the id breaks the tie. Stored as the
+    # CURRENT_TIMESTAMP text the column's server default writes.
+    for i, second in enumerate([0, 0, 0, 1, 1, 2, 3]):
+        db.add(ISLVideo(filename=f"sign{i}.mp4", video_path=f"/clips/sign{i}.mp4", file_size=1,
+                        model_type="male" if i != 6 else "female", mime_type="video/mp4",
+                        file_extension="mp4", created_at=func.datetime(f"2025-01-01 00:00:0{second}")))
+    db.add(ISLVideo(filename="gone.mp4", video_path="/clips/gone.mp4", file_size=1, model_type="male",
+                    mime_type="video/mp4", file_extension="mp4", is_active=False))
+    db.commit()
+    yield ISLVideoService(db)
+    db.close()
+
+
+def test_count_shares_the_search_filters(service):
+    assert service.count_isl_videos(ISLVideoSearch(model_type="male", limit=2)) == 6
+    assert service.count_isl_videos(ISLVideoSearch(model_type="male", search_text="sign1")) == 1
+    assert service.count_isl_videos(ISLVideoSearch(is_active=None)) == 8
+
+
+def test_cursor_pages_match_offset_pages(service):
+    by_offset = [video.id for offset in range(0, 6, 2)
+                 for video in service.search_isl_videos(ISLVideoSearch(model_type="male", limit=2, offset=offset))]
+
+    by_cursor, cursor = [], None
+    while True:
+        page = service.search_isl_videos(ISLVideoSearch(model_type="male", limit=2, cursor=cursor))
+        by_cursor += [video.id for video in page]
+        if len(page) < 2:
+            break
+        cursor = encode_cursor(page[-1])
+
+    assert by_cursor == by_offset
+    assert len(set(by_cursor)) == 6
+
+
+def test_cursor_survives_deleting_its_row(service):
+    page = service.search_isl_videos(ISLVideoSearch(model_type="male", limit=2))
+    cursor = encode_cursor(page[-1])
+    service.db.delete(page[-1])
+    service.db.commit()
+
+    rest = service.search_isl_videos(ISLVideoSearch(model_type="male", limit=10, cursor=cursor))
+    assert [video.filename for video in rest] == ["sign2.mp4", "sign3.mp4", "sign4.mp4", "sign5.mp4"]
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.isl_video_stats import grouped_statistics
+from app.db.migrations import upgrade_schema
+from app.models.isl_video import ISLVideo
+from app.models.isl_video_stats import ISLVideoStats
+from app.services.isl_video import ISLVideoService
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    upgrade_schema(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add(db, name, model_type="male", size=100, duration=2.5, **fields):
+    video = ISLVideo(filename=f"{name}.mp4", video_path=f"/clips/{name}.mp4", file_size=size,
+                     duration_seconds=duration, model_type=model_type, mime_type="video/mp4",
+                     file_extension="mp4", **fields)
+    db.add(video)
+    db.commit()
+    return video
+
+
+def _recomputed(db):
+    return {row[0]: tuple(float(value) for value in row[1:]) for row in db.execute(grouped_statistics())}
+
+
+def _maintained(db):
+    db.expire_all()
+    return {row.model_type: (row.total_videos, row.total_size_bytes, row.total_duration_seconds,
+                             row.active_videos, row.active_size_bytes, row.active_duration_seconds)
+            for row in db.query(ISLVideoStats).all() if row.total_videos}
+
+
+def test_triggers_keep_totals_equal_to_a_recompute(db):
+    a = _add(db, "a")
+    b = _add(db, "b", size=300, duration=1.25)
+    c = _add(db, "c", model_type="female", size=50, duration=None)
+    assert _maintained(db) == _recomputed(db)
+
+    b.is_active = False
+    a.file_size = 120
+    db.commit()
+    assert _maintained(db) == _recomputed(db)
+
+    c.model_type = "male"
+    db.commit()
+    # Bulk updates and deletes bypass the ORM but not the triggers
+    db.query(ISLVideo).filter(ISLVideo.id == a.id).update({"duration_seconds": 4}, synchronize_session=False)
+    db.delete(b)
+    db.commit()
+    assert _maintained(db) == _recomputed(db)
+    assert _maintained(db)["male"] == (2, 170, 4.0, 2, 170, 4.0)
+
+
+def test_summary_reads_the_maintained_rows(db):
+    _add(db, "a")
+    _add(db, "b", model_type="female", size=300, is_active=False)
+
+    stats = ISLVideoService(db).get_video_statistics()
+    assert stats["total_videos"] == 2
+    assert stats["active_videos"] == 1
+    assert (stats["male_videos"], stats["female_videos"]) == (1, 0)
+    assert stats["total_size_bytes"] == 400
+    assert stats["total_duration_seconds"] == 5.0
+    assert stats["by_model"]["female"]["active_size_bytes"] == 0
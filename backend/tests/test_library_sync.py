@@ -0,0 +1,41 @@
+from app.models.isl_video import ISLVideo
+from app.services.library_sync import LibrarySyncer, ManifestEntry, ScannedClip, SyncManifest, scan_model_folder
+
+
+def test_scan_and_manifest_round_trip(tmp_path):
+    model_path = tmp_path / "male-model"
+    for sign in ("hello", "train"):
+        (model_path / sign).mkdir(parents=True)
+        (model_path / sign / f"{sign}.mp4").write_bytes(sign.encode())
+    # Not a clip folder: no {sign}/{sign}.mp4 inside
+    (model_path / "empty").mkdir()
+    (model_path / "stray.mp4").write_bytes(b"x")
+
+    clips = scan_model_folder(model_path)
+    assert [clip.relative_path for clip in clips] == ["hello/hello.mp4", "train/train.mp4"]
+
+    manifest_path = tmp_path / "manifest.json"
+    manifest = SyncManifest.load(manifest_path, str(model_path))
+    assert manifest.entries == {}
+    for clip in clips:
+        manifest.record(clip.relative_path, clip.path)
+    manifest.save()
+
+    reloaded = SyncManifest.load(manifest_path, str(model_path))
+    assert reloaded.entries == manifest.entries
+    assert reloaded.entries["hello/hello.mp4"].size == clips[0].size
+    # A manifest written for another folder is ignored
+    assert SyncManifest.load(manifest_path, str(tmp_path / "female-model")).entries == {}
+
+
+def test_same_size_replacement_outside_the_app_is_modified(tmp_path):
+    row = ISLVideo(file_size=5, content_sha256="uploaded", file_sha256="transcoded")
+    clip = ScannedClip(name="hello", path="/clips/hello/hello.mp4", size=5, mtime_ns=2)
+    previous = ManifestEntry(size=5, mtime_ns=1, sha256="synced")
+    modified = LibrarySyncer(manifest_dir=tmp_path)._modified
+
+    assert not modified(row, clip, previous, "synced")
+    # Written by an upload or its ingest
+    assert not modified(row, clip, previous, "uploaded")
+    assert not modified(row, clip, previous, "transcoded")
+    assert modified(row, clip, previous, "replaced")
@@ -0,0 +1,17 @@
+from app.utils.media_probe import ClipMetadata, StreamFingerprint, rfc6381_codec
+
+
+def test_rfc6381_codec_strings():
+    assert rfc6381_codec("h264", "High", 31) == "avc1.64001f"
+    assert rfc6381_codec("h264", "Constrained Baseline", 30) == "avc1.42401e"
+    assert rfc6381_codec("h264", "Main", 40) == "avc1.4d0028"
+    assert rfc6381_codec("hevc", "Main", 93) == "hvc1.1.6.L93.B0"
+    assert rfc6381_codec("h264", "High", None) is None
+    assert rfc6381_codec("mpeg4", "Simple Profile", 1) is None
+
+
+def test_content_type_carries_codecs_parameter():
+    fingerprint = StreamFingerprint.from_key("h264|High|1280|720|yuv420p|30/1|1/15360|1:1")
+    metadata = ClipMetadata(fingerprint=fingerprint, codec_string="avc1.64001f", format_name="mov,mp4,m4a,3gp,3g2,mj2")
+    assert metadata.content_type == 'video/mp4; codecs="avc1.64001f"'
+    assert ClipMetadata(fingerprint=fingerprint).content_type == "video/mp4"
@@ -0,0 +1,61 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.media_response import MediaFileResponse, parse_byte_range
+
+
+def test_parse_byte_range():
+    assert parse_byte_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_byte_range("bytes=900-", 1000) == (900, 999)
+    assert parse_byte_range("bytes=-100", 1000) == (900, 999)
+    assert parse_byte_range("bytes=500-5000", 1000) == (500, 999)
+    # Ignored: multiple ranges, other units, garbage
+    assert parse_byte_range("bytes=0-1,5-6", 1000) is None
+    assert parse_byte_range("items=0-1", 1000) is None
+    assert parse_byte_range("bytes=abc", 1000) is None
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=1000-", 1000)
+
+
+def test_range_and_conditional_requests(tmp_path):
+    video = tmp_path / "clip.mp4"
+    payload = bytes(range(256)) * 4
+    video.write_bytes(payload)
+
+    app = FastAPI()
+
+    @app.api_route("/video", methods=["GET", "HEAD"])
+    def serve():
+        return MediaFileResponse(path=str(video), filename="clip.mp4")
+
+    client = TestClient(app)
+
+    full = client.get("/video")
+    assert full.status_code == 200
+    assert full.content == payload
+    assert full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+
+    partial = client.get("/video", headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == payload[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(payload)}"
+
+    # A stale If-Range falls back to the whole file
+    stale = client.get("/video", headers={"Range": "bytes=10-19", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == payload
+
+    unsatisfiable = client.get("/video", headers={"Range": f"bytes={len(payload)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(payload)}"
+
+    not_modified = client.get("/video", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    head = client.head("/video")
+    assert head.status_code == 200
+    assert head.headers["content-length"] == str(len(payload))
+    assert head.content == b""
@@ -0,0 +1,115 @@
+import struct
+
+import pytest
+
+from app.utils.mp4 import (
+    Mp4Error, build_clip_init_segment, clip_fragment_size, fragmented_layout, iter_boxes,
+    iter_clip_fragment, iter_fragmented_mp4, parse_sample_table
+)
+
+
+def _box(box_type, *payload):
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+
+def _full_box(box_type, *payload):
+    return _box(box_type, b"\0\0\0\0", *payload)
+
+
+def _write_clip(path, samples, width=64, config=b"\x01\x64\x00\x1f", sync=(1,)):
+    """Non-fragmented single-track MP4 with one chunk, 512-tick samples and a 1024-tick edit"""
+    visual_entry = bytes(6) + struct.pack(">H", 1) + bytes(16) + struct.pack(">HH", width, 48) + bytes(50)
+    sample_entry = _box(b"avc1", visual_entry, _box(b"avcC", config), _box(b"btrt", bytes(12)))
+    stbl = _box(
+        b"stbl",
+        _full_box(b"stsd", struct.pack(">I", 1), sample_entry),
+        _full_box(b"stts", struct.pack(">III", 1, len(samples), 512)),
+        _full_box(b"ctts", struct.pack(">III", 1, len(samples), 1024)),
+        _full_box(b"stss", struct.pack(">I", len(sync)), *[struct.pack(">I", n) for n in sync]),
+        _full_box(b"stsc", struct.pack(">IIII", 1, 1, len(samples), 1)),
+        _full_box(b"stsz", struct.pack(">II", 0, len(samples)), *[struct.pack(">I", len(s)) for s in samples]),
+        _full_box(b"stco", struct.pack(">I", 1), b"@@@@")
+    )
+    trak = _box(
+        b"trak",
+        _full_box(b"tkhd", bytes(20), bytes(52), struct.pack(">II", width << 16, 48 << 16)),
+        _box(b"edts", _full_box(b"elst", struct.pack(">IIiI", 1, 10240, 1024, 0x10000))),
+        _box(
+            b"mdia",
+            _full_box(b"mdhd", struct.pack(">IIIIHH", 0, 0, 15360, 0, 0x55C4, 0)),
+            _full_box(b"hdlr", struct.pack(">I4s", 0, b"vide"), bytes(12), b"\0"),
+            _box(b"minf", stbl)
+        )
+    )
+    head = _box(b"ftyp", b"isom\0\0\0\0") + _box(b"moov", trak)
+    head = head.replace(b"@@@@", struct.pack(">I", len(head) + 8))
+    path.write_bytes(head + _box(b"mdat", *samples))
+    return str(path)
+
+
+def _boxes(data):
+    return [(box_type, data[start:end]) for box_type, start, end in iter_boxes(data)]
+
+
+def test_parse_sample_table(tmp_path):
+    table = parse_sample_table(_write_clip(tmp_path / "a.mp4", [b"key", b"delta1", b"d2"]))
+    assert table.sample_count == 3
+    assert list(table.sizes) == [3, 6, 2]
+    assert table.duration == 3 * 512
+    assert table.media_time == 1024
+    assert list(table.sync_samples) == [1, 0, 0]
+    assert len(table.data_ranges) == 1
+    assert b"btrt" not in table.sample_entry
+
+
+def test_fragmented_output_copies_samples_and_shares_descriptions(tmp_path):
+    first = parse_sample_table(_write_clip(tmp_path / "a.mp4", [b"key", b"delta"]))
+    second = parse_sample_table(_write_clip(tmp_path / "b.mp4", [b"KEY2"], config=b"\x01\x4d\x00\x1f"))
+    third = parse_sample_table(_write_clip(tmp_path / "c.mp4", [b"k3"]))
+
+    output = b"".join(iter_fragmented_mp4([first, second, third]))
+    boxes = _boxes(output)
+    assert [box_type for box_type, _ in boxes] == [b"ftyp", b"moov"] + [b"moof", b"mdat"] * 3
+    assert [payload for box_type, payload in boxes if box_type == b"mdat"] == [b"keydelta", b"KEY2", b"k3"]
+    # Two distinct decoder configs, the third clip reuses the first description
+    assert struct.unpack_from(">I", output, output.index(b"stsd") + 8)[0] == 2
+    description_indexes = [
+        struct.unpack_from(">I", payload, payload.index(b"tfhd") + 12)[0]
+        for box_type, payload in boxes if box_type == b"moof"
+    ]
+    assert description_indexes == [1, 2, 1]
+    decode_times = [
+        struct.unpack_from(">Q", payload, payload.index(b"tfdt") + 8)[0]
+        for box_type, payload in boxes if box_type == b"moof"
+    ]
+    assert decode_times == [0, 1024, 1536]
+
+
+def test_mismatched_dimensions_are_rejected(tmp_path):
+    first = parse_sample_table(_write_clip(tmp_path / "a.mp4", [b"key"]))
+    second = parse_sample_table(_write_clip(tmp_path / "b.mp4", [b"key"], width=32))
+    with pytest.raises(Mp4Error):
+        list(iter_fragmented_mp4([first, second]))
+
+
+def test_single_clip_fragment_matches_its_advertised_size(tmp_path):
+    table = parse_sample_table(_write_clip(tmp_path / "a.mp4", [b"key", b"delta"]))
+    fragment = b"".join(iter_clip_fragment(table))
+    assert len(fragment) == clip_fragment_size(table)
+    assert [box_type for box_type, _ in _boxes(build_clip_init_segment(table) + fragment)] == \
+        [b"ftyp", b"moov", b"moof", b"mdat"]
+
+
+def test_fragmented_layout_addresses_init_and_each_fragment(tmp_path):
+    tables = [
+        parse_sample_table(_write_clip(tmp_path / "a.mp4", [b"key", b"delta"])),
+        parse_sample_table(_write_clip(tmp_path / "b.mp4", [b"KEY2"]))
+    ]
+    output = b"".join(iter_fragmented_mp4(tables))
+    layout = fragmented_layout(tables)
+    assert len(layout) == 3
+    assert sum(length for _, length in layout) == len(output)
+    assert [box_type for box_type, _ in _boxes(output[:layout[0][1]])] == [b"ftyp", b"moov"]
+    for offset, length in layout[1:]:
+        assert [box_type for box_type, _ in _boxes(output[offset:offset + length])] == [b"moof", b"mdat"]
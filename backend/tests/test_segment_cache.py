@@ -0,0 +1,38 @@
+from app.services.segment_cache import PhraseMiner, SegmentCache
+
+
+def _fake_concat(inputs, output_path):
+    with open(output_path, "wb") as f:
+        for path in inputs:
+            with open(path, "rb") as source:
+                f.write(source.read())
+
+
+def test_plan_uses_longest_cached_phrase(tmp_path):
+    clips = []
+    for name in ("train", "arriving", "platform", "number", "one"):
+        path = tmp_path / f"{name}.mp4"
+        path.write_bytes(name.encode())
+        clips.append(str(path))
+
+    cache = SegmentCache(tmp_path / "segments", max_segments=10)
+    two = cache.build(tuple(clips[0:2]), _fake_concat)
+    three = cache.build(tuple(clips[0:3]), _fake_concat)
+
+    assert cache.plan(clips) == [three.path, clips[3], clips[4]]
+    assert cache.plan(clips[:2] + clips[3:]) == [two.path, clips[3], clips[4]]
+
+    # Replacing a source clip invalidates every segment built from it
+    cache.invalidate_path(clips[1])
+    assert cache.plan(clips) == clips
+
+
+def test_miner_ranks_frequent_long_phrases_first():
+    miner = PhraseMiner(max_length=3)
+    for _ in range(3):
+        miner.record(["a", "b", "c"])
+    miner.record(["x", "y"])
+
+    candidates = miner.candidates(min_count=2)
+    assert candidates[0] == ("a", "b", "c")
+    assert ("x", "y") not in candidates
@@ -0,0 +1,45 @@
+from app.services import segmented_encoder
+from app.services.segmented_encoder import (
+    DEFAULT_ENCODE_TARGET, create_segment_command, model_encode_target, split_groups
+)
+
+
+def _files(tmp_path, sizes):
+    paths = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"{i}.mp4"
+        path.write_bytes(b"\0" * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_split_groups_is_contiguous_and_balanced_by_size(tmp_path):
+    files = _files(tmp_path, [10, 10, 10, 10, 40, 10, 10])
+    groups = split_groups(files, 3)
+    assert [path for group in groups for path in group] == files
+    assert len(groups) == 3
+    assert all(groups)
+
+    # Never more groups than clips
+    assert split_groups(files[:2], 8) == [[files[0]], [files[1]]]
+
+
+def test_segment_command_uses_closed_fixed_gops(tmp_path):
+    cmd = create_segment_command(["a.mp4", "b.mp4"], "out.mp4", DEFAULT_ENCODE_TARGET, threads=4)
+    assert cmd.count("-i") == 2
+    assert cmd[cmd.index("-g") + 1] == cmd[cmd.index("-keyint_min") + 1] == "60"
+    assert cmd[cmd.index("-sc_threshold") + 1] == "0"
+    assert cmd[cmd.index("-video_track_timescale") + 1] == "15360"
+    assert "concat=n=2:v=1:a=0[out]" in cmd[cmd.index("-filter_complex") + 1]
+
+
+def test_encode_target_follows_the_models_clips(monkeypatch):
+    class Index:
+        def canonical_fingerprint(self, model):
+            return {"male": "hevc|Main|640|480|yuv420p|25/1|1/12800|1:1"}.get(model)
+    monkeypatch.setattr(segmented_encoder, "get_sign_index", lambda: Index())
+
+    target = model_encode_target("male")
+    assert (target.codec_name, target.width, target.height, target.r_frame_rate) == ("hevc", 640, 480, "25/1")
+    assert model_encode_target("female") == DEFAULT_ENCODE_TARGET
+    assert model_encode_target(None) == DEFAULT_ENCODE_TARGET
@@ -0,0 +1,46 @@
+from app.services.sign_index import SignIndex
+
+
+def _touch(path, size=16):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+def test_resolve_prefers_direct_files_over_folders(tmp_path):
+    model_dir = tmp_path / "male-model"
+    _touch(model_dir / "train.mp4")
+    _touch(model_dir / "train" / "train.mp4")
+    _touch(model_dir / "platform" / "platform.mp4")
+
+    def metadata(model):
+        return [("/srv/uploads/male-model/platform/platform.mp4", 1.25, "h264|High|1280|720|yuv420p|30/1|1/15360|1:1"),
+                # Same sign, different file: not the clip the index resolves to
+                ("/srv/uploads/male-model/train/train.mp4", 3.5, "h264|High|1280|720|yuv420p|30/1|1/15360|1:1")]
+
+    index = SignIndex(tmp_path, metadata_loader=metadata)
+    index.build()
+
+    clips, missing = index.resolve(["Train", "platform", "arriving"], "male")
+    assert [clip.path for clip in clips] == [
+        str(model_dir / "train.mp4"),
+        str(model_dir / "platform" / "platform.mp4"),
+    ]
+    assert [clip.duration_seconds for clip in clips] == [None, 1.25]
+    assert missing == ["arriving"]
+
+
+def test_refresh_sign_tracks_uploads_and_deletes(tmp_path):
+    model_dir = tmp_path / "female-model"
+    model_dir.mkdir()
+    index = SignIndex(tmp_path, metadata_loader=None)
+    index.build()
+    assert index.lookup("female", "delay") is None
+
+    _touch(model_dir / "delay" / "delay.mp4", size=42)
+    clip = index.refresh_sign("female", "delay")
+    assert clip.file_size == 42
+    assert index.lookup("female", "delay") == clip
+
+    (model_dir / "delay" / "delay.mp4").unlink()
+    assert index.refresh_sign("female", "delay") is None
+    assert index.lookup("female", "delay") is None
@@ -0,0 +1,52 @@
+from app.services import stitch_cache
+from app.services.sign_index import SignClip
+from app.services.stitch_cache import StitchCache, stitch_cache_key
+
+
+def _clip(path, size=10, mtime_ns=1):
+    return SignClip(sign="x", path=path, file_size=size, mtime_ns=mtime_ns, rank=0)
+
+
+def test_key_changes_with_clip_version():
+    clips = [_clip("/a.mp4"), _clip("/b.mp4")]
+    assert stitch_cache_key("male", clips) == stitch_cache_key("male", list(clips))
+    assert stitch_cache_key("male", clips) != stitch_cache_key("female", clips)
+    assert stitch_cache_key("male", clips) != stitch_cache_key("male", [_clip("/a.mp4", mtime_ns=2), clips[1]])
+
+
+def test_key_changes_with_the_models_normalization_target(monkeypatch):
+    class Index:
+        canonical = "h264|High|1280|720|yuv420p|30/1|1/15360|1:1"
+
+        def canonical_fingerprint(self, model):
+            return self.canonical
+    index = Index()
+    monkeypatch.setattr(stitch_cache, "get_sign_index", lambda: index)
+
+    clips = [_clip("/a.mp4"), _clip("/b.mp4")]
+    before = stitch_cache_key("male", clips)
+    index.canonical = "h264|High|640|480|yuv420p|25/1|1/12800|1:1"
+    assert stitch_cache_key("male", clips) != before
+
+
+def test_lru_eviction_and_counters(tmp_path):
+    cache = StitchCache(tmp_path / "cache", max_bytes=250)
+    for name in ("one", "two", "three"):
+        source = tmp_path / f"{name}.mp4"
+        source.write_bytes(b"\0" * 100)
+        cache.put(name, str(source), duration=1.5)
+
+    assert cache.get("one") is None
+    hit = cache.get("three")
+    assert hit.duration == 1.5
+
+    destination = tmp_path / "preview.mp4"
+    cache.materialize(hit, str(destination))
+    assert destination.read_bytes() == b"\0" * 100
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+    # Entries survive a restart
+    reloaded = StitchCache(tmp_path / "cache", max_bytes=250)
+    assert reloaded.get("two") is not None
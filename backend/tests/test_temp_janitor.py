@@ -0,0 +1,38 @@
+import os
+import time
+
+from app.services.temp_janitor import TempDirectoryPolicy, TempJanitor
+
+
+def _artifact(path, size, age):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+
+
+def test_sweep_expires_by_ttl_then_evicts_lru_over_quota(tmp_path):
+    videos = tmp_path / "isl-videos"
+    audio = tmp_path / "audio"
+    _artifact(videos / "abandoned.mp4", 10, age=7200)
+    _artifact(videos / "old.mp4", 40, age=1800)
+    _artifact(videos / "recent.mp4", 40, age=600)
+    _artifact(audio / "expired.wav", 10, age=400)
+    _artifact(audio / "fresh.wav", 40, age=5)
+
+    janitor = TempJanitor(
+        policies=[
+            TempDirectoryPolicy(name="isl-videos", directory=str(videos), ttl_seconds=3600),
+            TempDirectoryPolicy(name="audio", directory=str(audio), ttl_seconds=300),
+        ],
+        max_bytes=90,
+        min_age_seconds=60
+    )
+    # A preview being watched is refreshed and outlives an older untouched one
+    janitor.touch(videos / "old.mp4")
+
+    result = janitor.sweep()
+    assert result == {"expired": 2, "evicted": 1, "total_bytes": 80}
+    assert sorted(os.listdir(videos)) == ["old.mp4"]
+    assert os.listdir(audio) == ["fresh.wav"]
+    assert janitor.stats()["bytes_reclaimed"] == 60
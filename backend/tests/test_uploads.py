@@ -0,0 +1,31 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.utils.uploads import UploadTooLargeError, stage_upload
+
+
+def test_stage_upload_hashes_in_chunks_and_commits_atomically(tmp_path):
+    payload = b"isl" * 5000
+    upload = UploadFile(file=io.BytesIO(payload), filename="hello.mp4")
+    destination = tmp_path / "hello.mp4"
+    destination.write_bytes(b"old clip")
+
+    staged = asyncio.run(stage_upload(upload, tmp_path, max_bytes=len(payload), chunk_size=1000))
+    assert staged.size == len(payload)
+    assert staged.sha256 == hashlib.sha256(payload).hexdigest()
+    assert destination.read_bytes() == b"old clip"
+
+    staged.commit(destination)
+    assert destination.read_bytes() == payload
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["hello.mp4"]
+
+
+def test_stage_upload_enforces_limit_mid_stream(tmp_path):
+    upload = UploadFile(file=io.BytesIO(b"\0" * 10_000), filename="big.mp4")
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(stage_upload(upload, tmp_path, max_bytes=4096, chunk_size=1024))
+    assert list(tmp_path.iterdir()) == []
@@ -23,6 +23,9 @@ interface ISLVideo {
     tags: string
     content_type: string
     is_active: boolean
+    poster_url: string | null
+    proxy_url: string | null
+    proxy_file_size: number | null
     created_at: string
     updated_at: string
 }
@@ -425,7 +428,26 @@ export default function ISLDatasetPage() {
                     })
 
                     if (response.ok) {
-                        const result = await response.json()
+                        let result = await response.json()
+
+                        // The sync runs as a background job; follow it until it finishes
+                        while (result.sync_job_id && result.status !== 'completed' && result.status !== 'failed') {
+                            await new Promise(resolve => setTimeout(resolve, 1000))
+                            const jobResponse = await fetch(`${apiUrl}/api/v1/isl-videos/sync/${result.sync_job_id}`, {
+                                headers: {
+                                    'Authorization': `Bearer ${localStorage.getItem('accessToken')}`,
+                                },
+                            })
+                            if (!jobResponse.ok) break
+                            const job = await jobResponse.json()
+                            result = { ...result, ...job, processed: job.queued }
+                            setSyncProgress(prev => ({
+                                ...prev,
+                                currentStep: `${currentModelType} model: ${job.step || 'Syncing'}`,
+                                progress: (i * 40) + 20 + Math.round(job.progress * 20)
+                            }))
+                        }
+
                         const processed = result.processed || 0
                         const errors = result.errors ? result.errors.length : 0
                         
@@ -667,13 +689,22 @@ export default function ISLDatasetPage() {
                     ) : (
                         filteredVideos.map((video) => (
                             <div key={video.id} className="group bg-white rounded-lg border border-gray-200 p-2 hover:shadow-lg transition-all duration-200 cursor-pointer relative">
-                                {/* ISL Icon */}
+                                {/* Poster frame, or the ISL icon until ingest has made one */}
                                 <div className="aspect-square bg-gray-50 rounded-lg mb-1 flex items-center justify-center overflow-hidden">
-                                    <img 
-                                        src="/images/icons/isl.png" 
-                                        alt="ISL Video" 
-                                        className="w-12 h-12 object-contain"
-                                    />
+                                    {video.poster_url ? (
+                                        <img
+                                            src={`${getApiUrl()}${video.poster_url}`}
+                                            alt={video.display_name}
+                                            loading="lazy"
+                                            className="w-full h-full object-cover"
+                                        />
+                                    ) : (
+                                        <img 
+                                            src="/images/icons/isl.png" 
+                                            alt="ISL Video" 
+                                            className="w-12 h-12 object-contain"
+                                        />
+                                    )}
                                 </div>
                                 
                                 {/* Video Name */}